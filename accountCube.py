@@ -0,0 +1,133 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# accountCube.py -- debit and credit sums of every account in the configured trees for every month, quarter and year
+#                   of the timespan, read from the book ONCE and aggregated up the account trees
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+from gncLiteSession import *
+
+# [debits sum, credits sum, number of debits, number of credits]
+NO_SPLITS = (ZERO, ZERO, 0, 0)
+
+
+def add_sums(p_total:list, p_sums) -> list:
+    """A side with NO splits stays at ZERO, exactly as when adding the splits one by one."""
+    if p_sums[2]:
+        p_total[0] += p_sums[0]
+        p_total[2] += p_sums[2]
+    if p_sums[3]:
+        p_total[1] += p_sums[1]
+        p_total[3] += p_sums[3]
+    return p_total
+
+
+class AccountCube:
+    """
+    account x period sums: the months come from the session in ONE read for the whole timespan,
+    each parent account is the sum of its own splits and its children, and the quarters and years are sums of months
+    -- so each period of any account in the trees is a dict lookup instead of a scan of the book
+    """
+    def __init__(self, p_session:GnucashLiteSession, p_paths:list, p_first:date, p_last:date, p_lgr:lg.Logger):
+        """
+        :param p_session: loaded session to read from -- NOT needed once the cube is built
+        :param   p_paths: account paths: the cube has their accounts and ALL the descendants
+        :param   p_first: any date in the first month
+        :param    p_last: any date in the last month
+        :param     p_lgr: logger to use
+        """
+        self._lgr = p_lgr
+        self._accounts = {}
+        self._months = month_ends(p_first, p_last)
+        self._month_index = {start: indx for indx, (start, _) in enumerate(self._months)}
+        self._periods = self.longer_periods()
+        # guid -> (start, end) -> sums
+        self._sums = {}
+
+        tops = []
+        for path in sorted(p_paths, key = len):
+            try:
+                acct = p_session.account_from_path(path)
+            except Exception as ace:
+                self._lgr.debug(repr(ace))
+                continue
+            self._accounts[tuple(path)] = acct
+            if acct.guid not in self._sums:
+                tops.append(acct)
+                self._sums[acct.guid] = {}
+                self._sums.update({a.guid: {} for a in acct.get_descendants()})
+
+        monthly = p_session.get_monthly_sums(list(self._sums), p_first, p_last)
+        for acct in tops:
+            self.aggregate(acct, monthly)
+        self._lgr.info(f"cube of {len(self._sums)} accounts x {len(self._months)} months")
+
+    def aggregate(self, p_acct:LiteAccount, p_monthly:dict) -> dict:
+        """Fill the month, quarter and year sums of the account from its own splits and the sums of its children."""
+        children = [self.aggregate(child, p_monthly) for child in p_acct.children]
+        own = p_monthly.get(p_acct.guid, {})
+        sums = self._sums[p_acct.guid]
+        for start, end in self._months:
+            total = add_sums([ZERO, ZERO, 0, 0], own.get((start.year, start.month), NO_SPLITS))
+            for child in children:
+                add_sums(total, child[(start, end)])
+            sums[(start, end)] = total
+        for start, end in self._periods:
+            sums[(start, end)] = self.sum_months(sums, start, end)
+        return sums
+
+    def longer_periods(self) -> list:
+        """The quarters and years that are complete in the cube."""
+        periods = []
+        for size in (3, 12):
+            for indx, (start, _) in enumerate(self._months):
+                if (start.month - 1) % size == 0 and indx + size <= len(self._months):
+                    periods.append((start, self._months[indx + size - 1][1]))
+        return periods
+
+    def sum_months(self, p_sums:dict, p_start:date, p_end:date) -> list:
+        total = [ZERO, ZERO, 0, 0]
+        first = self._month_index[p_start]
+        last = self._month_index[date(p_end.year, p_end.month, 1)]
+        for month in self._months[first:last + 1]:
+            add_sums(total, p_sums[month])
+        return total
+
+    def covers(self, p_start:date, p_end:date) -> bool:
+        """The period is whole months inside the cube."""
+        return bool(self._months) and p_start.day == 1 and (p_end + ONE_DAY).day == 1 \
+               and self._months[0][0] <= p_start and p_end <= self._months[-1][1]
+
+    def get_account(self, p_path:list) -> LiteAccount:
+        acct = self._accounts.get(tuple(p_path))
+        if acct is None:
+            raise Exception(f"Path '{p_path}' is NOT in the cube!")
+        return acct
+
+    def period_sums(self, p_path:list, p_start:date, p_end:date) -> (Decimal, Decimal):
+        """:return: debit and credit sums of the account and ALL its descendants in a period of whole months"""
+        sums = self._sums[self.get_account(p_path).guid]
+        key = (as_date(p_start), as_date(p_end))
+        if key not in sums:
+            if not self.covers(*key):
+                raise Exception(f"period {key} is NOT whole months in the cube!")
+            sums[key] = self.sum_months(sums, *key)
+        return sums[key][0], sums[key][1]
+
+    def fill_splits(self, p_path:list, p_period_starts:list, p_periods:list) -> str:
+        """Same as GnucashLiteSession.fill_splits() but from the cube."""
+        acct = self.get_account(p_path)
+        for period in p_periods:
+            debits, credits = self.period_sums(p_path, period[0], period[1])
+            period[2] += debits
+            period[3] += credits
+            period[4] += debits + credits
+        return acct.name
+# END class AccountCube
@@ -0,0 +1,189 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# artefacts.py -- write the saved Gnucash data, Google data and Google responses as compressed JSON Lines or msgpack
+#                 in a background thread, and read them back to compare or to replay to the Google sheet
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import io
+import json
+import gzip
+import queue
+import threading
+import os.path as osp
+import logging as lg
+from sys import argv
+from argparse import ArgumentParser
+from datetime import datetime as dt
+from sheetJournal import SheetJournal
+
+# optional: the compact formats are used if available, else gzipped JSON Lines
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ARTEFACT_FOLDER:str = osp.join(osp.dirname(osp.abspath(__file__)), "artefacts")
+JSON:str    = "json"
+JSONL:str   = "jsonl"
+MSGPACK:str = "msgpack"
+SAVE_FORMATS = [JSON, JSONL, MSGPACK]
+ZSTD_LEVEL:int = 3
+
+
+def get_suffix(p_format:str) -> str:
+    """Compressed with zstd if available, else gzip -- msgpack needs BOTH msgpack and zstd, else it is JSON Lines."""
+    if p_format == MSGPACK and msgpack and zstandard:
+        return ".msgpack.zst"
+    return ".jsonl.zst" if zstandard else ".jsonl.gz"
+
+
+def open_compressed(p_file:str, p_mode:str):
+    if p_file.endswith(".zst"):
+        if zstandard is None:
+            raise Exception(f"need the zstandard package to read '{p_file}'!")
+        if p_mode == "wb":
+            return zstandard.ZstdCompressor(level = ZSTD_LEVEL).stream_writer(open(p_file, "wb"), closefd = True)
+        return zstandard.ZstdDecompressor().stream_reader(open(p_file, "rb"), closefd = True)
+    return gzip.open(p_file, p_mode)
+
+
+def write_records(p_file:str, p_header:dict, p_data):
+    """The header, then EACH item of a list -- or the data itself -- as a separate record, so NO big string is built."""
+    records = p_data if isinstance(p_data, list) else [p_data]
+    # same suffix, as that selects the compression
+    temp_file = osp.join(osp.dirname(p_file), "." + osp.basename(p_file))
+    with open_compressed(temp_file, "wb") as afp:
+        if p_file.endswith(".msgpack.zst"):
+            packer = msgpack.Packer(default = str)
+            afp.write(packer.pack(p_header))
+            for record in records:
+                afp.write(packer.pack(record))
+        else:
+            for record in [p_header] + records:
+                afp.write(json.dumps(record, default = str).encode("utf-8") + b"\n")
+    os.replace(temp_file, p_file)
+
+
+def load_artefact(p_file:str) -> (dict, object):
+    """:return: header and data of an artefact -- or of a JSON file from save_to_json(), with an empty header"""
+    if p_file.endswith(".json"):
+        with open(p_file, "r") as jfp:
+            return {}, json.load(jfp)
+    with open_compressed(p_file, "rb") as afp:
+        if p_file.endswith(".msgpack.zst"):
+            if msgpack is None:
+                raise Exception(f"need the msgpack package to read '{p_file}'!")
+            records = list(msgpack.Unpacker(afp, raw = False))
+        else:
+            records = [json.loads(line) for line in io.TextIOWrapper(afp, encoding = "utf-8") if line.strip()]
+    header, items = records[0], records[1:]
+    return header, items if header.get("list") else items[0]
+
+
+class ArtefactWriter:
+    """
+    ONE background thread writes the artefacts of ALL the updaters in the process, so the updates are NOT held up
+    -- the path is returned at once, and flush() waits until ALL the artefacts are written
+    """
+    def __init__(self, p_folder:str = ARTEFACT_FOLDER):
+        self._folder = p_folder
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.errors = []
+
+    def save(self, p_name:str, p_data, p_ts:str, p_format:str) -> str:
+        """
+        :param p_format: one of SAVE_FORMATS -- each updater in the process may use its own
+        :return: path the artefact will be written to
+        """
+        os.makedirs(self._folder, exist_ok = True)
+        path = osp.join(self._folder, f"{p_name}_{p_ts}{get_suffix(p_format)}")
+        header = {"name": p_name, "created": dt.now().isoformat(timespec = "seconds"), "list": isinstance(p_data, list)}
+        # a shallow copy, as the updater may go on adding to its lists
+        data = list(p_data) if isinstance(p_data, list) else dict(p_data) if isinstance(p_data, dict) else p_data
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target = self.run, name = "ArtefactWriter", daemon = True)
+                self._thread.start()
+            self._queue.put((path, header, data))
+        return path
+
+    def run(self):
+        while True:
+            path, header, data = self._queue.get()
+            try:
+                write_records(path, header, data)
+            except Exception as awe:
+                self.errors.append(f"{path}: {repr(awe)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, lgr:lg.Logger):
+        """Wait for ALL the queued artefacts to be written."""
+        self._queue.join()
+        while self.errors:
+            lgr.error(f"artefact NOT written: {self.errors.pop(0)}")
+# END class ArtefactWriter
+
+artefact_writer = ArtefactWriter()
+
+
+def compare(p_first, p_second) -> list:
+    """:return: index or key, and the two values, of each item that differs"""
+    if isinstance(p_first, list) and isinstance(p_second, list):
+        diffs = [(indx, one, two) for indx, (one, two) in enumerate(zip(p_first, p_second)) if one != two]
+        extra = range(min(len(p_first), len(p_second)), max(len(p_first), len(p_second)))
+        return diffs + [(indx, p_first[indx] if indx < len(p_first) else None, p_second[indx] if indx < len(p_second) else None)
+                        for indx in extra]
+    if isinstance(p_first, dict) and isinstance(p_second, dict):
+        return [(key, p_first.get(key), p_second.get(key)) for key in p_first.keys() | p_second.keys()
+                if p_first.get(key) != p_second.get(key)]
+    return [] if p_first == p_second else [(None, p_first, p_second)]
+
+
+def set_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Read back saved artefacts: show, compare, or replay Google data to the sheet journal",
+                                prog = f"python3 {osp.basename(argv[0])}")
+    arg_parser.add_argument('files', nargs = '+', help = "one artefact to show or replay -- or two to compare")
+    arg_parser.add_argument('--replay', action = "store_true",
+                            help = "add the Google data in the artefact to the sheet journal, to send with 'sheetJournal.py --replay'")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def artefacts_main(args:list):
+    params = set_args().parse_args(args)
+    lg.basicConfig(level = params.level, format = "%(asctime)s %(levelname)s %(funcName)s: %(message)s")
+    lgr = lg.getLogger(osp.basename(__file__))
+
+    header, data = load_artefact(params.files[0])
+    if len(params.files) == 2:
+        diffs = compare(data, load_artefact(params.files[1])[1])
+        for key, one, two in diffs:
+            print(f"{key}: {json.dumps(one, default = str)}\n{' ' * len(str(key))}  {json.dumps(two, default = str)}")
+        print(f"{len(diffs)} differences")
+    elif params.replay:
+        batch = SheetJournal().add_batch(data, f"replay of {osp.basename(params.files[0])}", lgr)
+        print(f"journaled as batch #{batch}")
+    else:
+        print(json.dumps(header, indent = 4))
+        print(json.dumps(data, indent = 4, default = str))
+
+
+if __name__ == "__main__":
+    artefacts_main(argv[1:])
+    exit()
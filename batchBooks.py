@@ -0,0 +1,171 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# batchBooks.py -- run the Rev & Exps and/or Assets extraction in TEST mode on EACH of a folder or glob of backup books,
+#                  in a process pool, into ONE columnar table to see how the historical figures drifted between backups
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import glob
+import time
+import hashlib
+import concurrent.futures as confut
+from updateBudget import *
+from updateRevExps import UpdateRevExps
+from updateAssets import UpdateAssets
+from batchJobs import REV_EXPS, ASSETS
+
+DEFAULT_BOOKS:str = osp.join(BASE_GNUCASH_FOLDER, "bak-files")
+# ONLY these updaters fill a quarterly table in TEST mode
+BOOK_UPDATERS = {
+    REV_EXPS : UpdateRevExps ,
+    ASSETS   : UpdateAssets
+}
+HASH_BLOCK:int = 1024 * 1024
+KEY_COLUMNS = ["book", "updater", "year", "quarter"]
+
+
+def find_books(p_source:str) -> list:
+    """:return: the Gnucash books in the folder, or matching the glob, oldest first"""
+    paths = glob.glob(osp.join(glob.escape(p_source), "*")) if osp.isdir(p_source) else glob.glob(osp.expanduser(p_source))
+    books = [path for path in paths if osp.isfile(path) and (is_sqlite_book(path) or is_xml_book(path))]
+    return sorted(books, key = osp.getmtime)
+
+
+def content_hash(p_book:str) -> str:
+    digest = hashlib.sha256()
+    with open(p_book, "rb") as bfp:
+        for block in iter(lambda: bfp.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_book(p_updater:str, p_book:str, p_timespan:str) -> (list, list, dict):
+    """
+    Run in a worker process: the Gnucash data of the updater for the book, as in TEST mode
+    :return: years, quarters and the metric columns of the results table
+    """
+    # each backup book is read ONCE, so a cached copy would ONLY push the working books out of the cache
+    updater = BOOK_UPDATERS[p_updater](['-g' + p_book, '-m' + TEST, '-t' + p_timespan, '-l' + str(lg.WARNING),
+                                        '--no_history', '--no_book_cache'], get_base_filename(__file__))
+    try:
+        updater.prepare_gnucash_data(get_timespan(updater.timespan, updater._lgr))
+        table = updater._gnucash_data
+        return list(table.years), list(table.quarters), {metric: table.column(metric) for metric in table.metrics()}
+    finally:
+        stop_log_queue(updater._lgr, updater._log_listener)
+
+
+class BooksTable:
+    """
+    the consolidated results: one column for each key and for each metric of ANY updater, one row for each
+    (book, updater, year, quarter) -- None where the updater of the row has NO such metric
+    """
+    def __init__(self):
+        self.columns = {name: [] for name in KEY_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["book"])
+
+    def add(self, p_book:str, p_updater:str, p_years:list, p_quarters:list, p_metrics:dict):
+        start = len(self)
+        self.columns["book"].extend([p_book] * len(p_years))
+        self.columns["updater"].extend([p_updater] * len(p_years))
+        self.columns["year"].extend(p_years)
+        self.columns["quarter"].extend(p_quarters)
+        for metric, values in p_metrics.items():
+            column = self.columns.setdefault(metric, [None] * start)
+            column.extend(str(value) if value is not None else None for value in values)
+        for column in self.columns.values():
+            column.extend([None] * (len(self) - len(column)))
+
+    def drift(self) -> list:
+        """:return: updater, year, quarter, metric and the value in each book, where the books do NOT all agree"""
+        values = {}
+        for indx in range(len(self)):
+            key = (self.columns["updater"][indx], self.columns["year"][indx], self.columns["quarter"][indx])
+            for metric, column in self.columns.items():
+                if metric not in KEY_COLUMNS and column[indx] is not None:
+                    values.setdefault(key + (metric,), {})[self.columns["book"][indx]] = column[indx]
+        return [{"updater": updater, "year": year, "quarter": qtr, "metric": metric, "values": by_book}
+                for (updater, year, qtr, metric), by_book in values.items() if len(set(by_book.values())) > 1]
+# END class BooksTable
+
+
+def run_books(p_books:list, p_updaters:list, p_timespan:str, p_workers:int, lgr:lg.Logger) -> (BooksTable, dict):
+    """
+    :return: the consolidated table, and for each book skipped as a copy, the earlier book with the same content
+    """
+    unique, copies = {}, {}
+    for book in p_books:
+        digest = content_hash(book)
+        if digest in unique:
+            copies[book] = unique[digest]
+            lgr.info(f"skip '{get_filename(book)}': same content as '{get_filename(unique[digest])}'")
+        else:
+            unique[digest] = book
+
+    books = list(unique.values())
+    results = {}
+    with confut.ProcessPoolExecutor(max_workers = p_workers) as executor:
+        futures = {executor.submit(extract_book, updater, book, p_timespan): (book, updater)
+                   for book in books for updater in p_updaters}
+        for future in confut.as_completed(futures):
+            book, updater = futures[future]
+            try:
+                results[(book, updater)] = future.result()
+                lgr.info(f"extracted {updater} from '{get_filename(book)}'")
+            except Exception as bbe:
+                lgr.error(f"{updater} of '{book}' FAILED: {repr(bbe)}")
+
+    # rows in the order of the books, oldest first, whatever order the workers finished in
+    table = BooksTable()
+    for book in books:
+        for updater in p_updaters:
+            if (book, updater) in results:
+                table.add(book, updater, *results[(book, updater)])
+    return table, copies
+
+
+def set_books_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Extract the quarterly figures from EACH of a set of backup Gnucash books",
+                                prog = f"python3 {get_filename(argv[0])}")
+    arg_parser.add_argument('books', nargs = '?', default = DEFAULT_BOOKS, help = "folder of the books, or a glob of the book files")
+    arg_parser.add_argument('-u', '--updater', nargs = '+', choices = list(BOOK_UPDATERS), default = list(BOOK_UPDATERS),
+                            help = "extraction(s) to run on each book")
+    arg_parser.add_argument('-t', '--timespan', default = ALL_YEARS,
+                            help = "choices = [" + ', '.join([year for year in UPDATE_YEARS] + list(UPDATE_INTERVAL.keys())) + "]"
+                                   + f" or quarters as '{UPDATE_YEARS[1]}Q3', '{UPDATE_YEARS[2]}Q2{RANGE_SEP}{UPDATE_YEARS[0]}Q1' or '{LAST_2_QTRS}'")
+    arg_parser.add_argument('-w', '--workers', type = int, default = os.cpu_count(), help = "number of worker processes")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def batch_books_main(args:list) -> dict:
+    params = set_books_args().parse_args(args)
+    lg_ctrl = MhsLogger(get_base_filename(__file__), con_level = params.level)
+    lgr = lg_ctrl.get_logger()
+
+    books = find_books(params.books)
+    lgr.info(f"found {len(books)} books in '{params.books}'")
+    start = time.perf_counter()
+    table, copies = run_books(books, params.updater, params.timespan, params.workers, lgr)
+    drift = table.drift()
+    lgr.info(f"{len(table)} rows from {len(books) - len(copies)} books in {time.perf_counter() - start:.2f} seconds;"
+             f" {len(drift)} figures drifted between the books")
+
+    results = {"columns": table.columns, "copies": copies, "drift": drift}
+    lgr.info(f"results file = {save_to_json('batchBooks_results', results, ts = dt.now().strftime(FILE_DATETIME_FORMAT))}")
+    return results
+
+
+if __name__ == "__main__":
+    batch_books_main(argv[1:])
+    exit()
@@ -0,0 +1,204 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# batchJobs.py -- run a file of update jobs: independent jobs in parallel, dependent jobs in order,
+#                 with the Gnucash books loaded once and shared between the jobs
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import time
+import concurrent.futures as confut
+from updateBudget import *
+from updateRevExps import update_rev_exps_main
+from updateAssets import update_assets_main
+from updateBalance import update_balance_main
+
+# optional: ONLY needed for the format of the job file
+try:
+    import yaml
+except ImportError:
+    yaml = None
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+REV_EXPS:str = "RevExps"
+ASSETS:str   = "Assets"
+BALANCE:str  = "Balance"
+JOB_UPDATERS = {
+    REV_EXPS : update_rev_exps_main ,
+    ASSETS   : update_assets_main ,
+    BALANCE  : update_balance_main
+}
+DEFAULT_WORKERS:int = 4
+DONE:str    = "done"
+FAILED:str  = "failed"
+SKIPPED:str = "skipped"
+
+
+def load_job_file(p_file:str) -> dict:
+    """Read a YAML or TOML job file: optional 'defaults' and a list of 'jobs'."""
+    if p_file.endswith(".toml"):
+        if tomllib is None:
+            raise Exception("need Python 3.11+ to read a TOML job file!")
+        with open(p_file, "rb") as jfp:
+            return tomllib.load(jfp)
+    if yaml is None:
+        raise Exception("need the PyYAML package to read a YAML job file!")
+    with open(p_file, "r") as jfp:
+        return yaml.safe_load(jfp)
+
+
+class BatchJob:
+    """one update: an updater, a timespan, a target and a Gnucash book, plus any other updater arguments"""
+    def __init__(self, p_spec:dict, p_defaults:dict, p_indx:int):
+        spec = p_defaults | p_spec
+        self.updater = spec["updater"]
+        if self.updater not in JOB_UPDATERS:
+            raise Exception(f"job #{p_indx}: updater '{self.updater}' is NOT one of {list(JOB_UPDATERS)}!")
+        self.timespan = str(spec["timespan"])
+        self.target = spec.get("target", TEST)
+        self.book = osp.expanduser(spec["book"])
+        self.name = spec.get("name", f"{self.updater}-{self.timespan}-{self.target}-{p_indx}")
+        self.after = set(spec.get("after", []))
+        self.args = [str(arg) for arg in spec.get("args", [])]
+        self.level = spec.get("level", lg.INFO)
+        self.params = set_args().parse_args(self.get_args())
+        # the Gnucash engine is NOT thread-safe, so the jobs using the bindings run one at a time
+        self.bindings = uses_bindings(self.book, self.params.backend)
+        self.status = None
+        self.seconds = 0.0
+        self.response = None
+
+    def get_args(self) -> list:
+        return ['-g' + self.book, '-m' + self.target, '-t' + self.timespan, '-l' + str(self.level)] + self.args
+
+    def run(self, p_pool:SessionPool) -> dict:
+        start = time.perf_counter()
+        try:
+            return JOB_UPDATERS[self.updater](self.get_args(), p_pool)
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def summary(self) -> dict:
+        return {"status": self.status, "seconds": round(self.seconds, 3), "response": self.response}
+# END class BatchJob
+
+
+class BatchRunner:
+    """
+    run the jobs with a thread pool, each job as soon as ALL the jobs it comes after are done
+    -- a Balance job comes after the Assets jobs for the same book and target, as the Balance sheet refers to the Assets cells
+    -- a job is skipped if a job it comes after fails
+    -- a job using the Gnucash bindings does NOT start while another one is running
+    -- the jobs share the process, so they must ALL have the same PROCESS_OPTIONS, which are set ONCE before the jobs start
+    """
+    def __init__(self, p_jobs:list, p_workers:int, p_lgr:lg.Logger):
+        self._lgr = p_lgr
+        self._workers = p_workers
+        self.jobs = {job.name: job for job in p_jobs}
+        if len(self.jobs) != len(p_jobs):
+            raise Exception("the job names must be unique!")
+        for job in p_jobs:
+            unknown = job.after - self.jobs.keys()
+            if unknown:
+                raise Exception(f"job '{job.name}' comes after unknown job(s) {unknown}!")
+            if job.updater == BALANCE:
+                job.after |= {other.name for other in p_jobs if other.updater == ASSETS
+                              and other.book == job.book and other.target == job.target}
+            for option in PROCESS_OPTIONS:
+                if getattr(job.params, option) != getattr(p_jobs[0].params, option):
+                    raise Exception(f"job '{job.name}' has a different '{option}': it must be the same for ALL the jobs!")
+        self.check_cycles()
+
+    def check_cycles(self):
+        visiting, visited = set(), set()
+        def visit(name:str):
+            if name in visiting:
+                raise Exception(f"job '{name}' depends on itself!")
+            if name not in visited:
+                visiting.add(name)
+                for before in self.jobs[name].after:
+                    visit(before)
+                visiting.discard(name)
+                visited.add(name)
+        for job_name in self.jobs:
+            visit(job_name)
+
+    def run(self) -> dict:
+        if self.jobs:
+            configure_process(next(iter(self.jobs.values())).params)
+        pending = dict(self.jobs)
+        # share the loaded books and send ALL the Record rows together at the end
+        pool = SessionPool()
+        try:
+            with record_batch.deferred(self._lgr), confut.ThreadPoolExecutor(max_workers = self._workers) as executor:
+                running = {}
+                while pending or running:
+                    for name, job in list(pending.items()):
+                        if any(self.jobs[before].status in (FAILED, SKIPPED) for before in job.after):
+                            job.status = SKIPPED
+                            self._lgr.warning(f"skip job '{name}' as a job it comes after did NOT finish")
+                            del pending[name]
+                        elif all(self.jobs[before].status == DONE for before in job.after) \
+                                and not (job.bindings and any(other.bindings for other in running.values())):
+                            self._lgr.info(f"start job '{name}': {job.get_args()}")
+                            running[executor.submit(job.run, pool)] = job
+                            del pending[name]
+                    if not running:
+                        continue
+                    completed, _ = confut.wait(running, return_when = confut.FIRST_COMPLETED)
+                    for future in completed:
+                        job = running.pop(future)
+                        try:
+                            job.response = future.result()
+                            job.status = DONE
+                        except Exception as bre:
+                            self._lgr.exception(bre)
+                            job.response = repr(bre)
+                            job.status = FAILED
+                        self._lgr.info(f"job '{job.name}' {job.status} in {job.seconds:.2f} seconds")
+        finally:
+            pool.close()
+        return {name: job.summary() for name, job in self.jobs.items()}
+# END class BatchRunner
+
+
+def set_batch_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Run a YAML or TOML file of updates of my 'Budget-qtrly' Google Sheet",
+                                prog = f"python3 {get_filename(argv[0])}")
+    arg_parser.add_argument('job_file', help = "path to the job file")
+    arg_parser.add_argument('-w', '--workers', type = int, default = DEFAULT_WORKERS, help = "maximum number of jobs to run at once")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def batch_jobs_main(args:list) -> dict:
+    params = set_batch_args().parse_args(args)
+    lg_ctrl = MhsLogger(get_base_filename(__file__), con_level = params.level)
+    lgr = lg_ctrl.get_logger()
+
+    job_file = load_job_file(params.job_file)
+    defaults = job_file.get("defaults", {})
+    jobs = [BatchJob(spec, defaults, indx) for indx, spec in enumerate(job_file.get("jobs", []))]
+    lgr.info(f"run {len(jobs)} jobs from '{params.job_file}' with {params.workers} workers")
+
+    start = time.perf_counter()
+    summary = BatchRunner(jobs, params.workers, lgr).run()
+    lgr.info(f"ran {len(jobs)} jobs in {time.perf_counter() - start:.2f} seconds")
+    for name, result in summary.items():
+        lgr.info(f"{name:<36} {result['status']:<8} {result['seconds']:9.2f}s")
+    lgr.info(f"summary file = {save_to_json('batchJobs_summary', summary, ts = dt.now().strftime(FILE_DATETIME_FORMAT))}")
+    return summary
+
+
+if __name__ == "__main__":
+    batch_jobs_main(argv[1:])
+    exit()
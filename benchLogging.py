@@ -0,0 +1,88 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# benchLogging.py -- measure the logging overhead of the extraction hot path at INFO and at DEBUG,
+#                    with the old eager messages and with the lazy, guarded and queued logging
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import time
+import tempfile
+from updateBudget import *
+
+BENCH_QUARTERS:int = 4 * len(UPDATE_YEARS)
+BENCH_ACCOUNTS:int = 9
+BENCH_REPEAT:int = 5
+
+
+def make_logger(p_level:int, p_file:str) -> lg.Logger:
+    lgr = lg.getLogger(f"bench-{p_level}-{osp.basename(p_file)}")
+    lgr.propagate = False
+    lgr.setLevel(p_level)
+    hdlr = lg.FileHandler(p_file)
+    hdlr.setFormatter(lg.Formatter("%(asctime)s %(levelname)s %(funcName)s: %(message)s"))
+    lgr.addHandler(hdlr)
+    return lgr
+
+
+def sample_quarter(p_qtr:int) -> dict:
+    return {REV: f"= {p_qtr}.01 + 2.02 + 3.03", BAL: "123.45", CONT: "67.89", NEC: "1011.12", DEDNS: "= 1.00 + 2.00 + 3.00",
+            YR: UPDATE_YEARS[p_qtr % len(UPDATE_YEARS)], QTR: str(p_qtr % 4 + 1)}
+
+
+def eager_path(lgr:lg.Logger):
+    """The messages as they were: f-strings, json.dumps and get_current_time() on every call."""
+    for qtr in range(BENCH_QUARTERS):
+        data_qtr = sample_quarter(qtr)
+        for acct in range(BENCH_ACCOUNTS):
+            lgr.debug(get_current_time())
+            lgr.debug(f"acct_base = {[FAM, acct]}")
+            lgr.debug(f"{acct} Revenue for {data_qtr[YR]}-Q{data_qtr[QTR]} = ${Decimal(acct) * -1}")
+        lgr.debug(json.dumps(data_qtr, indent = 4))
+
+
+def lazy_path(lgr:lg.Logger):
+    """The messages as they are now: %-style arguments and level guards."""
+    for qtr in range(BENCH_QUARTERS):
+        data_qtr = sample_quarter(qtr)
+        for acct in range(BENCH_ACCOUNTS):
+            if lgr.isEnabledFor(lg.DEBUG):
+                lgr.debug(get_current_time())
+            lgr.debug("acct_base = %s", [FAM, acct])
+            lgr.debug("%s Revenue for %s-Q%s = $%s", acct, data_qtr[YR], data_qtr[QTR], -Decimal(acct))
+        if lgr.isEnabledFor(lg.DEBUG):
+            lgr.debug(json.dumps(data_qtr, indent = 4))
+
+
+def time_path(p_path, p_level:int, p_queued:bool, p_folder:str) -> float:
+    lgr = make_logger(p_level, osp.join(p_folder, f"{p_path.__name__}-{p_level}-{p_queued}.log"))
+    listener = start_log_queue(lgr) if p_queued else None
+    best = float("inf")
+    for _ in range(BENCH_REPEAT):
+        start = time.perf_counter()
+        p_path(lgr)
+        best = min(best, time.perf_counter() - start)
+    stop_log_queue(lgr, listener)
+    for hdlr in lgr.handlers:
+        hdlr.close()
+    return best
+
+
+def run_bench():
+    print(f"{BENCH_QUARTERS} quarters x {BENCH_ACCOUNTS} accounts, best of {BENCH_REPEAT}: time in the extraction thread")
+    with tempfile.TemporaryDirectory() as folder:
+        for level in (lg.INFO, lg.DEBUG):
+            for path, queued in ((eager_path, False), (lazy_path, False), (lazy_path, True)):
+                elapsed = time_path(path, level, queued, folder)
+                print(f"{lg.getLevelName(level):>6}  {path.__name__:<10} {'queued' if queued else 'direct':<7} {elapsed * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    run_bench()
+    exit()
@@ -0,0 +1,139 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# bookCache.py -- cache of the inflated copies of the gzipped Gnucash books opened with the Gnucash bindings, so repeated
+#                 opens of an unchanged book skip the decompression, with the least recently used copies evicted
+#                 to stay within a size budget -- the streaming XML reader inflates a book as it reads, with NO copy
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import gzip
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import threading
+import os.path as osp
+import logging as lg
+from contextlib import contextmanager
+
+GZIP_MAGIC:bytes = b"\x1f\x8b"
+# tmpfs if there is one, as the copies are ONLY worth keeping while working
+DEFAULT_CACHE_FOLDER:str = "/dev/shm/updateBudget-books" if osp.isdir("/dev/shm") \
+                           else osp.join(osp.expanduser("~"), ".cache", "updateBudget-books")
+DEFAULT_CACHE_BUDGET:int = 2 * 1024 * 1024 * 1024
+INDEX_FILE:str = "index.json"
+HASH_BLOCK:int = 1024 * 1024
+INFLATE_BLOCK:int = 4 * 1024 * 1024
+
+
+def is_gzipped(p_file:str) -> bool:
+    with open(p_file, "rb") as bfp:
+        return bfp.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+
+class BookCache:
+    """
+    inflated copy of each gzipped book, named for the hash of the gzipped content so identical books share a copy
+    -- a book is found by its path, modification time and size, so the content is ONLY hashed when the book changes
+    -- the index is shared by ALL the processes using the folder, under a file lock
+    """
+    def __init__(self, p_folder:str | None = DEFAULT_CACHE_FOLDER, p_budget:int = DEFAULT_CACHE_BUDGET):
+        self._lock = threading.Lock()
+        self.configure(p_folder, p_budget)
+
+    def configure(self, p_folder:str | None, p_budget:int = DEFAULT_CACHE_BUDGET):
+        """:param p_folder: folder for the copies, or None to open the books directly"""
+        self._folder = p_folder
+        self._budget = p_budget
+
+    @contextmanager
+    def shared_index(self):
+        """Hold the thread lock and the file lock, with the index as last saved by ANY process."""
+        with self._lock:
+            os.makedirs(self._folder, exist_ok = True)
+            with open(osp.join(self._folder, INDEX_FILE), "a+") as ifp:
+                fcntl.flock(ifp, fcntl.LOCK_EX)
+                try:
+                    ifp.seek(0)
+                    state = ifp.read()
+                    index = json.loads(state) if state else {"paths": {}, "copies": {}}
+                    yield index
+                    ifp.seek(0)
+                    ifp.truncate()
+                    ifp.write(json.dumps(index))
+                    ifp.flush()
+                finally:
+                    fcntl.flock(ifp, fcntl.LOCK_UN)
+
+    def copy_path(self, p_digest:str) -> str:
+        return osp.join(self._folder, p_digest + ".gnucash")
+
+    def get_book(self, p_book:str, lgr:lg.Logger) -> str:
+        """:return: path of the inflated copy of a gzipped book -- or the book itself if NOT gzipped or NOT caching"""
+        if not self._folder or not is_gzipped(p_book):
+            return p_book
+        book = osp.abspath(p_book)
+        stat = os.stat(book)
+        source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        with self.shared_index() as index:
+            known = index["paths"].get(book)
+            if known and known["mtime_ns"] == source["mtime_ns"] and known["size"] == source["size"]:
+                digest = known["digest"]
+            else:
+                digest = self.hash_book(book)
+                index["paths"][book] = source | {"digest": digest}
+            copy = self.copy_path(digest)
+            if digest in index["copies"] and osp.isfile(copy):
+                lgr.info(f"use the inflated copy of '{p_book}'")
+            else:
+                start = time.perf_counter()
+                index["copies"][digest] = {"size": self.inflate(book, copy)}
+                lgr.info(f"inflated '{p_book}' to the cache in {time.perf_counter() - start:.2f} seconds")
+            index["copies"][digest]["used"] = time.time()
+            self.evict(index, digest, lgr)
+        return copy
+
+    @staticmethod
+    def hash_book(p_book:str) -> str:
+        digest = hashlib.sha256()
+        with open(p_book, "rb") as bfp:
+            for block in iter(lambda: bfp.read(HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def inflate(p_book:str, p_copy:str) -> int:
+        """Inflate to a temporary file first so a copy is never partly written. :return: size of the copy"""
+        temp_copy = p_copy + ".tmp"
+        with gzip.open(p_book, "rb") as gfp, open(temp_copy, "wb") as cfp:
+            shutil.copyfileobj(gfp, cfp, INFLATE_BLOCK)
+        os.replace(temp_copy, p_copy)
+        return osp.getsize(p_copy)
+
+    def evict(self, p_index:dict, p_keep:str, lgr:lg.Logger):
+        """Remove the least recently used copies -- except the one just opened -- until the copies fit in the budget."""
+        copies = p_index["copies"]
+        total = sum(copy["size"] for copy in copies.values())
+        for digest in sorted(copies, key = lambda dgst: copies[dgst]["used"]):
+            if total <= self._budget:
+                break
+            if digest == p_keep:
+                continue
+            total -= copies.pop(digest)["size"]
+            if osp.isfile(self.copy_path(digest)):
+                os.remove(self.copy_path(digest))
+            lgr.info(f"evicted the inflated copy {digest[:12]} from the cache")
+        p_index["paths"] = {book: source for book, source in p_index["paths"].items() if source["digest"] in copies}
+# END class BookCache
+
+
+book_cache = BookCache()
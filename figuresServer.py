@@ -0,0 +1,190 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# figuresServer.py -- local read-only HTTP API, on a port or a Unix socket, of the figures in the local store,
+#                     refreshed in the background whenever a watched Gnucash book changes
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import json
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from batchJobs import *
+from figuresStore import FiguresStore, STORE_FILE
+
+DEFAULT_PORT:int = 8765
+DEFAULT_POLL:float = 30.0
+# the query parameters of each path, with the type of each
+ROUTES = {
+    "/figures" : {"book": str, "updater": str, "year": int, "quarter": int, "metric": str},
+    "/today"   : {"book": str, "account": str},
+    "/status"  : {"book": str}
+}
+# the updaters run by a refresh, with the timespan when the store has figures of the book, and when it has none
+REFRESH_TIMESPANS = {
+    REV_EXPS : (CURRENT_YRS, ALL_YEARS),
+    ASSETS   : (CURRENT_YRS, ALL_YEARS),
+    BALANCE  : (UPDATE_YEARS[0], UPDATE_YEARS[0])
+}
+
+
+class FiguresRefresher(threading.Thread):
+    """
+    poll the books and re-run the updaters in TEST mode into the store when a book is newer than its stored figures
+    -- ONLY the current years are extracted again once the store has ALL the years of a book
+    """
+    def __init__(self, p_store:FiguresStore, p_books:list, p_poll:float, p_level:int, p_lgr:lg.Logger):
+        super().__init__(name = "FiguresRefresher", daemon = True)
+        self._store = p_store
+        self._books = [FiguresStore.book_key(book) for book in p_books]
+        self._poll = p_poll
+        self._level = p_level
+        self._lgr = p_lgr
+        self._stop = threading.Event()
+
+    def stale_updaters(self, p_book:str) -> dict:
+        """:return: updater -> timespan to run, for each updater whose figures are older than the book"""
+        conn = self._store.connect(p_readonly = True)
+        try:
+            stored = {src["updater"]: src["book_mtime"] for src in self._store.sources(conn, p_book)}
+        finally:
+            conn.close()
+        mtime = osp.getmtime(p_book)
+        return {updater: spans[0] if f"Update{updater}" in stored else spans[1]
+                for updater, spans in REFRESH_TIMESPANS.items() if stored.get(f"Update{updater}", -1.0) < mtime}
+
+    def refresh(self, p_book:str):
+        for updater, timespan in self.stale_updaters(p_book).items():
+            self._lgr.info(f"refresh {updater} for {timespan} of '{p_book}'")
+            try:
+                JOB_UPDATERS[updater](['-g' + p_book, '-m' + TEST, '-t' + timespan, '-l' + str(self._level),
+                                       '--store', self._store.file])
+            except Exception as fre:
+                # keep serving the figures already stored
+                self._lgr.exception(fre)
+
+    def run(self):
+        while not self._stop.is_set():
+            for book in self._books:
+                if osp.isfile(book):
+                    self.refresh(book)
+                else:
+                    self._lgr.warning(f"book '{book}' NOT found")
+            self._stop.wait(self._poll)
+
+    def stop(self):
+        self._stop.set()
+# END class FiguresRefresher
+
+
+class FiguresHandler(BaseHTTPRequestHandler):
+    """GET /figures, /today or /status with the query parameters as filters: JSON list of the matching rows"""
+    store:FiguresStore = None
+
+    def get_filters(self, p_params:dict, p_query:str) -> dict:
+        filters = {}
+        for name, value in parse_qsl(p_query):
+            if name not in p_params:
+                raise ValueError(f"unknown parameter '{name}'! use {list(p_params)}")
+            filters[name] = FiguresStore.book_key(value) if name == "book" else p_params[name](value)
+        return filters
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in ROUTES:
+            return self.send_json(404, {"error": f"'{url.path}' NOT found: use one of {list(ROUTES)}"})
+        try:
+            filters = self.get_filters(ROUTES[url.path], url.query)
+        except ValueError as gve:
+            return self.send_json(400, {"error": str(gve)})
+        # the server starts a thread for each client, so a read-only connection for each request -- opening one is cheap
+        conn = self.store.connect(p_readonly = True)
+        try:
+            if url.path == "/figures":
+                return self.send_json(200, self.store.figures(conn, filters))
+            if url.path == "/today":
+                return self.send_json(200, self.store.today(conn, filters))
+            self.send_json(200, self.store.sources(conn, filters.get("book")))
+        finally:
+            conn.close()
+
+    def send_json(self, p_code:int, p_data):
+        body = json.dumps(p_data).encode("utf-8")
+        self.send_response(p_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # a Unix socket client has NO host address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, p_format:str, *args):
+        lg.getLogger(get_base_filename(__file__)).debug("%s - " + p_format, self.address_string(), *args)
+# END class FiguresHandler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if osp.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+        # BaseHTTPRequestHandler needs these
+        self.server_name, self.server_port = "localhost", 0
+# END class UnixHTTPServer
+
+
+def set_server_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Serve the computed quarterly figures and balances from the local store",
+                                prog = f"python3 {get_filename(argv[0])}")
+    arg_parser.add_argument('-g', '--gnucash_file', action = "append", default = [],
+                            help = "path to a Gnucash book to watch and refresh the figures from -- may be repeated")
+    arg_parser.add_argument('-s', '--store', default = STORE_FILE, help = "path to the store file")
+    arg_parser.add_argument('-p', '--port', type = int, default = DEFAULT_PORT, help = "port on localhost to serve on")
+    arg_parser.add_argument('-u', '--socket', help = "path of a Unix socket to serve on, instead of the port")
+    arg_parser.add_argument('--poll', type = float, default = DEFAULT_POLL, help = "seconds between checks of the books for changes")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def figures_server_main(args:list):
+    params = set_server_args().parse_args(args)
+    lg_ctrl = MhsLogger(get_base_filename(__file__), con_level = params.level)
+    lgr = lg_ctrl.get_logger()
+
+    FiguresHandler.store = FiguresStore(params.store)
+    # create the store if necessary, so the reads never fail
+    FiguresHandler.store.connect().close()
+    refresher = FiguresRefresher(FiguresHandler.store, params.gnucash_file, params.poll, lg.WARNING, lgr)
+    refresher.start()
+
+    if params.socket:
+        server = UnixHTTPServer(params.socket, FiguresHandler)
+        lgr.info(f"serve '{params.store}' on Unix socket '{params.socket}'")
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", params.port), FiguresHandler)
+        lgr.info(f"serve '{params.store}' on http://127.0.0.1:{params.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        lgr.info("stopped")
+    finally:
+        refresher.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    figures_server_main(argv[1:])
+    exit()
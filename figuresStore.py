@@ -0,0 +1,154 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# figuresStore.py -- indexed local store of the latest computed quarterly figures and today's balances,
+#                    written by the updaters and read by the local API in figuresServer.py
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import sqlite3
+import os
+import os.path as osp
+from datetime import date, datetime as dt
+from qtrlyTable import QuarterlyTable
+
+STORE_FILE:str = osp.join(osp.dirname(osp.abspath(__file__)), "store", "figures.db")
+
+SQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS figures (
+        book    TEXT NOT NULL,
+        updater TEXT NOT NULL,
+        year    INTEGER NOT NULL,
+        quarter INTEGER NOT NULL,
+        metric  TEXT NOT NULL,
+        value   TEXT NOT NULL,
+        PRIMARY KEY (book, updater, year, quarter, metric)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS figures_metric ON figures(book, metric, year, quarter);
+    CREATE TABLE IF NOT EXISTS today (
+        book    TEXT NOT NULL,
+        account TEXT NOT NULL,
+        day     TEXT NOT NULL,
+        value   TEXT NOT NULL,
+        PRIMARY KEY (book, account)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS sources (
+        book       TEXT NOT NULL,
+        updater    TEXT NOT NULL,
+        book_mtime REAL NOT NULL,
+        updated    TEXT NOT NULL,
+        PRIMARY KEY (book, updater)
+    ) WITHOUT ROWID;
+"""
+SQL_DELETE_QUARTER = "DELETE FROM figures WHERE book = ? AND updater = ? AND year = ? AND quarter = ?"
+SQL_INSERT_FIGURE = "INSERT OR REPLACE INTO figures VALUES (?, ?, ?, ?, ?, ?)"
+SQL_INSERT_TODAY = "INSERT OR REPLACE INTO today VALUES (?, ?, ?, ?)"
+SQL_INSERT_SOURCE = "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)"
+
+
+class FiguresStore:
+    """
+    SQLite store of the figures of the LATEST run of each updater on each book
+    -- the quarters of a run replace the same quarters of the earlier runs, so a run of the current years refreshes ONLY those years
+    -- the values are the Decimal strings, exactly as computed
+    """
+    def __init__(self, p_file:str = STORE_FILE):
+        self.file = p_file
+        self._ready = False
+
+    def connect(self, p_readonly:bool = False) -> sqlite3.Connection:
+        """A new connection each time, as the updaters write and the server reads from different threads."""
+        if not self._ready:
+            folder = osp.dirname(self.file)
+            if folder and not osp.isdir(folder):
+                os.makedirs(folder)
+            conn = sqlite3.connect(self.file, timeout = 30)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SQL_SCHEMA)
+            conn.close()
+            self._ready = True
+        if p_readonly:
+            return sqlite3.connect(f"file:{self.file}?mode=ro", uri = True, timeout = 30)
+        return sqlite3.connect(self.file, timeout = 30)
+
+    @staticmethod
+    def book_key(p_book:str) -> str:
+        return osp.abspath(p_book)
+
+    def store_table(self, p_book:str, p_updater:str, p_table:QuarterlyTable, p_whole:bool = True):
+        """
+        Replace the figures of the updater for each quarter in the table
+        :param p_whole: False if the table has ONLY some of the metrics: the other metrics stored for the quarters are kept
+        """
+        book = self.book_key(p_book)
+        rows = [(book, p_updater, year, qtr, metric, str(value))
+                for year, qtr, row in p_table for metric, value in p_table.row_values(row).items()]
+        conn = self.connect()
+        try:
+            with conn:
+                if p_whole:
+                    conn.executemany(SQL_DELETE_QUARTER, [(book, p_updater, year, qtr) for year, qtr, _ in p_table])
+                conn.executemany(SQL_INSERT_FIGURE, rows)
+                self.set_source(conn, book, p_updater)
+        finally:
+            conn.close()
+
+    def store_today(self, p_book:str, p_updater:str, p_day:date, p_balances:dict):
+        """:param p_balances: account name -> Decimal balance on the day"""
+        book = self.book_key(p_book)
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany(SQL_INSERT_TODAY, [(book, acct, p_day.strftime("%Y-%m-%d"), str(value)) for acct, value in p_balances.items()])
+                self.set_source(conn, book, p_updater)
+        finally:
+            conn.close()
+
+    def store_source(self, p_book:str, p_updater:str):
+        """A run with NO figures to store is still the latest run on the book, so it is NOT re-run before the book changes."""
+        conn = self.connect()
+        try:
+            with conn:
+                self.set_source(conn, self.book_key(p_book), p_updater)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def set_source(p_conn:sqlite3.Connection, p_book:str, p_updater:str):
+        """The modification time of the book read by the run, to tell when the figures are stale."""
+        mtime = osp.getmtime(p_book) if osp.isfile(p_book) else 0.0
+        p_conn.execute(SQL_INSERT_SOURCE, (p_book, p_updater, mtime, dt.now().isoformat(timespec = "seconds")))
+
+    def sources(self, p_conn:sqlite3.Connection, p_book:str = None) -> list:
+        """:return: book, updater, modification time of the book when read, and time of each latest run"""
+        sql, params = "SELECT book, updater, book_mtime, updated FROM sources", ()
+        if p_book:
+            sql, params = sql + " WHERE book = ?", (self.book_key(p_book),)
+        return [{"book": book, "updater": updater, "book_mtime": mtime, "updated": updated}
+                for book, updater, mtime, updated in p_conn.execute(sql + " ORDER BY book, updater", params)]
+
+    @staticmethod
+    def figures(p_conn:sqlite3.Connection, p_filters:dict) -> list:
+        """
+        :param p_filters: any of book, updater, year, quarter and metric
+        :return: the matching figures, by book, updater, year, quarter and metric
+        """
+        where = " AND ".join(f"{column} = ?" for column in p_filters)
+        sql = "SELECT book, updater, year, quarter, metric, value FROM figures" + (f" WHERE {where}" if where else "")
+        return [{"book": book, "updater": updater, "year": year, "quarter": qtr, "metric": metric, "value": value}
+                for book, updater, year, qtr, metric, value in p_conn.execute(sql + " ORDER BY 1, 2, 3, 4, 5", list(p_filters.values()))]
+
+    @staticmethod
+    def today(p_conn:sqlite3.Connection, p_filters:dict) -> list:
+        """:param p_filters: any of book and account"""
+        where = " AND ".join(f"{column} = ?" for column in p_filters)
+        sql = "SELECT book, account, day, value FROM today" + (f" WHERE {where}" if where else "")
+        return [{"book": book, "account": acct, "day": day, "value": value}
+                for book, acct, day, value in p_conn.execute(sql + " ORDER BY 1, 2", list(p_filters.values()))]
+# END class FiguresStore
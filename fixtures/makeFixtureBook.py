@@ -0,0 +1,110 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# makeFixtureBook.py -- write the small SQLite Gnucash book used by perfHarness.py and the tests
+#                       -- the GUIDs, dates and amounts come from a seeded generator, so the same book is written every time
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import os.path as osp
+import random
+import sqlite3
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from sys import argv
+
+FIXTURE_BOOK:str = osp.join(osp.dirname(osp.abspath(__file__)), "budget-fixture.gnucash")
+DEFAULT_SEED:int = 2026
+DEFAULT_TRANSACTIONS:int = 400
+# ONLY completed years, as the harness cases do
+FIRST_DAY = date(2008, 1, 1)
+LAST_DAY  = date(2025, 12, 31)
+
+SQL_SCHEMA = """
+    CREATE TABLE books(guid TEXT(32) PRIMARY KEY NOT NULL, root_account_guid TEXT(32), root_template_guid TEXT(32));
+    CREATE TABLE accounts(guid TEXT(32) PRIMARY KEY NOT NULL, name TEXT, account_type TEXT, commodity_guid TEXT(32), parent_guid TEXT(32));
+    CREATE TABLE commodities(guid TEXT(32) PRIMARY KEY NOT NULL, namespace TEXT, mnemonic TEXT, fraction INTEGER);
+    CREATE TABLE transactions(guid TEXT(32) PRIMARY KEY NOT NULL, currency_guid TEXT(32), post_date TEXT);
+    CREATE TABLE splits(guid TEXT(32) PRIMARY KEY NOT NULL, tx_guid TEXT(32), account_guid TEXT(32),
+                        value_num INTEGER, value_denom INTEGER, quantity_num INTEGER, quantity_denom INTEGER);
+    CREATE TABLE prices(guid TEXT(32) PRIMARY KEY NOT NULL, commodity_guid TEXT(32), currency_guid TEXT(32), date TEXT,
+                        value_num INTEGER, value_denom INTEGER);
+    CREATE INDEX splits_account_guid_index ON splits(account_guid);
+    CREATE INDEX tx_post_date_index ON transactions(post_date);
+"""
+
+# paths of the accounts read by the updaters, parents first
+FIXTURE_ACCTS = [
+    ["FAMILY"], ["FAMILY", "INVEST"], ["FAMILY", "INVEST", "OPEN"], ["FAMILY", "INVEST", "TFSA"], ["FAMILY", "INVEST", "xRESP"],
+    ["FAMILY", "LIQUID"], ["FAMILY", "LIQUID", "Bank"], ["FAMILY", "LIQUID", "$&"], ["FAMILY", "PM"], ["FAMILY", "PM", "Au"],
+    ["FAMILY", "PM", "Ag"], ["FAMILY", "Rewards"], ["FAMILY", "LOANS"], ["FAMILY", "House"], ["FAMILY", "Car"],
+    ["FAMILY", "LIABS"], ["FAMILY", "LIABS", "CC"], ["FAMILY", "LIABS", "KIA"], ["FAMILY", "LIABS", "SLINE"],
+    ["TRUST"], ["XCHALET"],
+    ["REV"], ["REV", "REV_Invest"], ["REV", "REV_Other"], ["REV", "REV_Employment"], ["REV", "REV_Employment", "Salary"],
+    ["EXP"], ["EXP", "EXP_Balance"], ["EXP", "EXP_CONTINGENT"], ["EXP", "EXP_NECESSARY"], ["EXP", "EXP_NECESSARY", "Food"],
+    ["DEDNS"], ["DEDNS", "DEDNS_Income"], ["DEDNS", "DEDNS_Income", "Mark"], ["DEDNS", "DEDNS_Income", "Lulu"],
+    ["DEDNS", "DEDNS_Income", "Marie-Laure"],
+    ["Equity"]
+]
+# held in units of a fund, to exercise the prices
+FUND_ACCT = ["FAMILY", "INVEST", "RRSP"]
+EQUITY_ACCT = ["Equity"]
+
+
+def make_fixture_book(p_file:str, p_transactions:int = DEFAULT_TRANSACTIONS, p_seed:int = DEFAULT_SEED) -> str:
+    """Each transaction moves a random amount between a random leaf account and Equity."""
+    rand = random.Random(p_seed)
+    def guid() -> str:
+        return f"{rand.getrandbits(128):032x}"
+
+    if osp.isfile(p_file):
+        os.remove(p_file)
+    conn = sqlite3.connect(p_file)
+    try:
+        conn.execute("PRAGMA page_size = 1024")
+        conn.executescript(SQL_SCHEMA)
+        cad, fund = guid(), guid()
+        conn.executemany("INSERT INTO commodities VALUES (?, ?, ?, ?)", [(cad, "CURRENCY", "CAD", 100), (fund, "FUND", "XFUND", 10000)])
+
+        accts = {(): guid()}
+        conn.execute("INSERT INTO accounts VALUES (?, 'Root Account', 'ROOT', ?, NULL)", (accts[()], cad))
+        conn.execute("INSERT INTO books VALUES (?, ?, ?)", (guid(), accts[()], guid()))
+        for path in FIXTURE_ACCTS + [FUND_ACCT]:
+            accts[tuple(path)] = guid()
+            conn.execute("INSERT INTO accounts VALUES (?, ?, 'ASSET', ?, ?)",
+                         (accts[tuple(path)], path[-1], fund if path == FUND_ACCT else cad, accts[tuple(path[:-1])]))
+
+        leaves = [path for path in accts if path and path != tuple(EQUITY_ACCT)
+                  and not any(other[:len(path)] == path and other != path for other in accts)]
+        num_days = (LAST_DAY - FIRST_DAY).days + 1
+        for _ in range(p_transactions):
+            tx = guid()
+            day = FIRST_DAY + timedelta(days = rand.randrange(num_days))
+            conn.execute("INSERT INTO transactions VALUES (?, ?, ?)", (tx, cad, day.isoformat() + " 10:59:00"))
+            acct = rand.choice(leaves)
+            amount = rand.randint(-50000, 50000)
+            quantity = (amount * 3, 10000) if list(acct) == FUND_ACCT else (amount, 100)
+            conn.execute("INSERT INTO splits VALUES (?, ?, ?, ?, 100, ?, ?)", (guid(), tx, accts[acct], amount, *quantity))
+            conn.execute("INSERT INTO splits VALUES (?, ?, ?, ?, 100, ?, 100)", (guid(), tx, accts[tuple(EQUITY_ACCT)], -amount, -amount))
+        conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, 100)",
+                         [(guid(), fund, cad, f"{year}-06-30 10:59:00", 1000 + year) for year in range(FIRST_DAY.year, LAST_DAY.year + 1)])
+        conn.commit()
+    finally:
+        conn.close()
+    return p_file
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description = "Write the fixture Gnucash book of the harness", prog = f"python3 {osp.basename(argv[0])}")
+    arg_parser.add_argument('-g', '--gnucash_file', default = FIXTURE_BOOK, help = "path of the book to write")
+    arg_parser.add_argument('-n', '--transactions', type = int, default = DEFAULT_TRANSACTIONS, help = "number of transactions")
+    arg_parser.add_argument('--seed', type = int, default = DEFAULT_SEED, help = "seed of the generator")
+    fixture_args = arg_parser.parse_args(argv[1:])
+    print(f"wrote '{make_fixture_book(fixture_args.gnucash_file, fixture_args.transactions, fixture_args.seed)}'")
@@ -0,0 +1,247 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# gncLiteSession.py -- common code for the read-only Gnucash sessions that do NOT use the Gnucash Python bindings
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os.path as osp
+import logging as lg
+from abc import ABC, abstractmethod
+from datetime import date, timedelta, datetime as dt
+from decimal import Decimal, ROUND_HALF_UP
+
+ONE_DAY:timedelta = timedelta(days = 1)
+ZERO:Decimal = Decimal(0)
+DEFAULT_FRACTION:int = 100
+
+
+def month_ends(p_first:date, p_last:date) -> list:
+    """:return: (first day, last day) of each month from the month of the first date to the month of the last date"""
+    months = []
+    start = date(p_first.year, p_first.month, 1)
+    while start <= p_last:
+        following = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        months.append((start, following - ONE_DAY))
+        start = following
+    return months
+
+
+def to_decimal(p_num:int, p_denom:int) -> Decimal:
+    """Keep the exponent of a power-of-ten denominator, e.g. 263080/100 -> 2630.80, same as gnc_numeric_to_python_decimal()."""
+    exponent = len(str(p_denom)) - 1
+    if p_denom == 10 ** exponent:
+        return Decimal(p_num).scaleb(-exponent)
+    return Decimal(p_num) / Decimal(p_denom)
+
+
+def as_date(p_date:date) -> date:
+    """UpdateBalance.fill_today() uses a datetime."""
+    return p_date.date() if isinstance(p_date, dt) else p_date
+
+
+class LiteAccount:
+    """the few fields of a Gnucash account needed by the updaters"""
+    __slots__ = ("guid", "name", "parent", "commodity", "children")
+
+    def __init__(self, p_guid:str, p_name:str, p_parent:str, p_commodity:str):
+        self.guid = p_guid
+        self.name = p_name
+        self.parent = p_parent
+        self.commodity = p_commodity
+        self.children = []
+
+    def GetName(self) -> str:
+        return self.name
+
+    def lookup_by_name(self, p_name:str):
+        """Same search order as the Gnucash engine: the children first, THEN the descendants of each child."""
+        for child in self.children:
+            if child.name == p_name:
+                return child
+        for child in self.children:
+            found = child.lookup_by_name(p_name)
+            if found:
+                return found
+        return None
+
+    def get_descendants(self) -> list:
+        descendants = []
+        for child in self.children:
+            descendants.append(child)
+            descendants += child.get_descendants()
+        return descendants
+# END class LiteAccount
+
+
+class GnucashLiteSession(ABC):
+    """
+    read-only replacement for GnucashSession with the same methods the updaters call
+    -- subclasses load the accounts and supply the split sums and the prices
+    -- the loaded data stays usable after end_session(), as UpdateBalance reads balances after the session has ended
+    """
+    def __init__(self, p_mode:str, p_gncfile:str, p_domain:str, p_lgr:lg.Logger):
+        self._mode = p_mode
+        self._gnc_file = p_gncfile
+        self._domain = p_domain
+        self._lgr = p_lgr
+        self._root = None
+        self._accounts = {}
+        # guid -> (mnemonic, fraction)
+        self._commodities = {}
+        self._currency = None
+        self._price_cache = {}
+        # number of splits in the book, if the backend counts them
+        self.split_count = None
+
+    def get_file_name(self) -> str:
+        return self._gnc_file
+
+    def get_root_acct(self) -> LiteAccount:
+        return self._root
+
+    def get_currency(self) -> str:
+        return self._commodities.get(self._currency, (None,))[0]
+
+    def begin_session(self):
+        self._lgr.info(f"{self.__class__.__name__}: load '{osp.basename(self._gnc_file)}'")
+        self.load_book()
+        self._lgr.info(f"loaded {len(self._accounts)} accounts; currency = {self.get_currency()}")
+
+    def link_accounts(self):
+        """Build the account tree once ALL the accounts are loaded."""
+        for acct in self._accounts.values():
+            if acct.parent in self._accounts:
+                self._accounts[acct.parent].children.append(acct)
+        for acct in self._accounts.values():
+            acct.children.sort(key = lambda a: a.name)
+
+    def end_session(self):
+        """Nothing to save as just reading."""
+        pass
+
+    @abstractmethod
+    def load_book(self):
+        """Fill the accounts and commodities, call link_accounts(), and set the root account and the book currency."""
+
+    @abstractmethod
+    def get_quantities(self, p_guids:list, p_end:date) -> dict:
+        """:return: dict of account guid to the sum of the split quantities posted ON or BEFORE the end date"""
+
+    @abstractmethod
+    def get_period_sums(self, p_guids:list, p_start:date, p_end:date) -> (Decimal, Decimal):
+        """:return: debit and credit sums of the split quantities of the accounts posted in the period"""
+
+    @abstractmethod
+    def get_monthly_sums(self, p_guids:list, p_first:date, p_last:date) -> dict:
+        """
+        :return: dict of account guid to dict of (year, month) to [debits sum, credits sum, number of debits, number of credits]
+                 of the split quantities of the account ALONE, for the months from the first date to the last date
+                 -- months with NO splits may be missing
+        """
+
+    @abstractmethod
+    def find_price(self, p_commodity:str, p_currency:str, p_date:date) -> Decimal | None:
+        """:return: the latest price ON or BEFORE the date of the commodity in the currency, or None"""
+
+    def account_from_path(self, p_path:list) -> LiteAccount:
+        acct = self._root
+        for name in p_path:
+            acct = acct.lookup_by_name(name)
+            if acct is None:
+                raise Exception(f"Path '{p_path}' could NOT be found!")
+        return acct
+
+    def get_price(self, p_commodity:str, p_date:date) -> Decimal:
+        """Price of the commodity in the book currency, trying the inverse price if there is no direct one."""
+        key = (p_commodity, p_date)
+        if key not in self._price_cache:
+            price = self.find_price(p_commodity, self._currency, p_date)
+            if price is None:
+                inverse = self.find_price(self._currency, p_commodity, p_date)
+                price = (Decimal(1) / inverse) if inverse else None
+            if price is None:
+                self._lgr.warning(f"NO price for {self._commodities.get(p_commodity, (p_commodity,))[0]} on {p_date}!")
+                price = ZERO
+            self._price_cache[key] = price
+        return self._price_cache[key]
+
+    def convert_balances(self, p_quantities:dict, p_date:date) -> dict:
+        """Convert each account balance to the book currency, rounded to the currency fraction like the Gnucash engine."""
+        fraction = self._commodities.get(self._currency, (None, DEFAULT_FRACTION))[1]
+        exponent = Decimal(1) / Decimal(fraction)
+        balances = {}
+        for guid, qty in p_quantities.items():
+            commodity = self._accounts[guid].commodity
+            if commodity != self._currency and qty:
+                qty *= self.get_price(commodity, p_date)
+            # an account in the currency is already at this fraction, but an EMPTY account gives 0.00 as in Gnucash
+            balances[guid] = qty.quantize(exponent, rounding = ROUND_HALF_UP)
+        return balances
+
+    def get_total_balance(self, p_path:list, p_date:date) -> Decimal:
+        """Total balance of the account and ALL sub-accounts at the end of the date, in the book currency."""
+        p_date = as_date(p_date)
+        acct = self.account_from_path(p_path)
+        guids = [acct.guid] + [a.guid for a in acct.get_descendants()]
+        acct_sum = sum(self.convert_balances(self.get_quantities(guids, p_date), p_date).values(), ZERO)
+        self._lgr.debug(f"{acct.name} on {p_date} = ${acct_sum}")
+        return acct_sum
+
+    def get_total_balances(self, p_paths:list, p_date:date) -> dict:
+        """
+        Total balances of SEVERAL accounts, which may be nested, with ONE read of the balances of ALL the accounts
+        in their trees at the end of the date, added up from the leaves so that each subtree is totalled ONCE
+        :return: dict of tuple(path) to the total balance in the book currency
+        """
+        p_date = as_date(p_date)
+        # from the top of the tree down, so a nested account is already included with its ancestor
+        targets = {tuple(path): self.account_from_path(path) for path in sorted(p_paths, key = len)}
+        tree_guids = set()
+        for acct in targets.values():
+            if acct.guid not in tree_guids:
+                tree_guids.add(acct.guid)
+                tree_guids.update(a.guid for a in acct.get_descendants())
+        balances = self.convert_balances(self.get_quantities(list(tree_guids), p_date), p_date)
+
+        totals = {}
+        def subtree_total(p_acct:LiteAccount) -> Decimal:
+            if p_acct.guid not in totals:
+                totals[p_acct.guid] = balances[p_acct.guid] + sum((subtree_total(c) for c in p_acct.children), ZERO)
+            return totals[p_acct.guid]
+
+        results = {path: subtree_total(acct) for path, acct in targets.items()}
+        self._lgr.debug("totals on %s = %s", p_date, results)
+        return results
+
+    def get_account_assets(self, p_accounts:dict, p_date:date, p_data:dict = None) -> dict:
+        """Fill the data dict with the total balance of each of the accounts at the end of the date."""
+        if p_data is None:
+            p_data = {}
+        for item, path in p_accounts.items():
+            p_data[item] = str(self.get_total_balance(path, p_date))
+        return p_data
+
+    def fill_splits(self, p_path:list, p_period_starts:list, p_periods:list) -> str:
+        """
+        Same as gncUtils.fill_splits() but with the sums done by the backend
+        :param            p_path: account hierarchy from the root account to the target account
+        :param   p_period_starts: start date for each period
+        :param         p_periods: start date, end date, debits sum, credits sum, TOTAL for each period
+        :return: name of the target account
+        """
+        acct = self.account_from_path(p_path)
+        guids = [acct.guid] + [a.guid for a in acct.get_descendants()]
+        for period in p_periods:
+            debits, credits = self.get_period_sums(guids, period[0], period[1])
+            period[2] += debits
+            period[3] += credits
+            period[4] += debits + credits
+        return acct.name
+# END class GnucashLiteSession
@@ -0,0 +1,152 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# gncSqlSession.py -- read the sums and balances needed by the updaters directly from a Gnucash book stored as SQLite
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import sqlite3
+import threading
+from gncLiteSession import *
+
+SQLITE_HEADER:bytes = b"SQLite format 3\x00"
+
+SQL_ACCOUNTS = "SELECT guid, name, parent_guid, commodity_guid FROM accounts"
+SQL_COMMODITIES = "SELECT guid, mnemonic, fraction FROM commodities"
+SQL_ROOT = "SELECT root_account_guid FROM books"
+SQL_CURRENCY = "SELECT currency_guid FROM transactions GROUP BY currency_guid ORDER BY COUNT(*) DESC LIMIT 1"
+# sum by denominator so the integer sums stay exact
+SQL_QUANTITIES = """
+    SELECT s.account_guid, s.quantity_denom, SUM(s.quantity_num)
+    FROM splits s JOIN transactions t ON t.guid = s.tx_guid
+    WHERE s.account_guid IN ({}) AND t.post_date < ?
+    GROUP BY s.account_guid, s.quantity_denom
+"""
+SQL_PERIOD_SUMS = """
+    SELECT s.quantity_denom,
+           SUM(CASE WHEN s.quantity_num >= 0 THEN s.quantity_num ELSE 0 END),
+           SUM(CASE WHEN s.quantity_num < 0 THEN s.quantity_num ELSE 0 END)
+    FROM splits s JOIN transactions t ON t.guid = s.tx_guid
+    WHERE s.account_guid IN ({}) AND t.post_date >= ? AND t.post_date < ?
+    GROUP BY s.quantity_denom
+"""
+# the month is the start of the date text, in either format
+SQL_MONTHLY_SUMS = """
+    SELECT s.account_guid, substr(t.post_date, 1, {}), s.quantity_denom,
+           SUM(CASE WHEN s.quantity_num >= 0 THEN s.quantity_num ELSE 0 END),
+           SUM(CASE WHEN s.quantity_num < 0 THEN s.quantity_num ELSE 0 END),
+           SUM(CASE WHEN s.quantity_num >= 0 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN s.quantity_num < 0 THEN 1 ELSE 0 END)
+    FROM splits s JOIN transactions t ON t.guid = s.tx_guid
+    WHERE s.account_guid IN ({}) AND t.post_date >= ? AND t.post_date < ?
+    GROUP BY 1, 2, 3
+"""
+SQL_PRICE = """
+    SELECT value_num, value_denom FROM prices
+    WHERE commodity_guid = ? AND currency_guid = ? AND date < ?
+    ORDER BY date DESC LIMIT 1
+"""
+
+
+def is_sqlite_book(p_gncfile:str) -> bool:
+    with open(p_gncfile, "rb") as gfp:
+        return gfp.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def date_key(p_date:date) -> str:
+    """
+    Dates are stored as text, 'YYYY-MM-DD hh:mm:ss' by recent Gnucash or 'YYYYMMDDhhmmss' by older versions,
+    so compare with the date in the matching format -- which sorts before any time on that day.
+    """
+    return p_date.isoformat()
+
+
+def compact_date_key(p_date:date) -> str:
+    return p_date.strftime("%Y%m%d")
+
+
+class GnucashSqlSession(GnucashLiteSession):
+    """
+    use SQL GROUP BY queries on the accounts, transactions, splits and prices tables instead of loading
+    the whole book into the Gnucash engine -- Gnucash indexes splits.account_guid and transactions.post_date
+    """
+    def __init__(self, p_mode:str, p_gncfile:str, p_domain:str, p_lgr:lg.Logger):
+        super().__init__(p_mode, p_gncfile, p_domain, p_lgr)
+        # a connection for each thread, so a session can be shared by updaters running in parallel
+        self._local = threading.local()
+        self._conns = []
+        self._date_key = date_key
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(f"file:{self._gnc_file}?mode=ro", uri = True, check_same_thread = False)
+            self._conns.append(conn)
+        return conn
+
+    def end_session(self):
+        """The connections are opened again as needed."""
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._local = threading.local()
+
+    def load_book(self):
+        conn = self.connection()
+        for guid, name, parent, commodity in conn.execute(SQL_ACCOUNTS):
+            self._accounts[guid] = LiteAccount(guid, name, parent, commodity)
+        self.link_accounts()
+        for guid, mnemonic, fraction in conn.execute(SQL_COMMODITIES):
+            self._commodities[guid] = (mnemonic, fraction)
+        self._root = self._accounts[conn.execute(SQL_ROOT).fetchone()[0]]
+        row = conn.execute(SQL_CURRENCY).fetchone()
+        self._currency = row[0] if row else self._root.commodity
+        self.split_count = conn.execute("SELECT COUNT(*) FROM splits").fetchone()[0]
+
+        sample = conn.execute("SELECT post_date FROM transactions LIMIT 1").fetchone()
+        if sample and sample[0] and '-' not in sample[0]:
+            self._date_key = compact_date_key
+
+    def get_quantities(self, p_guids:list, p_end:date) -> dict:
+        quantities = dict.fromkeys(p_guids, ZERO)
+        sql = SQL_QUANTITIES.format(','.join('?' * len(p_guids)))
+        for guid, denom, total in self.connection().execute(sql, [*p_guids, self._date_key(p_end + ONE_DAY)]):
+            quantities[guid] += to_decimal(total, denom)
+        return quantities
+
+    def get_period_sums(self, p_guids:list, p_start:date, p_end:date) -> (Decimal, Decimal):
+        debits = credits = ZERO
+        sql = SQL_PERIOD_SUMS.format(','.join('?' * len(p_guids)))
+        params = [*p_guids, self._date_key(p_start), self._date_key(p_end + ONE_DAY)]
+        for denom, debit, credit in self.connection().execute(sql, params):
+            debits += to_decimal(debit, denom)
+            credits += to_decimal(credit, denom)
+        return debits, credits
+
+    def get_monthly_sums(self, p_guids:list, p_first:date, p_last:date) -> dict:
+        compact = self._date_key is compact_date_key
+        sql = SQL_MONTHLY_SUMS.format(6 if compact else 7, ','.join('?' * len(p_guids)))
+        params = [*p_guids, self._date_key(date(p_first.year, p_first.month, 1)), self._date_key(p_last + ONE_DAY)]
+        sums = {}
+        for guid, month, denom, debit, credit, num_debits, num_credits in self.connection().execute(sql, params):
+            key = (int(month[:4]), int(month[-2:]))
+            acct_sums = sums.setdefault(guid, {}).setdefault(key, [ZERO, ZERO, 0, 0])
+            # a side with NO splits stays at ZERO
+            if num_debits:
+                acct_sums[0] += to_decimal(debit, denom)
+                acct_sums[2] += num_debits
+            if num_credits:
+                acct_sums[1] += to_decimal(credit, denom)
+                acct_sums[3] += num_credits
+        return sums
+
+    def find_price(self, p_commodity:str, p_currency:str, p_date:date) -> Decimal | None:
+        row = self.connection().execute(SQL_PRICE, (p_commodity, p_currency, self._date_key(p_date + ONE_DAY))).fetchone()
+        return to_decimal(row[0], row[1]) if row else None
+# END class GnucashSqlSession
@@ -0,0 +1,280 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# gncXmlSession.py -- stream a (gzipped) XML Gnucash book and keep ONLY the data needed for the configured account paths
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import gzip
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime as dt
+from xml.etree.ElementTree import iterparse
+from gncLiteSession import *
+
+GZIP_MAGIC:bytes = b"\x1f\x8b"
+XML_START:bytes  = b"<?xml"
+GNC_NAMESPACES = {
+    "gnc"  : "http://www.gnucash.org/XML/gnc" ,
+    "act"  : "http://www.gnucash.org/XML/act" ,
+    "cmdty": "http://www.gnucash.org/XML/cmdty" ,
+    "price": "http://www.gnucash.org/XML/price" ,
+    "split": "http://www.gnucash.org/XML/split" ,
+    "trn"  : "http://www.gnucash.org/XML/trn" ,
+    "ts"   : "http://www.gnucash.org/XML/ts"
+}
+ROOT_TYPE:str = "ROOT"
+
+
+def tag(p_name:str) -> str:
+    """'gnc:book' -> '{http://www.gnucash.org/XML/gnc}book'"""
+    prefix, local = p_name.split(':')
+    return f"{{{GNC_NAMESPACES[prefix]}}}{local}"
+
+
+BOOK_TAG        = tag("gnc:book")
+ACCOUNT_TAG     = tag("gnc:account")
+TRANSACTION_TAG = tag("gnc:transaction")
+TEMPLATES_TAG   = tag("gnc:template-transactions")
+PRICEDB_TAG     = tag("gnc:pricedb")
+PRICE_TAG       = "price"
+
+
+def is_xml_book(p_gncfile:str) -> bool:
+    with open(p_gncfile, "rb") as gfp:
+        header = gfp.read(len(XML_START))
+    return header.startswith(GZIP_MAGIC) or header == XML_START
+
+
+def open_book_stream(p_gncfile:str):
+    """Decompress incrementally if gzipped."""
+    with open(p_gncfile, "rb") as gfp:
+        gzipped = gfp.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    return gzip.open(p_gncfile, "rb") if gzipped else open(p_gncfile, "rb")
+
+
+def commodity_key(p_elem) -> str | None:
+    if p_elem is None:
+        return None
+    return f"{p_elem.findtext(tag('cmdty:space'))}:{p_elem.findtext(tag('cmdty:id'))}"
+
+
+def parse_numeric(p_text:str) -> Decimal:
+    num, denom = p_text.split('/')
+    return to_decimal(int(num), int(denom))
+
+
+def parse_date(p_text:str) -> date:
+    """Same as Transaction.GetDate().date(): the date in LOCAL time."""
+    return dt.strptime(p_text.strip(), "%Y-%m-%d %H:%M:%S %z").astimezone().date()
+
+
+class SplitSeries:
+    """dates and running sums and counts of the splits of one account, for O(log n) balances and period sums"""
+    __slots__ = ("dates", "debits", "credits", "num_debits", "num_credits", "_pending")
+
+    def __init__(self):
+        self._pending = []
+        self.dates = []
+        self.debits = []
+        self.credits = []
+        self.num_debits = []
+        self.num_credits = []
+
+    def add(self, p_date:date, p_amount:Decimal):
+        self._pending.append((p_date, p_amount))
+
+    def finish(self):
+        debit_sum = credit_sum = ZERO
+        debit_count = credit_count = 0
+        for split_date, amount in sorted(self._pending, key = lambda x: x[0]):
+            # if the amount is negative this is a credit, else a debit
+            if amount < ZERO:
+                credit_sum += amount
+                credit_count += 1
+            else:
+                debit_sum += amount
+                debit_count += 1
+            self.dates.append(split_date)
+            self.debits.append(debit_sum)
+            self.credits.append(credit_sum)
+            self.num_debits.append(debit_count)
+            self.num_credits.append(credit_count)
+        self._pending = None
+
+    def balance(self, p_date:date) -> Decimal:
+        """Sum of the splits ON or BEFORE the date."""
+        indx = bisect_right(self.dates, p_date) - 1
+        return (self.debits[indx] + self.credits[indx]) if indx >= 0 else ZERO
+
+    def period_sums(self, p_start:date, p_end:date) -> (Decimal, Decimal):
+        """
+        Debit and credit sums in the period
+        -- a side with NO splits in the period stays at ZERO, exactly as when adding the splits one by one
+        """
+        return self.period_totals(p_start, p_end)[:2]
+
+    def period_totals(self, p_start:date, p_end:date) -> (Decimal, Decimal, int, int):
+        """:return: debit and credit sums in the period, and the number of debits and credits"""
+        first = bisect_right(self.dates, p_start - ONE_DAY) - 1
+        last = bisect_right(self.dates, p_end) - 1
+        if last < 0 or last == first:
+            return ZERO, ZERO, 0, 0
+        if first < 0:
+            num_debits, num_credits = self.num_debits[last], self.num_credits[last]
+            return self.debits[last] if num_debits else ZERO, self.credits[last] if num_credits else ZERO, num_debits, num_credits
+        num_debits = self.num_debits[last] - self.num_debits[first]
+        num_credits = self.num_credits[last] - self.num_credits[first]
+        debits = (self.debits[last] - self.debits[first]) if num_debits else ZERO
+        credits = (self.credits[last] - self.credits[first]) if num_credits else ZERO
+        return debits, credits, num_debits, num_credits
+# END class SplitSeries
+
+
+class GnucashXmlSession(GnucashLiteSession):
+    """
+    read a compressed XML book with iterparse, dropping each element once handled
+    -- ALL the accounts are kept as they are small and needed to resolve the paths,
+       but ONLY the splits of the accounts in the configured paths and the prices of their commodities
+    """
+    def __init__(self, p_mode:str, p_gncfile:str, p_domain:str, p_lgr:lg.Logger, p_paths:list = None):
+        super().__init__(p_mode, p_gncfile, p_domain, p_lgr)
+        self._paths = p_paths
+        self._kept = None
+        # guid -> SplitSeries
+        self._splits = {}
+        # (commodity, currency) -> sorted list of (date, price)
+        self._prices = {}
+        self.split_count = 0
+
+    def load_book(self):
+        currencies = Counter()
+        book = pricedb = None
+        in_templates = False
+        for event, elem in iterparse(open_book_stream(self._gnc_file), events = ("start", "end")):
+            if event == "start":
+                if elem.tag == BOOK_TAG:
+                    book = elem
+                elif elem.tag == PRICEDB_TAG:
+                    pricedb = elem
+                elif elem.tag == TEMPLATES_TAG:
+                    in_templates = True
+                elif elem.tag == TRANSACTION_TAG and self._kept is None and not in_templates:
+                    self.keep_accounts()
+                continue
+
+            if in_templates:
+                if elem.tag == TEMPLATES_TAG:
+                    in_templates = False
+                    book.clear()
+            elif elem.tag == TRANSACTION_TAG:
+                currencies[commodity_key(elem.find(tag("trn:currency")))] += 1
+                self.add_splits(elem)
+                book.clear()
+            elif elem.tag == ACCOUNT_TAG:
+                self.add_account(elem)
+                book.clear()
+            elif elem.tag == PRICE_TAG:
+                self.add_price(elem)
+                pricedb.clear()
+            elif elem.tag == PRICEDB_TAG:
+                book.clear()
+
+        if self._kept is None:
+            self.keep_accounts()
+        self._currency = currencies.most_common(1)[0][0] if currencies else self._root.commodity
+        for series in self._splits.values():
+            series.finish()
+        self.drop_prices()
+        self._lgr.info(f"kept the splits of {len(self._splits)} accounts and {sum(len(p) for p in self._prices.values())} prices")
+
+    def add_account(self, p_elem):
+        guid = p_elem.findtext(tag("act:id"))
+        commodity = commodity_key(p_elem.find(tag("act:commodity")))
+        self._accounts[guid] = LiteAccount(guid, p_elem.findtext(tag("act:name")), p_elem.findtext(tag("act:parent")), commodity)
+        scu = p_elem.findtext(tag("act:commodity-scu"))
+        if commodity and (commodity not in self._commodities or scu):
+            self._commodities[commodity] = (commodity.split(':')[-1], int(scu) if scu else DEFAULT_FRACTION)
+        if p_elem.findtext(tag("act:type")) == ROOT_TYPE:
+            self._root = self._accounts[guid]
+
+    def keep_accounts(self):
+        """All the accounts are loaded: find the accounts in the configured paths, and their descendants."""
+        self.link_accounts()
+        if self._paths is None:
+            self._kept = set(self._accounts.keys())
+        else:
+            self._kept = set()
+            for path in self._paths:
+                try:
+                    acct = self.account_from_path(path)
+                except Exception as kae:
+                    self._lgr.debug(repr(kae))
+                    continue
+                self._kept.add(acct.guid)
+                self._kept.update(a.guid for a in acct.get_descendants())
+        self._splits = {guid: SplitSeries() for guid in self._kept}
+
+    def add_splits(self, p_elem):
+        trans_date = None
+        for split in p_elem.iter(tag("trn:split")):
+            self.split_count += 1
+            series = self._splits.get(split.findtext(tag("split:account")))
+            if series is None:
+                continue
+            if trans_date is None:
+                trans_date = parse_date(p_elem.find(tag("trn:date-posted")).findtext(tag("ts:date")))
+            series.add(trans_date, parse_numeric(split.findtext(tag("split:quantity"))))
+
+    def add_price(self, p_elem):
+        key = (commodity_key(p_elem.find(tag("price:commodity"))), commodity_key(p_elem.find(tag("price:currency"))))
+        price_date = parse_date(p_elem.find(tag("price:time")).findtext(tag("ts:date")))
+        self._prices.setdefault(key, []).append((price_date, parse_numeric(p_elem.findtext(tag("price:value")))))
+
+    def drop_prices(self):
+        """Keep only the prices of the commodities of the kept accounts."""
+        commodities = {self._accounts[guid].commodity for guid in self._kept}
+        self._prices = {key: sorted(prices, key = lambda x: x[0]) for key, prices in self._prices.items()
+                        if key[0] in commodities or key[1] in commodities}
+
+    def get_series(self, p_guid:str) -> SplitSeries:
+        series = self._splits.get(p_guid)
+        if series is None:
+            raise Exception(f"account '{self._accounts[p_guid].name}' is NOT in the configured paths!")
+        return series
+
+    def get_quantities(self, p_guids:list, p_end:date) -> dict:
+        return {guid: self.get_series(guid).balance(p_end) for guid in p_guids}
+
+    def get_period_sums(self, p_guids:list, p_start:date, p_end:date) -> (Decimal, Decimal):
+        debits = credits = ZERO
+        for guid in p_guids:
+            acct_debits, acct_credits = self.get_series(guid).period_sums(p_start, p_end)
+            debits += acct_debits
+            credits += acct_credits
+        return debits, credits
+
+    def get_monthly_sums(self, p_guids:list, p_first:date, p_last:date) -> dict:
+        months = month_ends(p_first, p_last)
+        sums = {}
+        for guid in p_guids:
+            series = self.get_series(guid)
+            for start, end in months:
+                totals = series.period_totals(start, end)
+                if totals[2] or totals[3]:
+                    sums.setdefault(guid, {})[(start.year, start.month)] = list(totals)
+        return sums
+
+    def find_price(self, p_commodity:str, p_currency:str, p_date:date) -> Decimal | None:
+        prices = self._prices.get((p_commodity, p_currency))
+        if not prices:
+            return None
+        indx = bisect_right(prices, p_date, key = lambda x: x[0]) - 1
+        return prices[indx][1] if indx >= 0 else None
+# END class GnucashXmlSession
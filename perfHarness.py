@@ -0,0 +1,165 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# perfHarness.py -- run each updater in TEST mode on a fixture Gnucash book and check the output against golden files,
+#                   and the runtime and peak memory against stored baselines
+#                   -- the fixture book is written by fixtures/makeFixtureBook.py, and its golden files and baselines
+#                      are in fixtures/golden: re-record them with --record after an INTENDED change of the output,
+#                      and re-record the baselines on the machine that runs the performance checks
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import time
+import tracemalloc
+from updateBudget import *
+from updateRevExps import UpdateRevExps
+from updateAssets import UpdateAssets
+from updateBalance import UpdateBalance
+
+DEFAULT_FIXTURE_BOOK:str = osp.join(osp.dirname(osp.abspath(__file__)), "fixtures", "budget-fixture.gnucash")
+DEFAULT_GOLDEN_FOLDER:str = osp.join(osp.dirname(osp.abspath(__file__)), "fixtures", "golden")
+BASELINES_FILE:str = "baselines.json"
+DEFAULT_THRESHOLD:float = 0.25
+DEFAULT_REPEAT:int = 3
+RUNTIME:str  = "runtime"
+PEAK_MEM:str = "peak_mem"
+
+# updater and timespan for each case -- only COMPLETED years so the output does not depend on the day of the run
+HARNESS_CASES = [
+    (UpdateRevExps, "2023"),
+    (UpdateAssets,  "2023"),
+    (UpdateBalance, "2015")
+]
+
+
+def case_name(p_class:type, p_span:str) -> str:
+    return f"{p_class.__name__}-{p_span}"
+
+
+def normalize(p_data) -> list:
+    """Make the output comparable with the JSON golden files."""
+    return json.loads(json.dumps(p_data, default = str))
+
+
+def run_case(p_class:type, p_span:str, p_book:str, p_trace:bool) -> (dict, float, int):
+    """
+    Run an updater the same way as UpdateBudget.go() in TEST mode, but keeping the Google data
+    :return: output, runtime in seconds, peak traced memory in bytes
+    """
+    updater = p_class(['-g' + p_book, '-m' + TEST, '-t' + p_span, '-l' + str(lg.WARNING), '--no_history'], get_base_filename(__file__))
+    try:
+        years = get_timespan(updater.timespan, updater._lgr)
+        if p_trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            updater.prepare_gnucash_data(years)
+            updater.prepare_google_data(years)
+        finally:
+            runtime = time.perf_counter() - start
+            peak = 0
+            if p_trace:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        output = {"gnucash": normalize(updater.get_gnucash_data()), "google": normalize(updater.get_google_data())}
+    finally:
+        # go() is NOT called, so stop the log listener here
+        stop_log_queue(updater._lgr, updater._log_listener)
+    return output, runtime, peak
+
+
+def measure_case(p_class:type, p_span:str, p_book:str, p_repeat:int) -> (dict, dict):
+    """Best runtime of several untraced runs, and the peak memory of a separate traced run."""
+    output, best, _ = run_case(p_class, p_span, p_book, False)
+    for _ in range(p_repeat - 1):
+        _, runtime, _ = run_case(p_class, p_span, p_book, False)
+        best = min(best, runtime)
+    _, _, peak = run_case(p_class, p_span, p_book, True)
+    return output, {RUNTIME: best, PEAK_MEM: peak}
+
+
+def check_case(p_name:str, p_output:dict, p_stats:dict, p_golden_folder:str, p_baselines:dict, p_threshold:float) -> list:
+    """:return: list of failure messages, empty if the case passed"""
+    failures = []
+    golden_file = osp.join(p_golden_folder, p_name + ".json")
+    if not osp.isfile(golden_file):
+        return [f"{p_name}: NO golden file '{golden_file}' -- run with --record"]
+    with open(golden_file) as gfp:
+        golden = json.load(gfp)
+    for part in golden:
+        if p_output.get(part) != golden[part]:
+            failures.append(f"{p_name}: {part} output does NOT match the golden file")
+
+    baseline = p_baselines.get(p_name)
+    if not baseline:
+        failures.append(f"{p_name}: NO baseline -- run with --record")
+        return failures
+    for stat in (RUNTIME, PEAK_MEM):
+        limit = baseline[stat] * (1.0 + p_threshold)
+        if p_stats[stat] > limit:
+            failures.append(f"{p_name}: {stat} = {p_stats[stat]:.6g} is over the limit of {limit:.6g} (baseline = {baseline[stat]:.6g})")
+    return failures
+
+
+def run_harness(p_book:str, p_golden_folder:str, p_threshold:float, p_repeat:int, p_record:bool) -> int:
+    baselines_file = osp.join(p_golden_folder, BASELINES_FILE)
+    baselines = {}
+    if osp.isfile(baselines_file):
+        with open(baselines_file) as bfp:
+            baselines = json.load(bfp)
+
+    failures = []
+    for upd_class, span in HARNESS_CASES:
+        name = case_name(upd_class, span)
+        output, stats = measure_case(upd_class, span, p_book, p_repeat)
+        print(f"{name}: runtime = {stats[RUNTIME]:.4f}s, peak memory = {stats[PEAK_MEM] / 1024:.1f} KiB")
+        if p_record:
+            with open(osp.join(p_golden_folder, name + ".json"), 'w') as gfp:
+                json.dump(output, gfp, indent = 4)
+            baselines[name] = stats
+        else:
+            failures += check_case(name, output, stats, p_golden_folder, baselines, p_threshold)
+
+    if p_record:
+        with open(baselines_file, 'w') as bfp:
+            json.dump(baselines, bfp, indent = 4)
+        print(f"recorded golden files and baselines in '{p_golden_folder}'")
+        return 0
+
+    for msg in failures:
+        print(f"FAILED >> {msg}")
+    print(f"{len(HARNESS_CASES)} case(s): {'FAILED' if failures else 'PASSED'}")
+    return 1 if failures else 0
+
+
+def set_harness_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Check the updaters against golden output and performance baselines",
+                                prog = f"python3 {get_filename(argv[0])}")
+    arg_parser.add_argument('-g', '--gnucash_file', default = DEFAULT_FIXTURE_BOOK, help = "path to the fixture Gnucash book")
+    arg_parser.add_argument('--golden', default = DEFAULT_GOLDEN_FOLDER, help = "folder with the golden files and baselines")
+    arg_parser.add_argument('--threshold', type = float, default = DEFAULT_THRESHOLD,
+                            help = "allowed fraction over the baseline runtime or peak memory")
+    arg_parser.add_argument('--repeat', type = int, default = DEFAULT_REPEAT, help = "number of timed runs per case")
+    arg_parser.add_argument('--record', action = "store_true", help = "write NEW golden files and baselines from this run")
+    return arg_parser
+
+
+if __name__ == "__main__":
+    harness_args = set_harness_args().parse_args(argv[1:])
+    if not osp.isfile(harness_args.gnucash_file):
+        print(f"NO fixture book '{harness_args.gnucash_file}' -- write it with fixtures/makeFixtureBook.py or pass a book with -g")
+        exit(2)
+    if harness_args.record:
+        os.makedirs(harness_args.golden, exist_ok = True)
+    elif not osp.isfile(osp.join(harness_args.golden, BASELINES_FILE)):
+        print(f"NO golden files or baselines in '{harness_args.golden}' -- record them with --record")
+        exit(2)
+    exit(run_harness(harness_args.gnucash_file, harness_args.golden, harness_args.threshold,
+                     max(1, harness_args.repeat), harness_args.record))
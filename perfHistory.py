@@ -0,0 +1,227 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# perfHistory.py -- local SQLite history of the phase timings, counts and book size of EACH updater run,
+#                   and a report of the trends that flags the runs slower than the rolling baseline
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import time
+import sqlite3
+import statistics
+import os.path as osp
+import logging as lg
+from sys import argv
+from argparse import ArgumentParser
+from contextlib import contextmanager
+
+HISTORY_FILE:str = osp.join(osp.dirname(osp.abspath(__file__)), "store", "history.db")
+RUN_OK:str     = "ok"
+RUN_FAILED:str = "failed"
+# phases of a run, in the order they happen
+OPEN_PHASE:str    = "open_book"
+EXTRACT_PHASE:str = "extract"
+GOOGLE_PHASE:str  = "google_data"
+STORE_PHASE:str   = "store"
+JOURNAL_PHASE:str = "journal"
+SEND_PHASE:str    = "send"
+PHASES = [OPEN_PHASE, EXTRACT_PHASE, GOOGLE_PHASE, STORE_PHASE, JOURNAL_PHASE, SEND_PHASE]
+# number of earlier runs in the rolling baseline, and how much slower than the baseline is flagged
+BASELINE_RUNS:int = 10
+SLOWER_LIMIT:float = 0.25
+# so the jitter of the short runs is NOT flagged
+SLOWER_SECONDS:float = 1.0
+
+SQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id        INTEGER PRIMARY KEY AUTOINCREMENT,
+        filetime  TEXT NOT NULL,
+        updater   TEXT NOT NULL,
+        timespan  TEXT NOT NULL,
+        target    TEXT NOT NULL,
+        book      TEXT NOT NULL,
+        book_size INTEGER,
+        splits    INTEGER,
+        quarters  INTEGER,
+        ranges    INTEGER,
+        cells     INTEGER,
+        total     REAL NOT NULL,
+        status    TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS runs_updater ON runs(updater, timespan, target, id);
+    CREATE TABLE IF NOT EXISTS phases (
+        run_id  INTEGER NOT NULL REFERENCES runs(id),
+        phase   TEXT NOT NULL,
+        seconds REAL NOT NULL,
+        PRIMARY KEY (run_id, phase)
+    ) WITHOUT ROWID;
+"""
+SQL_INSERT_RUN = """
+    INSERT INTO runs (filetime, updater, timespan, target, book, book_size, splits, quarters, ranges, cells, total, status)
+    VALUES (:filetime, :updater, :timespan, :target, :book, :book_size, :splits, :quarters, :ranges, :cells, :total, :status)
+"""
+SQL_INSERT_PHASE = "INSERT OR REPLACE INTO phases VALUES (?, ?, ?)"
+RUN_COLUMNS = ["id", "filetime", "updater", "timespan", "target", "book", "book_size", "splits",
+               "quarters", "ranges", "cells", "total", "status"]
+
+
+class RunTimer:
+    """the seconds spent in each phase of a run -- a phase entered more than once adds up"""
+    def __init__(self):
+        self.phases = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, p_name:str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[p_name] = self.phases.get(p_name, 0.0) + time.perf_counter() - start
+
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+# END class RunTimer
+
+
+class PerfHistory:
+    """
+    SQLite history of the runs of ALL the updaters, one row per run plus its phase timings
+    -- the book size and the split count show how the growth of the book affects the timings
+    """
+    def __init__(self, p_file:str = HISTORY_FILE):
+        self.file = p_file
+
+    def connect(self) -> sqlite3.Connection:
+        """A new connection each time, as updaters running in separate processes add their runs."""
+        folder = osp.dirname(self.file)
+        if folder and not osp.isdir(folder):
+            os.makedirs(folder)
+        conn = sqlite3.connect(self.file, timeout = 30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SQL_SCHEMA)
+        return conn
+
+    def add_run(self, p_run:dict, p_phases:dict) -> int:
+        """
+        :param   p_run: value of each column of the runs table, except the id
+        :param p_phases: seconds spent in each phase
+        :return: id of the run
+        """
+        conn = self.connect()
+        try:
+            with conn:
+                run_id = conn.execute(SQL_INSERT_RUN, p_run).lastrowid
+                conn.executemany(SQL_INSERT_PHASE, [(run_id, phase, seconds) for phase, seconds in p_phases.items()])
+        finally:
+            conn.close()
+        return run_id
+
+    def runs(self, p_filters:dict) -> list:
+        """
+        :param p_filters: any of updater, timespan, target and book
+        :return: the matching runs, oldest first, each with the seconds of its phases
+        """
+        where = " AND ".join(f"{column} = ?" for column in p_filters)
+        sql = f"SELECT {', '.join(RUN_COLUMNS)} FROM runs" + (f" WHERE {where}" if where else "") + " ORDER BY id"
+        conn = self.connect()
+        try:
+            runs = [dict(zip(RUN_COLUMNS, row)) for row in conn.execute(sql, list(p_filters.values()))]
+            phases = {}
+            for run_id, phase, seconds in conn.execute("SELECT run_id, phase, seconds FROM phases"):
+                phases.setdefault(run_id, {})[phase] = seconds
+        finally:
+            conn.close()
+        for run in runs:
+            run["phases"] = phases.get(run["id"], {})
+        return runs
+# END class PerfHistory
+
+
+def flag_runs(p_runs:list, p_window:int = BASELINE_RUNS, p_limit:float = SLOWER_LIMIT) -> dict:
+    """
+    Compare each run with the median of the earlier successful runs of the same updater, timespan and target on the same book
+    -- ONLY the last p_window of those runs are in the baseline, so it follows the gradual growth of the book
+    :return: (updater, timespan, target, book) -> its runs, each with its baseline, ratio and slower flag
+    """
+    groups = {}
+    for run in p_runs:
+        groups.setdefault((run["updater"], run["timespan"], run["target"], run["book"]), []).append(run)
+    for runs in groups.values():
+        earlier = []
+        for run in runs:
+            baseline = statistics.median(earlier[-p_window:]) if earlier else None
+            run["baseline"] = baseline
+            run["ratio"] = run["total"] / baseline if baseline else None
+            run["slower"] = run["ratio"] is not None and run["ratio"] > 1.0 + p_limit \
+                            and run["total"] - baseline > SLOWER_SECONDS
+            if run["status"] == RUN_OK:
+                earlier.append(run["total"])
+    return groups
+
+
+def format_count(p_value) -> str:
+    return "-" if p_value is None else f"{p_value:,}"
+
+
+def print_report(p_groups:dict, p_last:int, p_slower_only:bool):
+    for (updater, timespan, target, book), runs in sorted(p_groups.items()):
+        first, last = runs[0], runs[-1]
+        print(f"\n{updater}  timespan = {timespan}  target = {target}  book = {book}: {len(runs)} runs, "
+              f"{sum(run['slower'] for run in runs)} slower than the baseline")
+        if first["book_size"] and last["book_size"] and len(runs) > 1:
+            print(f"    book size {format_count(first['book_size'])} -> {format_count(last['book_size'])} bytes;"
+                  f" splits {format_count(first['splits'])} -> {format_count(last['splits'])};"
+                  f" total {first['total']:.2f} -> {last['total']:.2f} seconds")
+        print(f"    {'filetime':<22}{'status':<8}{'total':>8}{'baseline':>10}{'ratio':>7}  "
+              + "".join(f"{phase:>12}" for phase in PHASES) + f"{'splits':>10}{'cells':>8}{'book size':>14}")
+        shown = [run for run in runs if run["slower"]] if p_slower_only else runs
+        for run in shown[-p_last:]:
+            baseline = f"{run['baseline']:.2f}" if run["baseline"] else "-"
+            ratio = f"{run['ratio']:.2f}" if run["ratio"] else "-"
+            phases = "".join(f"{run['phases'][phase]:>12.2f}" if phase in run["phases"] else f"{'-':>12}" for phase in PHASES)
+            print(f"  {'!' if run['slower'] else ' '} {run['filetime']:<22}{run['status']:<8}{run['total']:>8.2f}{baseline:>10}{ratio:>7}  "
+                  f"{phases}{format_count(run['splits']):>10}{format_count(run['cells']):>8}{format_count(run['book_size']):>14}")
+
+
+def set_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Report the timings of the updater runs and flag the runs slower than the rolling baseline",
+                                prog = f"python3 {osp.basename(argv[0])}")
+    arg_parser.add_argument('-f', '--file', default = HISTORY_FILE, help = "path to the history database")
+    arg_parser.add_argument('-u', '--updater', help = "ONLY the runs of this updater class, e.g. UpdateRevExps")
+    arg_parser.add_argument('-t', '--timespan', help = "ONLY the runs of this timespan")
+    arg_parser.add_argument('-m', '--mode', help = "ONLY the runs with this target")
+    arg_parser.add_argument('-g', '--gnucash_file', help = "ONLY the runs on this Gnucash file")
+    arg_parser.add_argument('-n', '--last', type = int, default = 20, help = "number of the latest runs to show for each updater and timespan")
+    arg_parser.add_argument('-w', '--window', type = int, default = BASELINE_RUNS, help = "number of earlier runs in the rolling baseline")
+    arg_parser.add_argument('--limit', type = float, default = SLOWER_LIMIT,
+                            help = f"flag a run slower than the baseline by more than this fraction -- and by more than {SLOWER_SECONDS} seconds")
+    arg_parser.add_argument('--slower', action = "store_true", help = "show ONLY the runs slower than the baseline")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def history_main(args:list) -> int:
+    """:return: number of the latest runs that are slower than the baseline, so a scheduled check can fail"""
+    params = set_args().parse_args(args)
+    lg.basicConfig(level = params.level, format = "%(asctime)s %(levelname)s %(funcName)s: %(message)s")
+    if not osp.isfile(params.file):
+        lg.getLogger(osp.basename(__file__)).warning(f"NO history in '{params.file}'")
+        return 0
+
+    filters = {column: value for column, value in (("updater", params.updater), ("timespan", params.timespan),
+                                                   ("target", params.mode), ("book", params.gnucash_file and osp.abspath(params.gnucash_file))) if value}
+    groups = flag_runs(PerfHistory(params.file).runs(filters), params.window, params.limit)
+    print_report(groups, params.last, params.slower)
+    return sum(runs[-1]["slower"] for runs in groups.values())
+
+
+if __name__ == "__main__":
+    exit(1 if history_main(argv[1:]) else 0)
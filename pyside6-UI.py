@@ -10,20 +10,21 @@ __author_name__    = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
 __python_version__ = "3.10+"
 __created__ = "2024-07-01"
-__updated__ = "2025-08-01"
+__updated__ = "2026-10-19"
 
 from sys import path
 from PySide6.QtWidgets import (QApplication, QComboBox, QVBoxLayout, QGroupBox, QDialog, QFileDialog, QLabel, QCheckBox,
-                               QPushButton, QFormLayout, QDialogButtonBox, QTextEdit, QInputDialog, QMessageBox)
+                               QPushButton, QFormLayout, QDialogButtonBox, QInputDialog, QMessageBox, QLineEdit)
 from functools import partial
 path.append("/home/marksa/git/Python/utils")
 from updateBudget import *
 from updateRevExps import update_rev_exps_main
 from updateAssets import update_assets_main
 from updateBalance import update_balance_main
+from responseModels import ResponsePanel
 
 TIMEFRAME:str = "Time Frame"
-UPDATE_DOMAINS = [CURRENT_YRS, RECENT_YRS, MID_YRS, EARLY_YRS, ALL_YEARS] + [year for year in UPDATE_YEARS]
+UPDATE_DOMAINS = [CURRENT_YRS, LAST_QTR, LAST_2_QTRS, RECENT_YRS, MID_YRS, EARLY_YRS, ALL_YEARS] + [year for year in UPDATE_YEARS]
 UPDATE_FXNS = [update_rev_exps_main, update_assets_main, update_balance_main]
 FXNS_TABLE = {
     BAL+' & '+ASSET+'s' : UPDATE_FXNS[1:] ,
@@ -56,10 +57,8 @@ class UpdateBudgetUI(QDialog):
         self.selected_loglevel = UI_DEFAULT_LOG_LEVEL
         self.create_group_box()
 
-        self.response_box = QTextEdit()
-        self.response_box.setReadOnly(True)
-        self.response_box.acceptRichText()
-        self.response_box.setText("Hello there!")
+        self.response_box = ResponsePanel()
+        self.response_box.append("Hello there!")
 
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
         button_box.accepted.connect(self.accept)
@@ -84,7 +83,7 @@ class UpdateBudgetUI(QDialog):
         layout.addRow(QLabel("Gnucash File:"), self.gnc_file_btn)
 
         self.cb_target = QComboBox()
-        self.cb_target.addItems([TEST, SHEET_1, SHEET_2])
+        self.cb_target.addItems([TEST, SHEET_1, SHEET_2, SHEET_BOTH])
         self.cb_target.currentIndexChanged.connect(partial(self.selection_change, self.cb_target, TARGET))
         layout.addRow(QLabel(TARGET+':'), self.cb_target)
 
@@ -93,15 +92,21 @@ class UpdateBudgetUI(QDialog):
         self.cb_domain.currentIndexChanged.connect(partial(self.selection_change, self.cb_domain, TIMEFRAME))
         layout.addRow(QLabel(TIMEFRAME+':'), self.cb_domain)
 
+        self.le_only = QLineEdit()
+        self.le_only.setPlaceholderText("ALL -- or accounts or sheet columns, e.g. RRSP TFSA")
+        layout.addRow(QLabel("Only:"), self.le_only)
+
         vert_box = QGroupBox("Check:")
         vert_layout = QVBoxLayout()
         self.ch_gnc = QCheckBox("Save Gnucash info to JSON file?")
         self.ch_ggl = QCheckBox("Save Google info to JSON file?")
         self.ch_rsp = QCheckBox("Save Google RESPONSE to JSON file?")
+        self.ch_prf = QCheckBox("PROFILE the update?")
 
         vert_layout.addWidget(self.ch_gnc)
         vert_layout.addWidget(self.ch_ggl)
         vert_layout.addWidget(self.ch_rsp)
+        vert_layout.addWidget(self.ch_prf)
         vert_box.setLayout(vert_layout)
         layout.addRow(QLabel("Options"), vert_box)
 
@@ -151,6 +156,9 @@ class UpdateBudgetUI(QDialog):
         if self.ch_ggl.isChecked(): cl_params.append("--ggl_save")
         if self.ch_gnc.isChecked(): cl_params.append("--gnc_save")
         if self.ch_rsp.isChecked(): cl_params.append("--resp_save")
+        if self.ch_prf.isChecked(): cl_params.append("--profile")
+        only = self.le_only.text().replace(',', ' ').split()
+        if only: cl_params += ["--only"] + only
         self._lgr.info(f"parameters = {repr(cl_params)}")
 
         exe = self.cb_script.currentText()
@@ -159,13 +167,15 @@ class UpdateBudgetUI(QDialog):
         if callable(main_run):
             self._lgr.info(f"Calling {exe}...")
             response = main_run(cl_params)
-            self.response_box.append(json.dumps({f"{main_run}\n":response}, indent = 4))
+            self.response_box.add_response(main_run.__name__, response)
         elif isinstance(main_run, list):
             try:
-                for bc_exec in main_run:
-                    self._lgr.info(f"Calling '{repr(bc_exec)}' ...")
-                    response = bc_exec(cl_params)
-                    self.response_box.append(json.dumps({f"{bc_exec}\n":response}, indent = 4))
+                # send all the Record rows together at the end
+                with record_batch.deferred(self._lgr):
+                    for bc_exec in main_run:
+                        self._lgr.info(f"Calling '{repr(bc_exec)}' ...")
+                        response = bc_exec(cl_params)
+                        self.response_box.add_response(bc_exec.__name__, response)
             except Exception as bcex:
                 self.response_box.append(f"EXCEPTION:\n{repr(bcex)}")
                 raise bcex
@@ -0,0 +1,71 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# qtrlyTable.py -- columnar store of the quarterly results shared by the updaters
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+from array import array
+from decimal import Decimal
+
+
+class QuarterlyTable:
+    """
+    one column per metric, one row per (year, quarter)
+    -- the years and quarters are typed int arrays and the metric columns hold Decimal or None,
+       so nothing is formatted or parsed until the data goes to JSON or to the Google sheet
+    """
+    def __init__(self):
+        self.years = array('H')
+        self.quarters = array('B')
+        self._index = {}
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def __iter__(self):
+        """:return: year, quarter and row number of each row, in the order added"""
+        return zip(self.years, self.quarters, range(len(self.years)))
+
+    def add_row(self, p_year:int, p_qtr:int) -> int:
+        """:return: the row number for the year and quarter, adding a row if necessary"""
+        key = (p_year, p_qtr)
+        if key not in self._index:
+            self._index[key] = len(self.years)
+            self.years.append(p_year)
+            self.quarters.append(p_qtr)
+            for column in self._columns.values():
+                column.append(None)
+        return self._index[key]
+
+    def metrics(self) -> list:
+        return list(self._columns.keys())
+
+    def column(self, p_metric:str) -> list:
+        return self._columns[p_metric]
+
+    def set(self, p_row:int, p_metric:str, p_value:Decimal):
+        if p_metric not in self._columns:
+            self._columns[p_metric] = [None] * len(self.years)
+        self._columns[p_metric][p_row] = p_value
+
+    def get(self, p_row:int, p_metric:str) -> Decimal | None:
+        column = self._columns.get(p_metric)
+        return column[p_row] if column else None
+
+    def row_values(self, p_row:int, p_metrics:list = None) -> dict:
+        """:return: the values of the row that are set, for the metrics given or ALL of them"""
+        values = {}
+        for metric in (p_metrics if p_metrics is not None else self._columns):
+            value = self.get(p_row, metric)
+            if value is not None:
+                values[metric] = value
+        return values
+# END class QuarterlyTable
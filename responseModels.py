@@ -0,0 +1,200 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# responseModels.py -- model/view panel of the log lines and the update responses for BOTH UIs:
+#                      a ring buffer of the log lines and a tree of the responses that is expanded ONLY when viewed
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import sys
+from collections import deque
+from datetime import datetime as dt
+
+# the Qt library of the UI that imported this module
+if "PySide6" in sys.modules:
+    from PySide6.QtCore import Qt, QAbstractItemModel, QAbstractListModel, QModelIndex, QTimer
+    from PySide6.QtWidgets import QWidget, QTreeView, QListView, QSplitter, QVBoxLayout
+else:
+    from PyQt5.QtCore import Qt, QAbstractItemModel, QAbstractListModel, QModelIndex, QTimer
+    from PyQt5.QtWidgets import QWidget, QTreeView, QListView, QSplitter, QVBoxLayout
+
+MAX_LOG_LINES:int = 5000
+MAX_RESPONSES:int = 200
+# longest value shown in the tree
+MAX_VALUE_TEXT:int = 200
+
+
+class JsonNode:
+    """a key and value of a response -- the nodes of a dict or list value are ONLY made when first needed"""
+    __slots__ = ("key", "value", "parent", "row", "_children")
+
+    def __init__(self, p_key:str, p_value, p_parent, p_row:int):
+        self.key = p_key
+        self.value = p_value
+        self.parent = p_parent
+        self.row = p_row
+        self._children = None
+
+    def has_children(self) -> bool:
+        return isinstance(self.value, (dict, list, tuple)) and len(self.value) > 0
+
+    def children(self) -> list:
+        if self._children is None:
+            if isinstance(self.value, dict):
+                items = self.value.items()
+            elif isinstance(self.value, (list, tuple)):
+                items = ((f"[{indx}]", item) for indx, item in enumerate(self.value))
+            else:
+                items = ()
+            self._children = [JsonNode(str(key), value, self, row) for row, (key, value) in enumerate(items)]
+        return self._children
+
+    def text(self) -> str:
+        if isinstance(self.value, dict):
+            return f"{{{len(self.value)}}}"
+        if isinstance(self.value, (list, tuple)):
+            return f"[{len(self.value)}]"
+        text = str(self.value)
+        return text if len(text) <= MAX_VALUE_TEXT else text[:MAX_VALUE_TEXT] + "..."
+# END class JsonNode
+
+
+class ResponseTreeModel(QAbstractItemModel):
+    """
+    each response is a top-level row, and ONLY the latest MAX_RESPONSES are kept
+    -- a top-level row number is its serial number less the serial number of the oldest response kept,
+       so adding and dropping responses is constant-time
+    """
+    def __init__(self, p_max:int = MAX_RESPONSES, parent = None):
+        super().__init__(parent)
+        self._responses = deque()
+        self._max = p_max
+        self._first = 0
+
+    def add_response(self, p_label:str, p_response) -> QModelIndex:
+        """:return: index of the new row"""
+        if len(self._responses) == self._max:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self._responses.popleft()
+            self._first += 1
+            self.endRemoveRows()
+        row = len(self._responses)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._responses.append(JsonNode(p_label, p_response, None, self._first + row))
+        self.endInsertRows()
+        return self.index(row, 0)
+
+    def node_row(self, p_node:JsonNode) -> int:
+        return p_node.row - self._first if p_node.parent is None else p_node.row
+
+    def index(self, row:int, column:int, parent:QModelIndex = QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node = parent.internalPointer().children()[row] if parent.isValid() else self._responses[row]
+        return self.createIndex(row, column, node)
+
+    def parent(self, index:QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent
+        return QModelIndex() if node is None else self.createIndex(self.node_row(node), 0, node)
+
+    def rowCount(self, parent:QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(parent.internalPointer().children()) if parent.isValid() else len(self._responses)
+
+    def hasChildren(self, parent:QModelIndex = QModelIndex()) -> bool:
+        """WITHOUT making the child nodes, so a row is ONLY expanded when the user opens it."""
+        return parent.internalPointer().has_children() if parent.isValid() else len(self._responses) > 0
+
+    def columnCount(self, parent:QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def data(self, index:QModelIndex, role:int = Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        node = index.internalPointer()
+        if index.column() == 0:
+            return node.key
+        return str(node.value) if role == Qt.ToolTipRole and not node.has_children() else node.text()
+
+    def headerData(self, section:int, orientation, role:int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ["Key", "Value"][section]
+        return None
+# END class ResponseTreeModel
+
+
+class LogListModel(QAbstractListModel):
+    """ring buffer of the latest MAX_LOG_LINES lines: adding a line is constant-time however long the UI runs"""
+    def __init__(self, p_max:int = MAX_LOG_LINES, parent = None):
+        super().__init__(parent)
+        self._lines = deque()
+        self._max = p_max
+
+    def add_line(self, p_line:str):
+        if len(self._lines) == self._max:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self._lines.popleft()
+            self.endRemoveRows()
+        row = len(self._lines)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._lines.append(p_line)
+        self.endInsertRows()
+
+    def rowCount(self, parent:QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index:QModelIndex, role:int = Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._lines[index.row()]
+        return None
+# END class LogListModel
+
+
+class ResponsePanel(QWidget):
+    """the log lines above the tree of the responses -- the views ONLY lay out the rows in sight"""
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        self.log_model = LogListModel(parent = self)
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        # scroll ONCE for ALL the lines added before the UI gets back to its event loop
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(0)
+        self._scroll_timer.timeout.connect(self.log_view.scrollToBottom)
+
+        self.response_model = ResponseTreeModel(parent = self)
+        self.response_view = QTreeView()
+        self.response_view.setModel(self.response_model)
+        self.response_view.setUniformRowHeights(True)
+        self.response_view.setColumnWidth(0, 240)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.log_view)
+        splitter.addWidget(self.response_view)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    def append(self, p_line:str):
+        """Add a line to the log, as QTextEdit.append()."""
+        for line in str(p_line).splitlines() or [""]:
+            self.log_model.add_line(line)
+        self._scroll_timer.start()
+
+    def add_response(self, p_label:str, p_response):
+        index = self.response_model.add_response(f"{dt.now().strftime('%H:%M:%S')}  {p_label}", p_response)
+        self.response_view.expand(index)
+        self.response_view.scrollTo(index)
+# END class ResponsePanel
@@ -0,0 +1,98 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# runCheckpoint.py -- per-year checkpoints of the Gnucash data of an update, so an interrupted run can be resumed
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import os
+import re
+import json
+import shutil
+import os.path as osp
+from decimal import Decimal
+from qtrlyTable import QuarterlyTable
+
+CHECKPOINT_FOLDER:str = osp.join(osp.dirname(osp.abspath(__file__)), "checkpoints")
+LATEST_RUN:str = "latest"
+RUN_FILE:str = "run.json"
+# the filetime of a run, as written with FILE_DATETIME_FORMAT
+FILETIME_PATTERN:str = r"D\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}"
+
+
+class RunCheckpoint:
+    """
+    a folder for each run, named for the updater, timespan, target and the filetime of the run,
+    with a file of the Gnucash data of each completed year and a file of the state of the send
+    -- removed when the run completes, so ONLY incomplete runs can be resumed
+    """
+    def __init__(self, p_prefix:str, p_filetime:str, p_folder:str = CHECKPOINT_FOLDER):
+        self.filetime = p_filetime
+        self.folder = osp.join(p_folder, f"{p_prefix}_{p_filetime}")
+
+    @classmethod
+    def find(cls, p_prefix:str, p_filetime:str, p_folder:str = CHECKPOINT_FOLDER):
+        """
+        :param p_filetime: filetime of the run to resume, or LATEST_RUN for the most recent incomplete run with the prefix
+        :return: checkpoint of the run to resume, or None if there is none
+        """
+        if p_filetime != LATEST_RUN:
+            found = cls(p_prefix, p_filetime, p_folder)
+            return found if osp.isdir(found.folder) else None
+        if not osp.isdir(p_folder):
+            return None
+        # ONLY the runs of this prefix: a book whose name starts with the same name has other folders in the same place
+        run_pattern = re.compile(f"{re.escape(p_prefix)}_({FILETIME_PATTERN})")
+        runs = sorted((entry for entry in os.scandir(p_folder) if entry.is_dir() and run_pattern.fullmatch(entry.name)),
+                      key = lambda entry: entry.stat().st_mtime)
+        if not runs:
+            return None
+        return cls(p_prefix, run_pattern.fullmatch(runs[-1].name).group(1), p_folder)
+
+    def write_json(self, p_name:str, p_data):
+        """Write to a temporary file first so a checkpoint is never partly written."""
+        os.makedirs(self.folder, exist_ok = True)
+        temp_file = osp.join(self.folder, p_name + ".tmp")
+        with open(temp_file, "w") as cfp:
+            json.dump(p_data, cfp, indent = 4)
+        os.replace(temp_file, osp.join(self.folder, p_name))
+
+    def read_json(self, p_name:str):
+        path = osp.join(self.folder, p_name)
+        if not osp.isfile(path):
+            return None
+        with open(path) as cfp:
+            return json.load(cfp)
+
+    def save_year(self, p_year:int, p_table:QuarterlyTable):
+        """Save the rows of the year, with the values as strings so they are read back as the same Decimals."""
+        rows = [{"quarter": qtr, "values": {metric: str(value) for metric, value in p_table.row_values(row).items()}}
+                for year, qtr, row in p_table if year == p_year]
+        self.write_json(f"gnc-{p_year}.json", rows)
+
+    def load_year(self, p_year:int, p_table:QuarterlyTable) -> bool:
+        """:return: True if the year was completed and its rows are now in the table"""
+        rows = self.read_json(f"gnc-{p_year}.json")
+        if rows is None:
+            return False
+        for item in rows:
+            row = p_table.add_row(p_year, item["quarter"])
+            for metric, value in item["values"].items():
+                p_table.set(row, metric, Decimal(value))
+        return True
+
+    def get(self, p_key:str):
+        return (self.read_json(RUN_FILE) or {}).get(p_key)
+
+    def set(self, p_key:str, p_value):
+        self.write_json(RUN_FILE, (self.read_json(RUN_FILE) or {}) | {p_key: p_value})
+
+    def finish(self):
+        shutil.rmtree(self.folder, ignore_errors = True)
+# END class RunCheckpoint
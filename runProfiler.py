@@ -0,0 +1,118 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# runProfiler.py -- profile an updater run with cProfile plus a sampler of ALL threads for flame graphs
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import io
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import os.path as osp
+import logging as lg
+from collections import Counter
+
+PROFILE_TOP_N:int = 20
+SAMPLE_INTERVAL:float = 0.005
+PROF_EXT:str = ".prof"
+COLLAPSED_EXT:str = ".collapsed"
+
+
+class StackSampler(threading.Thread):
+    """
+    sample the stacks of ALL the other threads at a fixed interval -- so the Google send thread is seen too --
+    and count them in the 'collapsed' format used by flamegraph.pl, speedscope, etc.
+    """
+    def __init__(self, p_interval:float = SAMPLE_INTERVAL):
+        super().__init__(name = "StackSampler", daemon = True)
+        self.interval = p_interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        my_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == my_id:
+                    continue
+                calls = []
+                while frame:
+                    code = frame.f_code
+                    calls.append(f"{osp.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                calls.append(names.get(thread_id, str(thread_id)))
+                self.stacks[';'.join(reversed(calls))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write_collapsed(self, p_file:str):
+        with open(p_file, 'w') as cfp:
+            for stack, count in self.stacks.most_common():
+                cfp.write(f"{stack} {count}\n")
+# END class StackSampler
+
+
+class RunProfiler:
+    """wrap a run in cProfile and the stack sampler, then save the results and return a hotspot summary"""
+    def __init__(self, lgr:lg.Logger):
+        self._lgr = lgr
+        self._profile = cProfile.Profile()
+        self._sampler = StackSampler()
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profile.disable()
+        self._sampler.stop()
+        self.elapsed = time.perf_counter() - self._start
+        return False
+
+    def hotspots(self, p_top:int = PROFILE_TOP_N) -> list:
+        """The top functions by internal time, as one line of text each."""
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream = stream)
+        stats.sort_stats(pstats.SortKey.TIME)
+        lines = []
+        for func in stats.fcn_list[:p_top]:
+            prim_calls, num_calls, tot_time, cum_time, _ = stats.stats[func]
+            filename, line, name = func
+            lines.append(f"{tot_time:9.4f}s {cum_time:9.4f}s {num_calls:>9} {osp.basename(filename)}:{line}({name})")
+        return lines
+
+    def save(self, p_json_file:str) -> dict:
+        """
+        Save the cProfile stats and the collapsed stacks beside a saved JSON file, using the same name
+        :param p_json_file: path returned by save_to_json() for this run
+        :return: summary to add to the response
+        """
+        base_name = osp.splitext(p_json_file)[0]
+        prof_file = base_name + PROF_EXT
+        self._profile.dump_stats(prof_file)
+        collapsed_file = base_name + COLLAPSED_EXT
+        self._sampler.write_collapsed(collapsed_file)
+        self._lgr.info(f"profile files = {prof_file}, {collapsed_file}")
+
+        return {
+            "elapsed" : f"{self.elapsed:.3f}s" ,
+            "samples" : sum(self._sampler.stacks.values()) ,
+            "files"   : [p_json_file, prof_file, collapsed_file] ,
+            "hotspots": ["   tottime    cumtime     calls function"] + self.hotspots()
+        }
+# END class RunProfiler
@@ -0,0 +1,210 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# sheetJournal.py -- durable write-behind journal of the Google Sheets cell updates,
+#                    with the superseded writes to a cell coalesced when sending and a replay of the pending updates
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import json
+import sqlite3
+import threading
+import os
+import os.path as osp
+import logging as lg
+from sys import argv
+from argparse import ArgumentParser
+from datetime import datetime as dt, timedelta
+from sheetsClient import update_sheets_values
+from sheetsQuota import sheets_quota, WRITE
+
+JOURNAL_FILE:str = osp.join(osp.dirname(osp.abspath(__file__)), "journal", "sheets-journal.db")
+# sent entries are kept this long for reference
+KEEP_DAYS:int = 30
+# maximum number of ranges sent in one request
+CHUNK_SIZE:int = 1000
+
+SQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS batches (
+        id      INTEGER PRIMARY KEY AUTOINCREMENT,
+        created TEXT NOT NULL,
+        source  TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+        batch_id INTEGER NOT NULL REFERENCES batches(id),
+        range    TEXT NOT NULL,
+        cells    TEXT NOT NULL,
+        sent     TEXT
+    );
+    CREATE INDEX IF NOT EXISTS entries_pending ON entries(sent, range);
+"""
+# the LATEST pending write to each range -- SQLite takes the bare columns from the row with the MAX
+SQL_PENDING = """
+    SELECT range, cells, MAX(seq) FROM entries WHERE sent IS NULL{batches} GROUP BY range ORDER BY MAX(seq)
+"""
+# the write that was sent AND the earlier writes to the same range it supersedes
+SQL_MARK_SENT = "UPDATE entries SET sent = ? WHERE sent IS NULL AND range = ? AND seq <= ?"
+SQL_PRUNE = "DELETE FROM entries WHERE sent IS NOT NULL AND sent < ?"
+SQL_PRUNE_BATCHES = "DELETE FROM batches WHERE id NOT IN (SELECT DISTINCT batch_id FROM entries)"
+SQL_STATUS = """
+    SELECT b.id, b.created, b.source, COUNT(e.seq) FROM batches b JOIN entries e ON e.batch_id = b.id
+    WHERE e.sent IS NULL GROUP BY b.id ORDER BY b.id
+"""
+
+
+def combine_responses(p_responses:list) -> dict:
+    """The totals of the batchUpdate responses of the chunks, with the responses."""
+    combined = {"chunks": len(p_responses), "responses": p_responses}
+    for response in p_responses:
+        for key, value in response.items():
+            if key.startswith("total") and isinstance(value, int):
+                combined[key] = combined.get(key, 0) + value
+    return combined
+
+
+class SheetJournal:
+    """
+    append-only SQLite journal of the Google data: each batch from fill_cell is committed BEFORE anything is sent,
+    so a failed send loses nothing and the pending entries can be sent later with --replay
+    """
+    # only ONE drain at a time in a process, so a later write to a cell cannot be overtaken by an earlier one
+    _drain_lock = threading.Lock()
+
+    def __init__(self, p_file:str = JOURNAL_FILE):
+        self._file = p_file
+
+    def connect(self) -> sqlite3.Connection:
+        """A new connection each time, as the updaters may journal and drain from different threads."""
+        folder = osp.dirname(self._file)
+        if folder and not osp.isdir(folder):
+            os.makedirs(folder)
+        conn = sqlite3.connect(self._file, timeout = 30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SQL_SCHEMA)
+        return conn
+
+    def add_batch(self, p_data:list, p_source:str, lgr:lg.Logger) -> int:
+        """
+        Commit the Google data of an update to the journal
+        :param   p_data: list of {'range': A1 notation, 'values': [[cell value]]} as built by fill_cell
+        :param p_source: description of the update
+        :param      lgr: logger to use
+        :return: id of the batch
+        """
+        conn = self.connect()
+        try:
+            with conn:
+                batch_id = conn.execute("INSERT INTO batches (created, source) VALUES (?, ?)",
+                                        (dt.now().isoformat(timespec = "seconds"), p_source)).lastrowid
+                conn.executemany("INSERT INTO entries (batch_id, range, cells) VALUES (?, ?, ?)",
+                                 [(batch_id, item["range"], json.dumps(item["values"])) for item in p_data])
+        finally:
+            conn.close()
+        lgr.info(f"journaled {len(p_data)} cell updates as batch #{batch_id}")
+        return batch_id
+
+    def pending(self, p_batches:list = None) -> list:
+        """
+        :param p_batches: ids of the batches to read -- ALL the batches if None
+        :return: the LATEST pending write to each range, as Google data with the sequence number of the write
+        """
+        batches = f" AND batch_id IN ({', '.join('?' * len(p_batches))})" if p_batches is not None else ""
+        conn = self.connect()
+        try:
+            rows = conn.execute(SQL_PENDING.format(batches = batches), p_batches or []).fetchall()
+        finally:
+            conn.close()
+        return [({"range": rng, "values": json.loads(cells)}, seq) for rng, cells, seq in rows]
+
+    def mark_sent(self, p_entries:list):
+        """Mark the sent entries as sent, with the earlier entries to the same ranges that they supersede."""
+        conn = self.connect()
+        try:
+            with conn:
+                now = dt.now().isoformat(timespec = "seconds")
+                conn.executemany(SQL_MARK_SENT, [(now, item["range"], seq) for item, seq in p_entries])
+        finally:
+            conn.close()
+
+    def prune(self):
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(SQL_PRUNE, ((dt.now() - timedelta(days = KEEP_DAYS)).isoformat(timespec = "seconds"),))
+                conn.execute(SQL_PRUNE_BATCHES)
+        finally:
+            conn.close()
+
+    def drain(self, lgr:lg.Logger, p_batches:list = None) -> dict:
+        """
+        Send the pending entries in requests of at most CHUNK_SIZE ranges, marking each chunk as sent once it is sent
+        -- if a send fails the entries of that chunk and the later chunks stay pending and the exception is raised,
+           so the next drain resumes at the first unsent chunk
+        -- the quota is acquired FIRST so that everything journaled while waiting goes out in the same requests
+        :param p_batches: ids of the batches to send -- ALL the pending batches if None, as with --replay,
+                          so an update does NOT send the old values of earlier failed runs over newer sheet contents
+        :return: server response -- or the totals and the responses if in several chunks -- or an empty dict if nothing is pending
+        """
+        with self._drain_lock:
+            if not self.pending(p_batches):
+                lgr.info("NO pending Google updates in the journal")
+                return {}
+            sheets_quota.acquire(WRITE, lgr)
+            entries = self.pending(p_batches)
+            if not entries:
+                lgr.info("NO pending Google updates in the journal")
+                return {}
+            lgr.info(f"send {len(entries)} coalesced cell updates from the journal")
+            responses = []
+            for start in range(0, len(entries), CHUNK_SIZE):
+                if start:
+                    sheets_quota.acquire(WRITE, lgr)
+                chunk = entries[start:start + CHUNK_SIZE]
+                responses.append(update_sheets_values([item for item, _ in chunk], lgr))
+                self.mark_sent(chunk)
+            self.prune()
+            if p_batches is not None and self.status():
+                lgr.warning("earlier updates are still pending in the journal: check them with 'sheetJournal.py' before '--replay'")
+            return responses[0] if len(responses) == 1 else combine_responses(responses)
+
+    def status(self) -> list:
+        """:return: id, created, source and number of pending entries of each batch with entries still to send"""
+        conn = self.connect()
+        try:
+            return conn.execute(SQL_STATUS).fetchall()
+        finally:
+            conn.close()
+# END class SheetJournal
+
+
+def set_args() -> ArgumentParser:
+    arg_parser = ArgumentParser(description = "Show or send the pending Google Sheets updates in the journal",
+                                prog = f"python3 {osp.basename(argv[0])}")
+    arg_parser.add_argument('--replay', action = "store_true", help = "SEND the pending updates to the Google Sheet")
+    arg_parser.add_argument('-j', '--journal', default = JOURNAL_FILE, help = "path to the journal file")
+    arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
+    return arg_parser
+
+
+def journal_main(args:list):
+    params = set_args().parse_args(args)
+    lg.basicConfig(level = params.level, format = "%(asctime)s %(levelname)s %(funcName)s: %(message)s")
+    lgr = lg.getLogger(osp.basename(__file__))
+
+    journal = SheetJournal(params.journal)
+    for batch_id, created, source, num_pending in journal.status():
+        print(f"batch #{batch_id} at {created}: {source} >> {num_pending} pending")
+    if params.replay:
+        print(json.dumps(journal.drain(lgr), indent = 4))
+
+
+if __name__ == "__main__":
+    journal_main(argv[1:])
+    exit()
@@ -0,0 +1,203 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# sheetsClient.py -- direct access to the Google Sheets API for requests NOT covered by MhsSheetAccess
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import time
+import pickle
+import threading
+import os.path as osp
+import logging as lg
+from datetime import datetime as dt, timedelta, timezone
+from functools import cache
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from sheetsQuota import sheets_quota, READ, WRITE
+from sheetsVcr import RecordingHttp, ReplayHttp, RECORD, REPLAY, SPREADSHEET_PLACEHOLDER
+
+SHEETS_FOLDER:str  = "/home/marksa/git/Python/google/sheets"
+SECRETS_FOLDER:str = osp.join(SHEETS_FOLDER, "secrets")
+CREDENTIALS_FILE:str     = osp.join(SECRETS_FOLDER, "credentials.json")
+TOKEN_FILE:str           = osp.join(SECRETS_FOLDER, "token.sheets.epistemik.rw.pickle4")
+BUDGET_QTRLY_ID_FILE:str = osp.join(SECRETS_FOLDER, "Budget-qtrly.id")
+SHEETS_RW_SCOPE:list = ["https://www.googleapis.com/auth/spreadsheets"]
+
+USER_ENTERED:str = "USER_ENTERED"
+TOO_MANY_REQUESTS:int = 429
+MAX_QUOTA_RETRIES:int = 3
+# refresh the access token this long BEFORE it expires, so a send never starts with a token about to lapse
+REFRESH_MARGIN:timedelta = timedelta(minutes = 5)
+HTTP_TIMEOUT:int = 60
+
+# process-wide client: the credentials, authorized transport and Sheets service are created ONCE and shared by ALL the updaters
+_client = {}
+_client_lock = threading.RLock()
+# httplib2 is NOT thread-safe, so the requests on the shared transport go one at a time
+_http_lock = threading.Lock()
+# record or replay the requests: mode, file, latency, error rate
+_vcr = {}
+
+
+def use_vcr(p_mode:str | None, p_file:str = None, p_latency:float = 0.0, p_error_rate:float = 0.0):
+    """
+    Send the requests through a recording transport, or serve them from the recorded fixture file with NO network
+    -- the shared client is rebuilt on the next request
+    """
+    with _client_lock:
+        _vcr.clear()
+        if p_mode:
+            _vcr.update(mode = p_mode, file = p_file, latency = p_latency, error_rate = p_error_rate)
+        _client.clear()
+
+
+def vcr_usage() -> dict | None:
+    """Number of responses replayed and errors injected, if replaying."""
+    http = _client.get("http")
+    return {"served": http.served, "injected": http.injected} if isinstance(http, ReplayHttp) else None
+
+
+@cache
+def read_budget_id() -> str:
+    with open(BUDGET_QTRLY_ID_FILE, "r") as fp:
+        return fp.readline().strip()
+
+
+def get_budget_id() -> str:
+    """Get the spreadsheet id of my 'Budget Quarterly' document from the secrets folder -- NOT needed when replaying."""
+    if _vcr.get("mode") == REPLAY:
+        return SPREADSHEET_PLACEHOLDER
+    return read_budget_id()
+
+
+def save_credentials(creds):
+    with open(TOKEN_FILE, "wb") as token:
+        pickle.dump(creds, token, pickle.HIGHEST_PROTOCOL)
+
+
+def load_credentials():
+    """Load the saved credentials, letting the user log in if there are none that can be used or refreshed."""
+    creds = None
+    if osp.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, "rb") as token:
+            creds = pickle.load(token)
+
+    if creds is None or not (creds.valid or creds.refresh_token):
+        flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SHEETS_RW_SCOPE)
+        creds = flow.run_local_server()
+        save_credentials(creds)
+    return creds
+
+
+def needs_refresh(creds) -> bool:
+    """google-auth keeps the expiry as a naive UTC datetime."""
+    return not creds.valid or (creds.expiry is not None and creds.expiry - dt.now(timezone.utc).replace(tzinfo = None) < REFRESH_MARGIN)
+
+
+def get_credentials(lgr:lg.Logger):
+    """Get the credentials needed to write to the Google spreadsheet: loaded once, then refreshed IN PLACE before expiry."""
+    with _client_lock:
+        creds = _client.get("creds")
+        if creds is None:
+            creds = _client["creds"] = load_credentials()
+        if needs_refresh(creds) and creds.refresh_token:
+            lgr.debug("refresh the Google credentials")
+            with _http_lock:
+                creds.refresh(Request())
+            # save the credentials for the next run
+            save_credentials(creds)
+        return creds
+
+
+def get_sheets_values(lgr:lg.Logger):
+    """Get the 'spreadsheets.values' resource of the shared Sheets service, building it on first use."""
+    with _client_lock:
+        replaying = _vcr.get("mode") == REPLAY
+        if not replaying:
+            creds = get_credentials(lgr)
+        if "values" not in _client:
+            start = time.perf_counter()
+            if replaying:
+                http = ReplayHttp(_vcr["file"], lgr, _vcr["latency"], _vcr["error_rate"])
+            else:
+                http = AuthorizedHttp(creds, http = httplib2.Http(timeout = HTTP_TIMEOUT))
+                if _vcr.get("mode") == RECORD:
+                    http = RecordingHttp(http, _vcr["file"], read_budget_id(), lgr)
+            _client["http"] = http
+            # the discovery document packaged with the client library: NO request to the discovery service
+            service = build("sheets", "v4", http = http, static_discovery = True, cache_discovery = False)
+            _client["values"] = service.spreadsheets().values()
+            lgr.info(f"built the Sheets service in {time.perf_counter() - start:.3f} seconds")
+        return _client["values"]
+
+
+def execute_request(p_request, p_kind:str, lgr:lg.Logger) -> dict:
+    """
+    Execute a request for which a unit of the quota has ALREADY been acquired,
+    waiting for the next unit and trying again if the server still rejects it as over quota
+    """
+    for attempt in range(MAX_QUOTA_RETRIES):
+        try:
+            with _http_lock:
+                return p_request.execute()
+        except HttpError as he:
+            if he.resp.status != TOO_MANY_REQUESTS:
+                raise he
+            sheets_quota.exhaust(p_kind, lgr)
+            sheets_quota.acquire(p_kind, lgr)
+    with _http_lock:
+        return p_request.execute()
+
+
+def append_sheets_rows(p_range:str, p_rows:list, lgr:lg.Logger) -> dict:
+    """
+    Append rows after the last row of the table found in the range -- NO read needed to find the next free row
+    -- the caller acquires the write quota
+    :param p_range: A1 notation of the table to append to, e.g. "'Record'!A:D"
+    :param  p_rows: list of rows, each a list of cell values
+    :param     lgr: logger to use
+    :return: server response
+    """
+    body = {"values": p_rows}
+    request = get_sheets_values(lgr).append(spreadsheetId = get_budget_id(), range = p_range, valueInputOption = USER_ENTERED,
+                                            insertDataOption = "OVERWRITE", body = body)
+    response = execute_request(request, WRITE, lgr)
+    lgr.info(f"appended {len(p_rows)} row(s) at {response.get('updates', {}).get('updatedRange')}")
+    return response
+
+
+def update_sheets_values(p_data:list, lgr:lg.Logger) -> dict:
+    """
+    Write ALL the cells with ONE values.batchUpdate request
+    -- the caller acquires the write quota
+    :param p_data: list of {'range': A1 notation, 'values': [[cell value]]}
+    :param    lgr: logger to use
+    :return: server response
+    """
+    body = {"valueInputOption": USER_ENTERED, "data": p_data}
+    response = execute_request(get_sheets_values(lgr).batchUpdate(spreadsheetId = get_budget_id(), body = body), WRITE, lgr)
+    lgr.info(f"updated {response.get('totalUpdatedCells')} cells in {response.get('totalUpdatedSheets')} sheet(s)")
+    return response
+
+
+def read_sheets_values(p_range:str, lgr:lg.Logger) -> list:
+    """
+    Read the values in a range -- a read has nothing to merge, so the read quota is acquired here
+    :param p_range: A1 notation of the range to read
+    :param     lgr: logger to use
+    :return: list of rows, each a list of cell values
+    """
+    sheets_quota.acquire(READ, lgr)
+    response = execute_request(get_sheets_values(lgr).get(spreadsheetId = get_budget_id(), range = p_range), READ, lgr)
+    return response.get("values", [])
@@ -0,0 +1,128 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# sheetsQuota.py -- client-side token buckets for the Google Sheets API read and write quotas,
+#                   shared by ALL the updaters in a process and optionally across processes through a lock file
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import json
+import time
+import fcntl
+import threading
+import logging as lg
+from collections import deque
+from contextlib import contextmanager
+
+READ:str  = "read"
+WRITE:str = "write"
+# Sheets API default per-user limits, in requests per minute
+QUOTA_PER_MINUTE = {
+    READ  : 60 ,
+    WRITE : 60
+}
+QUOTA_PERIOD:float = 60.0
+
+
+class SheetsQuota:
+    """
+    a token bucket for each kind of request, refilled continuously up to the quota per minute
+    -- acquire() BEFORE collecting what to send: a caller that has to wait then sends everything queued up meanwhile
+       in ONE request, so requests are merged exactly when the budget is tight
+    """
+    def __init__(self, p_limits:dict = None):
+        self._limits = dict(p_limits or QUOTA_PER_MINUTE)
+        self._lock = threading.Lock()
+        self._lock_file = None
+        # kind -> [tokens, time of last refill]
+        self._buckets = {kind: [float(limit), time.time()] for kind, limit in self._limits.items()}
+        # kind -> times of the requests in the last period, and totals for the whole run
+        self._recent = {kind: deque() for kind in self._limits}
+        self._totals = {kind: {"requests": 0, "waits": 0, "wait_seconds": 0.0, "rejected": 0} for kind in self._limits}
+
+    def use_lock_file(self, p_file:str | None):
+        """Share the buckets with other processes using the same file, which holds the bucket state."""
+        self._lock_file = p_file
+
+    @contextmanager
+    def shared_buckets(self):
+        """Hold the thread lock, and the file lock if any, with the buckets as last saved by ANY process."""
+        with self._lock:
+            if self._lock_file is None:
+                yield self._buckets
+                return
+            with open(self._lock_file, "a+") as lfp:
+                fcntl.flock(lfp, fcntl.LOCK_EX)
+                try:
+                    lfp.seek(0)
+                    state = lfp.read()
+                    if state:
+                        self._buckets.update(json.loads(state))
+                    yield self._buckets
+                    lfp.seek(0)
+                    lfp.truncate()
+                    lfp.write(json.dumps(self._buckets))
+                    lfp.flush()
+                finally:
+                    fcntl.flock(lfp, fcntl.LOCK_UN)
+
+    def refill(self, p_kind:str, p_buckets:dict, p_now:float) -> list:
+        bucket = p_buckets[p_kind]
+        limit = self._limits[p_kind]
+        bucket[0] = min(float(limit), bucket[0] + (p_now - bucket[1]) * limit / QUOTA_PERIOD)
+        bucket[1] = p_now
+        return bucket
+
+    def acquire(self, p_kind:str, lgr:lg.Logger, p_units:int = 1) -> float:
+        """
+        Take the units from the bucket, waiting as long as necessary
+        :return: seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self.shared_buckets() as buckets:
+                now = time.time()
+                bucket = self.refill(p_kind, buckets, now)
+                if bucket[0] >= p_units:
+                    bucket[0] -= p_units
+                    self.count(p_kind, now, p_units, waited)
+                    return waited
+                wait = (p_units - bucket[0]) * QUOTA_PERIOD / self._limits[p_kind]
+            lgr.info(f"Sheets {p_kind} quota is used up: wait {wait:.2f} seconds")
+            time.sleep(wait)
+            waited += wait
+
+    def exhaust(self, p_kind:str, lgr:lg.Logger):
+        """The server rejected a request as over quota, so the budget is actually empty."""
+        with self.shared_buckets() as buckets:
+            buckets[p_kind] = [0.0, time.time()]
+            self._totals[p_kind]["rejected"] += 1
+        lgr.warning(f"Sheets {p_kind} request was rejected as over the quota")
+
+    def count(self, p_kind:str, p_now:float, p_units:int, p_waited:float):
+        recent = self._recent[p_kind]
+        recent.extend([p_now] * p_units)
+        while recent and recent[0] <= p_now - QUOTA_PERIOD:
+            recent.popleft()
+        totals = self._totals[p_kind]
+        totals["requests"] += p_units
+        if p_waited:
+            totals["waits"] += 1
+            totals["wait_seconds"] = round(totals["wait_seconds"] + p_waited, 3)
+
+    def usage(self) -> dict:
+        """Quota use by THIS process, for the response."""
+        now = time.time()
+        with self._lock:
+            return {kind: {"limit_per_minute": self._limits[kind],
+                           "used_last_minute": sum(1 for t in self._recent[kind] if t > now - QUOTA_PERIOD),
+                           **self._totals[kind]} for kind in self._limits}
+# END class SheetsQuota
+
+sheets_quota = SheetsQuota()
@@ -0,0 +1,125 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# sheetsVcr.py -- record the Google Sheets requests and responses to a fixture file, and replay them offline
+#                 with configurable latency and injected errors
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import json
+import time
+import random
+import socket
+import threading
+import os
+import os.path as osp
+import logging as lg
+from collections import deque
+from urllib.parse import urlsplit
+import httplib2
+
+RECORD:str = "record"
+REPLAY:str = "replay"
+VCR_MODES = [RECORD, REPLAY]
+VCR_FOLDER:str = osp.join(osp.dirname(osp.abspath(__file__)), "fixtures")
+# the recordings of the real document are NOT checked in
+DEFAULT_VCR_FILE:str = osp.join(VCR_FOLDER, "sheets-vcr.jsonl")
+# stands in for the id of the real spreadsheet in the fixture file
+SPREADSHEET_PLACEHOLDER:str = "SPREADSHEET_ID"
+# injected failures: an HTTP status or a dropped connection
+INJECTED_ERRORS = [429, 500, 503, None]
+
+
+def interaction_key(p_method:str, p_uri:str, p_body) -> (str, str, str):
+    """Match on the method, the path and the query, and the body -- NOT the host."""
+    parts = urlsplit(p_uri)
+    if isinstance(p_body, bytes):
+        p_body = p_body.decode("utf-8")
+    return p_method, f"{parts.path}?{parts.query}" if parts.query else parts.path, p_body or ""
+
+
+class RecordingHttp:
+    """send each request with the real authorized transport and append the request and response to the fixture file"""
+    def __init__(self, p_http, p_file:str, p_spreadsheet_id:str, p_lgr:lg.Logger):
+        self._http = p_http
+        self._file = p_file
+        self._id = p_spreadsheet_id
+        self._lgr = p_lgr
+        self._lock = threading.Lock()
+        folder = osp.dirname(p_file)
+        if folder and not osp.isdir(folder):
+            os.makedirs(folder)
+
+    def request(self, uri:str, method:str = "GET", body = None, headers:dict = None, **kwargs):
+        resp, content = self._http.request(uri, method = method, body = body, headers = headers, **kwargs)
+        method, path, body_text = interaction_key(method, uri.replace(self._id, SPREADSHEET_PLACEHOLDER), body)
+        interaction = {"method": method, "uri": path, "body": body_text.replace(self._id, SPREADSHEET_PLACEHOLDER),
+                       "status": resp.status, "headers": {k: v for k, v in resp.items() if k != "status"},
+                       "content": content.decode("utf-8").replace(self._id, SPREADSHEET_PLACEHOLDER)}
+        with self._lock, open(self._file, "a") as vfp:
+            vfp.write(json.dumps(interaction) + "\n")
+        self._lgr.debug("recorded %s %s >> %d", method, path, resp.status)
+        return resp, content
+
+    def __getattr__(self, p_name:str):
+        return getattr(self._http, p_name)
+# END class RecordingHttp
+
+
+class ReplayHttp:
+    """
+    serve the recorded responses in place of the Google servers
+    -- the recorded responses to each request are served in order, the last one again once they run out
+    -- each response is delayed by the latency, and a fraction of the requests fail with a random injected error
+    """
+    def __init__(self, p_file:str, p_lgr:lg.Logger, p_latency:float = 0.0, p_error_rate:float = 0.0, p_seed:int = 0):
+        self._lgr = p_lgr
+        self._latency = p_latency
+        self._error_rate = p_error_rate
+        self._random = random.Random(p_seed)
+        self._lock = threading.Lock()
+        self._exact = {}
+        self._by_uri = {}
+        with open(p_file, "r") as vfp:
+            for line in vfp:
+                if line.strip():
+                    interaction = json.loads(line)
+                    key = (interaction["method"], interaction["uri"], interaction["body"])
+                    self._exact.setdefault(key, deque()).append(interaction)
+                    self._by_uri.setdefault(key[:2], deque()).append(interaction)
+        self.served = 0
+        self.injected = 0
+
+    def next_interaction(self, p_key:tuple) -> dict:
+        """The next recorded response to the same request, or else to ANY request with the same method and uri."""
+        for responses, key in ((self._exact, p_key), (self._by_uri, p_key[:2])):
+            queue = responses.get(key)
+            if queue:
+                return queue.popleft() if len(queue) > 1 else queue[0]
+        raise KeyError(f"NO recorded response to {p_key[0]} {p_key[1]}")
+
+    def request(self, uri:str, method:str = "GET", body = None, headers:dict = None, **kwargs):
+        key = interaction_key(method, uri, body)
+        with self._lock:
+            interaction = self.next_interaction(key)
+            inject = self._random.random() < self._error_rate
+            error = self._random.choice(INJECTED_ERRORS) if inject else None
+            self.served += 1
+            self.injected += 1 if inject else 0
+        if self._latency:
+            time.sleep(self._latency)
+
+        if inject:
+            self._lgr.debug("inject %s for %s %s", error or "a dropped connection", key[0], key[1])
+            if error is None:
+                raise socket.timeout("injected: connection timed out")
+            return httplib2.Response({"status": error}), json.dumps({"error": {"code": error, "message": "injected"}}).encode()
+        self._lgr.debug("replay %s %s >> %d", key[0], key[1], interaction["status"])
+        return httplib2.Response({**interaction["headers"], "status": interaction["status"]}), interaction["content"].encode("utf-8")
+# END class ReplayHttp
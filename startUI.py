@@ -9,11 +9,11 @@ __author_name__    = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
 __python_version__ = "3.6+"
 __created__ = "2019-03-30"
-__updated__ = "2024-02-07"
+__updated__ = "2026-10-19"
 
 from sys import path
 from PyQt5.QtWidgets import (QApplication, QComboBox, QVBoxLayout, QGroupBox, QDialog, QFileDialog,
-                             QPushButton, QFormLayout, QDialogButtonBox, QLabel, QTextEdit, QCheckBox, QInputDialog)
+                             QPushButton, QFormLayout, QDialogButtonBox, QLabel, QCheckBox, QInputDialog, QLineEdit)
 from functools import partial
 import concurrent.futures as confut
 path.append("/home/marksa/git/Python/utils")
@@ -21,9 +21,11 @@ from updateBudget import *
 from updateRevExps import update_rev_exps_main
 from updateAssets import update_assets_main
 from updateBalance import update_balance_main
+from updaterProcesses import UpdaterProcesses
+from responseModels import ResponsePanel
 
 TIMEFRAME:str = "Time Frame"
-UPDATE_DOMAINS = [CURRENT_YRS, RECENT_YRS, MID_YRS, EARLY_YRS, ALL_YEARS] + [year for year in UPDATE_YEARS]
+UPDATE_DOMAINS = [CURRENT_YRS, LAST_QTR, LAST_2_QTRS, RECENT_YRS, MID_YRS, EARLY_YRS, ALL_YEARS] + [year for year in UPDATE_YEARS]
 UPDATE_FXNS = [update_rev_exps_main, update_assets_main, update_balance_main]
 CHOICE_FXNS = {
     BAL+' & '+ASSET+'s' : UPDATE_FXNS[1:] ,
@@ -33,6 +35,8 @@ CHOICE_FXNS = {
     "Rev & Exps"        : UPDATE_FXNS[0]
 }
 UI_DEFAULT_LOG_LEVEL = logging.INFO
+# seconds between checks of the updater processes, while keeping the UI responsive
+UI_POLL_INTERVAL:float = 0.1
 
 
 # noinspection PyAttributeOutsideInit
@@ -56,10 +60,8 @@ class UpdateBudgetUI(QDialog):
         self.log_level:int = UI_DEFAULT_LOG_LEVEL
         self.create_group_box()
 
-        self.response_box = QTextEdit()
-        self.response_box.setReadOnly(True)
-        self.response_box.acceptRichText()
-        self.response_box.setText("Hello there!")
+        self.response_box = ResponsePanel()
+        self.response_box.append("Hello there!")
 
         button_box = QDialogButtonBox(QDialogButtonBox.Close)
         button_box.accepted.connect(self.accept)
@@ -84,7 +86,7 @@ class UpdateBudgetUI(QDialog):
         layout.addRow(QLabel("Gnucash File:"), self.gnc_file_btn)
 
         self.cb_mode = QComboBox()
-        self.cb_mode.addItems([TEST,SHEET_1,SHEET_2])
+        self.cb_mode.addItems([TEST,SHEET_1,SHEET_2,SHEET_BOTH])
         self.cb_mode.currentIndexChanged.connect(partial(self.selection_change, self.cb_mode, MODE))
         layout.addRow(QLabel(MODE+':'), self.cb_mode)
 
@@ -93,15 +95,24 @@ class UpdateBudgetUI(QDialog):
         self.cb_domain.currentIndexChanged.connect(partial(self.selection_change, self.cb_domain, TIMEFRAME))
         layout.addRow(QLabel(TIMEFRAME+':'), self.cb_domain)
 
+        self.le_only = QLineEdit()
+        self.le_only.setPlaceholderText("ALL -- or accounts or sheet columns, e.g. RRSP TFSA")
+        layout.addRow(QLabel("Only:"), self.le_only)
+
         vert_box = QGroupBox("Check:")
         vert_layout = QVBoxLayout()
         self.ch_gnc = QCheckBox("Save Gnucash info to JSON file?")
         self.ch_ggl = QCheckBox("Save Google info to JSON file?")
         self.ch_rsp = QCheckBox("Save Google RESPONSE to JSON file?")
+        self.ch_prf = QCheckBox("PROFILE the update?")
+        self.ch_proc = QCheckBox("Run EACH update in a separate PROCESS?")
+        self.ch_proc.setChecked(True)
 
         vert_layout.addWidget(self.ch_gnc)
         vert_layout.addWidget(self.ch_ggl)
         vert_layout.addWidget(self.ch_rsp)
+        vert_layout.addWidget(self.ch_prf)
+        vert_layout.addWidget(self.ch_proc)
         vert_box.setLayout(vert_layout)
         layout.addRow(QLabel("Options"), vert_box)
 
@@ -113,6 +124,12 @@ class UpdateBudgetUI(QDialog):
         self.exe_btn.clicked.connect(partial(self.button_click))
         layout.addRow(QLabel("EXECUTE:"), self.exe_btn)
 
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_click)
+        layout.addRow(QLabel("CANCEL:"), self.cancel_btn)
+        self.cancelled = False
+
         self.gb_main.setLayout(layout)
 
     def open_file_name_dialog(self):
@@ -148,6 +165,35 @@ class UpdateBudgetUI(QDialog):
         ui_lgr.info(F"finished thread: {fxn_param}")
         return response
 
+    def cancel_click(self):
+        ui_lgr.info(F"Clicked '{self.cancel_btn.text()}'.")
+        self.cancelled = True
+
+    def run_processes(self, p_fxns:list, p_params:list) -> dict:
+        """Run each update function in a separate process, showing the log records as they arrive."""
+        processes = UpdaterProcesses(p_fxns, p_params, self.log_level, ui_lgr)
+        self.cancelled = False
+        self.exe_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        try:
+            # send all the Record rows together at the end
+            with record_batch.deferred(ui_lgr):
+                processes.start()
+                while processes.running():
+                    for record in processes.poll(UI_POLL_INTERVAL):
+                        ui_lgr.handle(record)
+                        self.response_box.append(f"{record.levelname}: {record.getMessage()}")
+                    QApplication.processEvents()
+                    if self.cancelled:
+                        processes.cancel()
+                for row in processes.rows:
+                    record_batch.add(row, ui_lgr)
+            processes.close()
+        finally:
+            self.exe_btn.setEnabled(True)
+            self.cancel_btn.setEnabled(False)
+        return processes.results
+
     def button_click(self):
         """Assemble the necessary parameters and call each selected update choice in a separate thread."""
 
@@ -164,6 +210,9 @@ class UpdateBudgetUI(QDialog):
         if self.ch_ggl.isChecked(): cl_params.append("--ggl_save")
         if self.ch_gnc.isChecked(): cl_params.append("--gnc_save")
         if self.ch_rsp.isChecked(): cl_params.append("--resp_save")
+        if self.ch_prf.isChecked(): cl_params.append("--profile")
+        only = self.le_only.text().replace(',', ' ').split()
+        if only: cl_params += ["--only"] + only
         ui_lgr.info( repr(cl_params) )
 
         main_run = CHOICE_FXNS[exe]
@@ -171,10 +220,13 @@ class UpdateBudgetUI(QDialog):
         if callable(main_run):
             ui_lgr.info(f"Calling update {exe}...")
             response = main_run(cl_params)
+        elif isinstance(main_run, list) and self.ch_proc.isChecked():
+            ui_lgr.info(f"updates to run in separate processes = {exe}")
+            response = self.run_processes(main_run, cl_params)
         elif isinstance(main_run, list):
             ui_lgr.info(f"updates to run = {exe}")
-            # use 'with' to ensure threads are cleaned up properly
-            with confut.ThreadPoolExecutor(max_workers = len(main_run)) as executor:
+            # use 'with' to ensure threads are cleaned up properly -- and send all the Record rows together at the end
+            with record_batch.deferred(ui_lgr), confut.ThreadPoolExecutor(max_workers = len(main_run)) as executor:
                 # send each update function to a separate thread
                 running_threads = {executor.submit(self.run_function, fxn, cl_params):fxn for fxn in main_run}
                 ui_lgr.info(F"running threads = {repr(running_threads)}")
@@ -193,8 +245,7 @@ class UpdateBudgetUI(QDialog):
             ui_lgr.error(msg)
             response = msg
 
-        reply = {"response":response}
-        self.response_box.append( json.dumps(reply, indent=4) )
+        self.response_box.add_response(exe, {"response":response})
 # END class UpdateBudgetUI
 
 
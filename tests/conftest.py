@@ -0,0 +1,18 @@
+import sys
+import os.path as osp
+from importlib.abc import MetaPathFinder
+from importlib.machinery import PathFinder
+
+# the modules are at the root of the repo
+sys.path.insert(0, osp.dirname(osp.dirname(osp.abspath(__file__))))
+
+STUBS_FOLDER = osp.join(osp.dirname(osp.abspath(__file__)), "stubs")
+
+
+class StubFinder(MetaPathFinder):
+    """the stand-ins in tests/stubs for the libraries that are NOT installed -- AFTER the usual finders, so an installed library wins"""
+    def find_spec(self, fullname:str, path, target = None):
+        return PathFinder.find_spec(fullname, [osp.join(STUBS_FOLDER, *fullname.split('.')[:-1])])
+
+
+sys.meta_path.append(StubFinder())
@@ -0,0 +1,35 @@
+"""stand-in for the gncUtils library: the sheet names, and NO Gnucash bindings"""
+from decimal import Decimal
+
+BOTH = "Both"
+ALL_INC_SHEET = "All Inc 1"
+ALL_INC_2_SHEET = "All Inc 2"
+NEC_INC_SHEET = "Nec Inc 1"
+NEC_INC_2_SHEET = "Nec Inc 2"
+BAL_1_SHEET = "Balance 1"
+BAL_2_SHEET = "Balance 2"
+QTR_ASTS_SHEET = "Assets 1"
+QTR_ASTS_2_SHEET = "Assets 2"
+FILL_CELL_VAL = str | Decimal
+
+
+class Account:
+    pass
+
+
+class GnucashSession:
+    def __init__(self, p_mode:str, p_gncfile:str, p_domain:str, p_lgr = None):
+        self._gnc_file = p_gncfile
+
+    def get_file_name(self) -> str:
+        return self._gnc_file
+
+    def begin_session(self):
+        raise NotImplementedError("the Gnucash bindings are NOT installed")
+
+    def end_session(self):
+        pass
+
+
+def fill_splits(*args) -> str:
+    raise NotImplementedError("the Gnucash bindings are NOT installed")
@@ -0,0 +1,5 @@
+"""stand-in for google-auth"""
+
+
+class Request:
+    pass
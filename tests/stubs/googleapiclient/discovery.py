@@ -0,0 +1,5 @@
+"""stand-in for google-api-python-client: NO network in the tests"""
+
+
+def build(*args, **kwargs):
+    raise RuntimeError("NO Google API in the tests")
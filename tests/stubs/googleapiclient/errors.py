@@ -0,0 +1,5 @@
+"""stand-in for google-api-python-client"""
+
+
+class HttpError(Exception):
+    pass
@@ -0,0 +1,12 @@
+"""stand-in for httplib2"""
+
+
+class Http:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class Response(dict):
+    def __init__(self, p_info:dict):
+        super().__init__(p_info)
+        self.status = int(p_info.get("status", 200))
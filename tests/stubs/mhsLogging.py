@@ -0,0 +1,22 @@
+"""stand-in for the mhsLogging library: a console logger"""
+import logging as lg
+
+
+class MhsLogger:
+    def __init__(self, p_name:str, con_level:int = lg.INFO, file_time:str = None, suffix:str = None):
+        self._lgr = lg.getLogger(p_name)
+        self._lgr.setLevel(lg.DEBUG)
+        if not self._lgr.handlers:
+            handler = lg.StreamHandler()
+            handler.setLevel(con_level)
+            self._lgr.addHandler(handler)
+        self._saved = []
+
+    def get_logger(self) -> lg.Logger:
+        return self._lgr
+
+    def get_saved_info(self) -> list:
+        return self._saved
+
+    def show(self, p_msg:str):
+        print(p_msg)
@@ -0,0 +1,79 @@
+"""stand-in for the mhsUtils library: the constants and helpers used by the updaters"""
+import os
+import json
+import logging
+import tempfile
+import threading
+import os.path as osp
+import logging as lg
+from datetime import date, timedelta, datetime as dt
+from decimal import Decimal
+
+now_dt = dt.now()
+ONE_DAY = timedelta(days = 1)
+ZERO = Decimal(0)
+FILE_DATETIME_FORMAT = "D%Y-%m-%dT%H-%M-%S"
+CELL_DATE_STR = "%Y-%m-%d"
+CELL_TIME_STR = "%H:%M:%S"
+OUTPUT_FOLDER = osp.join(tempfile.gettempdir(), "updateBudget-output")
+BASE_GNUCASH_FOLDER = tempfile.gettempdir()
+
+SHEET = "Sheet"; BASE = "Base"; BASE_ROW = "Base row"; YR = "Year"; SPAN = "Span"; QTR = "Quarter"; MTH = "Month"
+DATE = "Date"; TIME = "Time"; TODAY = "Today"; ALL = "All"; ALL_YEARS = "allyears"; TEST = "test"; MODE = "Mode"
+REV = "Revenue"; BAL = "Balance"; CONT = "Contingent"; NEC = "Necessary"; DEDNS = "Emp_Dedns"
+INV = "Invest"; OTH = "Other"; EMPL = "Employment"; ASSET = "Asset"; TOTAL = "Total"
+FAM = "FAMILY"; PM = "PM"; AU = "Gold"; AG = "Silver"; CASH = "Cash"; LIQ = "LIQUID"; BANK = "Bank"; REW = "Rewards"
+RESP = "RESP"; INVEST = "INVEST"; OPEN = "OPEN"; RRSP = "RRSP"; TFSA = "TFSA"; HOUSE = "House"; LOAN = "LOANS"; CAR = "Car"
+LIAB = "LIABS"; CC = "CC"; KIA = "KIA"; SLINE = "SLINE"; TRUST = "TRUST"; CHAL = "XCHALET"
+
+
+def get_current_year() -> int:
+    return now_dt.year
+
+
+def get_current_time() -> str:
+    return dt.now().strftime(CELL_TIME_STR)
+
+
+def get_filename(p_path:str) -> str:
+    return osp.basename(p_path)
+
+
+def get_base_filename(p_path:str) -> str:
+    return osp.splitext(osp.basename(p_path))[0]
+
+
+def save_to_json(p_name:str, p_data, ts:str = None, indt:int = 4) -> str:
+    os.makedirs(OUTPUT_FOLDER, exist_ok = True)
+    out_file = osp.join(OUTPUT_FOLDER, f"{p_name}_{ts or dt.now().strftime(FILE_DATETIME_FORMAT)}.json")
+    with open(out_file, "w") as jfp:
+        json.dump(p_data, jfp, indent = indt, default = str)
+    return out_file
+
+
+def get_int_year(p_year:str, p_base:int) -> int:
+    return int(p_year)
+
+
+def get_int_quarter(p_qtr:str) -> int:
+    return int(p_qtr)
+
+
+def year_span(p_target:int, p_base:int, p_span:int, p_hdr_span:int, lgr:lg.Logger = None) -> int:
+    """the row offset of the year, with a header row every p_hdr_span years"""
+    year_diff = p_target - p_base
+    return year_diff * p_span + (0 if p_hdr_span <= 0 else year_diff // p_hdr_span)
+
+
+def current_quarter_end(p_year:int, p_month:int) -> date:
+    following = p_month + 3
+    return date(p_year + (following - 1) // 12, (following - 1) % 12 + 1, 1) - ONE_DAY
+
+
+def generate_quarter_boundaries(p_year:int, p_month:int, p_num:int):
+    for _ in range(p_num):
+        yield date(p_year, p_month, 1), current_quarter_end(p_year, p_month)
+        p_month += 3
+        if p_month > 12:
+            p_month -= 12
+            p_year += 1
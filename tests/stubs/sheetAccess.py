@@ -0,0 +1,16 @@
+"""stand-in for the sheetAccess library: collects the cells, sends nothing"""
+from decimal import Decimal
+
+
+class MhsSheetAccess:
+    def __init__(self, p_lgr = None):
+        self._data = []
+
+    def fill_cell(self, p_sheet:str, p_col:str, p_row:int, p_val, p_data:list = None) -> list:
+        data = self._data if p_data is None else p_data
+        value = p_val.to_eng_string() if isinstance(p_val, Decimal) else p_val
+        data.append({"range": f"{p_sheet}!{p_col}{p_row}", "values": [[value]]})
+        return data
+
+    def get_data(self) -> list:
+        return self._data
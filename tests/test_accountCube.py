@@ -0,0 +1,58 @@
+import logging as lg
+from datetime import date
+from decimal import Decimal
+import pytest
+from accountCube import AccountCube
+from gncSqlSession import GnucashSqlSession
+from test_gncSqlSession import make_book
+
+LGR = lg.getLogger(__name__)
+
+PATHS = [["EXP"], ["EXP", "Food"], ["FAMILY"], ["INCOME"]]
+
+
+@pytest.fixture
+def session(tmp_path) -> GnucashSqlSession:
+    gnc_session = GnucashSqlSession("test", make_book(str(tmp_path / "book.gnucash")), "Both", LGR)
+    gnc_session.begin_session()
+    yield gnc_session
+    gnc_session.end_session()
+
+
+@pytest.fixture
+def cube(session) -> AccountCube:
+    return AccountCube(session, PATHS, date(2024, 1, 15), date(2024, 12, 1), LGR)
+
+
+def periods_of(p_periods:list) -> list:
+    return [[start, end, Decimal(0), Decimal(0), Decimal(0)] for start, end in p_periods]
+
+
+@pytest.mark.parametrize("path", [["EXP"], ["EXP", "Food"], ["FAMILY"]])
+@pytest.mark.parametrize("periods", [
+    [(date(2024, 1, 1), date(2024, 3, 31)), (date(2024, 4, 1), date(2024, 6, 30))],
+    [(date(2024, 1, 1), date(2024, 12, 31))],
+    [(date(2024, 2, 1), date(2024, 2, 29)), (date(2024, 2, 1), date(2024, 5, 31))],
+])
+def test_cube_matches_the_session(session, cube, path:list, periods:list):
+    from_cube, from_session = periods_of(periods), periods_of(periods)
+    assert cube.fill_splits(path, [], from_cube) == session.fill_splits(path, [], from_session)
+    assert from_cube == from_session
+
+
+def test_parent_includes_its_own_splits_and_its_children(cube):
+    assert cube.period_sums(["EXP"], date(2024, 1, 1), date(2024, 3, 31)) == (Decimal("411.75"), Decimal("-2.50"))
+    assert cube.period_sums(["EXP", "Food"], date(2024, 1, 1), date(2024, 3, 31)) == (Decimal("10.50"), Decimal("-2.50"))
+
+
+def test_unknown_account_is_left_out(cube):
+    with pytest.raises(Exception, match = "NOT in the cube"):
+        cube.period_sums(["INCOME"], date(2024, 1, 1), date(2024, 3, 31))
+
+
+def test_period_must_be_whole_months_in_the_cube(cube):
+    assert cube.covers(date(2024, 1, 1), date(2024, 12, 31))
+    assert not cube.covers(date(2024, 1, 2), date(2024, 3, 31))
+    assert not cube.covers(date(2023, 10, 1), date(2024, 3, 31))
+    with pytest.raises(Exception, match = "NOT whole months"):
+        cube.period_sums(["EXP"], date(2024, 1, 1), date(2024, 3, 30))
@@ -0,0 +1,21 @@
+import logging as lg
+from artefacts import ArtefactWriter, load_artefact, compare, JSONL, MSGPACK
+
+LGR = lg.getLogger(__name__)
+
+
+def test_each_save_uses_its_own_format(tmp_path):
+    writer = ArtefactWriter(str(tmp_path))
+    data = [{"range": "All Inc 2!D168", "values": [["1.50"]]}]
+    jsonl_path = writer.save("google", data, "D2026-10-19T10-00-00", JSONL)
+    msgpack_path = writer.save("google", {"Sent": "already"}, "D2026-10-19T10-00-01", MSGPACK)
+    writer.flush(LGR)
+    assert ".jsonl" in jsonl_path
+    assert jsonl_path != msgpack_path
+    assert load_artefact(jsonl_path)[1] == data
+    assert load_artefact(msgpack_path)[1] == {"Sent": "already"}
+
+
+def test_compare():
+    assert compare([1, 2], [1, 3, 4]) == [(1, 2, 3), (2, None, 4)]
+    assert compare({"a": 1}, {"a": 1}) == []
@@ -0,0 +1,115 @@
+import time
+import threading
+import logging as lg
+import pytest
+import batchJobs
+from batchJobs import BatchJob, BatchRunner, REV_EXPS, ASSETS, BALANCE, DONE, FAILED, SKIPPED
+
+LGR = lg.getLogger(__name__)
+
+
+@pytest.fixture
+def books(tmp_path) -> dict:
+    """a book read by SQL and a book read with the Gnucash bindings"""
+    sql_book, bindings_book = tmp_path / "budget.gnucash", tmp_path / "budget-bindings.gnucash"
+    sql_book.write_bytes(b"SQLite format 3\x00")
+    bindings_book.write_bytes(b"NOT a lite book")
+    return {"sql": str(sql_book), "bindings": str(bindings_book)}
+
+
+class FakeUpdaters:
+    """stand in for the updaters: each run takes a little while, and the runs of the timespans in 'fail' raise"""
+    def __init__(self):
+        self.fail = set()
+        self.runs = []
+        self._lock = threading.Lock()
+        self._running = 0
+        self.max_running = 0
+
+    def updater(self, p_name:str):
+        def run(p_args:list, p_pool) -> dict:
+            with self._lock:
+                self.runs.append(p_name)
+                self._running += 1
+                self.max_running = max(self.max_running, self._running)
+            try:
+                time.sleep(0.02)
+                if any('-t' + timespan in p_args for timespan in self.fail):
+                    raise Exception(f"{p_name} failed")
+                return {"updater": p_name, "args": p_args}
+            finally:
+                with self._lock:
+                    self._running -= 1
+        return run
+
+
+@pytest.fixture
+def updaters(monkeypatch) -> FakeUpdaters:
+    fake = FakeUpdaters()
+    for name in (REV_EXPS, ASSETS, BALANCE):
+        monkeypatch.setitem(batchJobs.JOB_UPDATERS, name, fake.updater(name))
+    return fake
+
+
+def make_jobs(p_specs:list, p_book:str) -> list:
+    return [BatchJob(spec, {"book": p_book, "target": "test"}, indx) for indx, spec in enumerate(p_specs)]
+
+
+def test_balance_comes_after_the_assets_of_the_same_book(books, updaters):
+    jobs = make_jobs([{"updater": BALANCE, "timespan": "2024", "name": "bal"},
+                      {"updater": ASSETS, "timespan": "2024", "name": "assets"},
+                      {"updater": ASSETS, "timespan": "2024", "name": "other", "target": "Sheet1"}], books["sql"])
+    summary = BatchRunner(jobs, 4, LGR).run()
+    assert jobs[0].after == {"assets"}
+    assert [summary[name]["status"] for name in ("bal", "assets", "other")] == [DONE, DONE, DONE]
+    assert updaters.runs.index(ASSETS) < updaters.runs.index(BALANCE)
+
+
+def test_job_after_a_failed_job_is_skipped(books, updaters):
+    updaters.fail.add("2023")
+    jobs = make_jobs([{"updater": ASSETS, "timespan": "2023", "name": "assets"},
+                      {"updater": BALANCE, "timespan": "2024", "name": "bal"},
+                      {"updater": REV_EXPS, "timespan": "2024", "name": "rev"}], books["sql"])
+    summary = BatchRunner(jobs, 4, LGR).run()
+    assert summary["assets"]["status"] == FAILED
+    assert "Assets failed" in summary["assets"]["response"]
+    assert summary["bal"]["status"] == SKIPPED
+    assert summary["rev"]["status"] == DONE
+
+
+def test_bindings_jobs_run_one_at_a_time(books, updaters):
+    jobs = make_jobs([{"updater": REV_EXPS, "timespan": str(year)} for year in range(2020, 2024)], books["bindings"])
+    assert all(job.bindings for job in jobs)
+    summary = BatchRunner(jobs, 4, LGR).run()
+    assert all(result["status"] == DONE for result in summary.values())
+    assert updaters.max_running == 1
+
+
+def test_lite_jobs_run_in_parallel(books, updaters):
+    jobs = make_jobs([{"updater": REV_EXPS, "timespan": str(year)} for year in range(2020, 2024)], books["sql"])
+    assert not any(job.bindings for job in jobs)
+    BatchRunner(jobs, 4, LGR).run()
+    assert updaters.max_running > 1
+
+
+def test_invalid_jobs(books):
+    with pytest.raises(Exception, match = "is NOT one of"):
+        make_jobs([{"updater": "Taxes", "timespan": "2024"}], books["sql"])
+    with pytest.raises(Exception, match = "unknown job"):
+        BatchRunner(make_jobs([{"updater": ASSETS, "timespan": "2024", "after": ["missing"]}], books["sql"]), 2, LGR)
+    with pytest.raises(Exception, match = "must be unique"):
+        BatchRunner(make_jobs([{"updater": ASSETS, "timespan": "2024", "name": "same"}] * 2, books["sql"]), 2, LGR)
+    with pytest.raises(Exception, match = "different 'quota_file'"):
+        BatchRunner(make_jobs([{"updater": ASSETS, "timespan": "2024", "name": "one"},
+                               {"updater": ASSETS, "timespan": "2024", "name": "two", "args": ["--quota_file", "quota.lock"]}], books["sql"]), 2, LGR)
+    with pytest.raises(Exception, match = "depends on itself"):
+        BatchRunner(make_jobs([{"updater": ASSETS, "timespan": "2024", "name": "one", "after": ["two"]},
+                               {"updater": ASSETS, "timespan": "2024", "name": "two", "after": ["one"]}], books["sql"]), 2, LGR)
+
+
+def test_process_is_configured_once_from_the_jobs(books, updaters, monkeypatch):
+    configured = []
+    monkeypatch.setattr(batchJobs, "configure_process", configured.append)
+    jobs = make_jobs([{"updater": REV_EXPS, "timespan": str(year), "args": ["--vcr", "replay"]} for year in range(2020, 2023)], books["sql"])
+    BatchRunner(jobs, 2, LGR).run()
+    assert [params.vcr for params in configured] == ["replay"]
@@ -0,0 +1,85 @@
+import os
+import gzip
+import json
+import logging as lg
+import pytest
+from bookCache import BookCache, INDEX_FILE
+
+LGR = lg.getLogger(__name__)
+
+CONTENT = b"<?xml version='1.0'?>\n<gnc-v2/>\n" * 100
+
+
+def write_book(p_file, p_content:bytes = CONTENT) -> str:
+    with gzip.open(p_file, "wb") as gfp:
+        gfp.write(p_content)
+    return str(p_file)
+
+
+@pytest.fixture
+def cache(tmp_path) -> BookCache:
+    return BookCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def inflated(monkeypatch) -> list:
+    """the books inflated"""
+    books = []
+    inflate = BookCache.inflate
+    def count_inflate(p_book:str, p_copy:str) -> int:
+        books.append(p_book)
+        return inflate(p_book, p_copy)
+    monkeypatch.setattr(BookCache, "inflate", staticmethod(count_inflate))
+    return books
+
+
+def test_plain_book_is_opened_directly(cache, tmp_path):
+    book = tmp_path / "book.gnucash"
+    book.write_bytes(b"SQLite format 3\x00")
+    assert cache.get_book(str(book), LGR) == str(book)
+    BookCache(None).get_book(write_book(tmp_path / "zipped.gnucash"), LGR)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_copy_is_inflated_once(cache, tmp_path, inflated):
+    book = write_book(tmp_path / "book.gnucash")
+    copy = cache.get_book(book, LGR)
+    assert copy != book
+    with open(copy, "rb") as cfp:
+        assert cfp.read() == CONTENT
+    assert cache.get_book(book, LGR) == copy
+    assert inflated == [book]
+
+
+def test_identical_books_share_a_copy(cache, tmp_path, inflated):
+    first = write_book(tmp_path / "first.gnucash")
+    second = tmp_path / "second.gnucash"
+    second.write_bytes(open(first, "rb").read())
+    assert cache.get_book(first, LGR) == cache.get_book(str(second), LGR)
+    assert len(inflated) == 1
+
+
+def test_changed_book_gets_a_new_copy(cache, tmp_path, inflated):
+    book = write_book(tmp_path / "book.gnucash")
+    old_copy = cache.get_book(book, LGR)
+    write_book(book, CONTENT + b"<changed/>\n")
+    os.utime(book, ns = (1, 1))
+    new_copy = cache.get_book(book, LGR)
+    assert new_copy != old_copy
+    with open(new_copy, "rb") as cfp:
+        assert cfp.read().endswith(b"<changed/>\n")
+    assert len(inflated) == 2
+
+
+def test_least_recently_used_copy_is_evicted(tmp_path):
+    cache = BookCache(str(tmp_path / "cache"), 2 * (len(CONTENT) + 1))
+    books = [write_book(tmp_path / f"book{num}.gnucash", CONTENT + bytes([num])) for num in range(3)]
+    copies = [cache.get_book(book, LGR) for book in books[:2]]
+    # used again, so NOT the least recently used
+    cache.get_book(books[0], LGR)
+    copies.append(cache.get_book(books[2], LGR))
+    assert [os.path.isfile(copy) for copy in copies] == [True, False, True]
+    with open(tmp_path / "cache" / INDEX_FILE) as ifp:
+        index = json.load(ifp)
+    assert len(index["copies"]) == 2
+    assert sorted(index["paths"]) == [os.path.abspath(books[0]), os.path.abspath(books[2])]
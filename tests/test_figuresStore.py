@@ -0,0 +1,74 @@
+import os.path as osp
+from datetime import date
+from decimal import Decimal
+import pytest
+from figuresStore import FiguresStore
+from qtrlyTable import QuarterlyTable
+
+
+@pytest.fixture
+def book(tmp_path) -> str:
+    book_file = tmp_path / "budget.gnucash"
+    book_file.write_bytes(b"book")
+    return str(book_file)
+
+
+@pytest.fixture
+def store(tmp_path) -> FiguresStore:
+    return FiguresStore(str(tmp_path / "store" / "figures.db"))
+
+
+def make_table(p_rows:dict) -> QuarterlyTable:
+    table = QuarterlyTable()
+    for (year, qtr), values in p_rows.items():
+        row = table.add_row(year, qtr)
+        for metric, value in values.items():
+            table.set(row, metric, Decimal(value))
+    return table
+
+
+def stored(p_store:FiguresStore, p_filters:dict = None) -> dict:
+    conn = p_store.connect(True)
+    try:
+        return {(fig["year"], fig["quarter"], fig["metric"]): fig["value"] for fig in p_store.figures(conn, p_filters or {})}
+    finally:
+        conn.close()
+
+
+def test_run_replaces_only_its_own_quarters(store, book):
+    store.store_table(book, "UpdateRevExps", make_table({(2024, 1): {"INV": "1.10", "OTH": "2.20"}, (2024, 2): {"INV": "3.30"}}))
+    store.store_table(book, "UpdateRevExps", make_table({(2024, 1): {"INV": "4.40"}}))
+    assert stored(store) == {(2024, 1, "INV"): "4.40", (2024, 2, "INV"): "3.30"}
+
+
+def test_part_of_the_metrics_keeps_the_others(store, book):
+    store.store_table(book, "UpdateRevExps", make_table({(2024, 1): {"INV": "1.10", "OTH": "2.20"}}))
+    store.store_table(book, "UpdateRevExps", make_table({(2024, 1): {"INV": "5.50"}}), p_whole = False)
+    assert stored(store) == {(2024, 1, "INV"): "5.50", (2024, 1, "OTH"): "2.20"}
+
+
+def test_values_keep_the_decimal_strings(store, book):
+    store.store_table(book, "UpdateAssets", make_table({(2023, 4): {"CASH": "100.10", "BANK": "-0.00"}}))
+    assert stored(store, {"updater": "UpdateAssets", "metric": "CASH"}) == {(2023, 4, "CASH"): "100.10"}
+    assert stored(store, {"metric": "BANK"}) == {(2023, 4, "BANK"): "-0.00"}
+
+
+def test_today_and_the_sources(store, book):
+    store.store_today(book, "UpdateBalance", date(2026, 2, 10), {"Bank": Decimal("12.34"), "CC": Decimal("-5.00")})
+    conn = store.connect(True)
+    try:
+        assert store.today(conn, {"account": "CC"}) == [{"book": book, "account": "CC", "day": "2026-02-10", "value": "-5.00"}]
+        sources = store.sources(conn, book)
+    finally:
+        conn.close()
+    assert [(source["updater"], source["book_mtime"]) for source in sources] == [("UpdateBalance", osp.getmtime(book))]
+
+
+def test_run_with_no_figures_still_records_its_source(store, book):
+    store.store_source(book, "UpdateBalance")
+    conn = store.connect(True)
+    try:
+        assert [(source["updater"], source["book_mtime"]) for source in store.sources(conn, book)] == [("UpdateBalance", osp.getmtime(book))]
+        assert store.today(conn, {}) == []
+    finally:
+        conn.close()
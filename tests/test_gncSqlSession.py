@@ -0,0 +1,115 @@
+import sqlite3
+import logging as lg
+from datetime import date
+from decimal import Decimal
+import pytest
+from gncSqlSession import GnucashSqlSession, is_sqlite_book
+
+LGR = lg.getLogger(__name__)
+
+SCHEMA = """
+    CREATE TABLE books(guid TEXT PRIMARY KEY, root_account_guid TEXT);
+    CREATE TABLE accounts(guid TEXT PRIMARY KEY, name TEXT, parent_guid TEXT, commodity_guid TEXT);
+    CREATE TABLE commodities(guid TEXT PRIMARY KEY, mnemonic TEXT, fraction INTEGER);
+    CREATE TABLE transactions(guid TEXT PRIMARY KEY, currency_guid TEXT, post_date TEXT);
+    CREATE TABLE splits(guid TEXT PRIMARY KEY, tx_guid TEXT, account_guid TEXT, quantity_num INTEGER, quantity_denom INTEGER);
+    CREATE TABLE prices(guid TEXT PRIMARY KEY, commodity_guid TEXT, currency_guid TEXT, date TEXT, value_num INTEGER, value_denom INTEGER);
+"""
+ACCOUNTS = [
+    ("root", "Root Account", None, "cad"),
+    ("exp", "EXP", "root", "cad"),
+    ("food", "Food", "exp", "cad"),
+    ("car", "Car", "exp", "cad"),
+    ("fam", "FAMILY", "root", "cad"),
+    ("rrsp", "RRSP", "fam", "fund"),
+]
+# date, account, quantity, denominator
+SPLITS = [
+    ("2024-01-05", "food", 1050, 100),
+    ("2024-01-31", "food", -250, 100),
+    ("2024-02-01", "car", 40000, 100),
+    ("2024-03-31", "exp", 125, 100),
+    ("2024-04-01", "food", 700, 100),
+    ("2024-02-15", "rrsp", 25000, 10000),
+]
+
+
+def make_book(p_file:str, p_compact:bool = False) -> str:
+    """:param p_compact: the dates as 'YYYYMMDDhhmmss' as in the books of older Gnucash versions"""
+    conn = sqlite3.connect(p_file)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO books VALUES ('book', 'root')")
+    conn.executemany("INSERT INTO commodities VALUES (?, ?, ?)", [("cad", "CAD", 100), ("fund", "XFUND", 10000)])
+    conn.executemany("INSERT INTO accounts VALUES (?, ?, ?, ?)", ACCOUNTS)
+    def post_date(p_day:str) -> str:
+        return p_day.replace('-', '') + "105900" if p_compact else p_day + " 10:59:00"
+    for indx, (day, acct, num, denom) in enumerate(SPLITS):
+        conn.execute("INSERT INTO transactions VALUES (?, 'cad', ?)", (f"tx{indx}", post_date(day)))
+        conn.execute("INSERT INTO splits VALUES (?, ?, ?, ?, ?)", (f"split{indx}", f"tx{indx}", acct, num, denom))
+    conn.executemany("INSERT INTO prices VALUES (?, 'fund', 'cad', ?, ?, 100)",
+                     [("p1", post_date("2024-01-31"), 1200), ("p2", post_date("2024-03-31"), 1333)])
+    conn.commit()
+    conn.close()
+    return p_file
+
+
+@pytest.fixture(params = [False, True], ids = ["iso", "compact"])
+def session(request, tmp_path) -> GnucashSqlSession:
+    gnc_session = GnucashSqlSession("test", make_book(str(tmp_path / "book.gnucash"), request.param), "Both", LGR)
+    gnc_session.begin_session()
+    yield gnc_session
+    gnc_session.end_session()
+
+
+def test_is_sqlite_book(tmp_path):
+    assert is_sqlite_book(make_book(str(tmp_path / "book.gnucash")))
+    xml_book = tmp_path / "book.xml"
+    xml_book.write_text("<?xml version='1.0'?>")
+    assert not is_sqlite_book(str(xml_book))
+
+
+def test_load_book(session):
+    assert session.get_currency() == "CAD"
+    assert session.split_count == len(SPLITS)
+    assert session.get_root_acct().name == "Root Account"
+    assert session.account_from_path(["EXP", "Food"]).guid == "food"
+    with pytest.raises(Exception, match = "could NOT be found"):
+        session.account_from_path(["EXP", "Rent"])
+
+
+def test_total_balance_includes_the_sub_accounts_and_the_splits_on_the_date(session):
+    assert session.get_total_balance(["EXP"], date(2024, 1, 4)) == Decimal("0.00")
+    assert session.get_total_balance(["EXP", "Food"], date(2024, 1, 31)) == Decimal("8.00")
+    assert session.get_total_balance(["EXP"], date(2024, 3, 31)) == Decimal("409.25")
+    assert session.get_total_balance(["EXP"], date(2024, 12, 31)) == Decimal("416.25")
+
+
+def test_balance_in_another_commodity_uses_the_latest_price(session):
+    # 2.5 units at 12.00 then at 13.33, rounded to the cents of the currency
+    assert session.get_total_balance(["FAMILY", "RRSP"], date(2024, 2, 29)) == Decimal("30.00")
+    assert session.get_total_balance(["FAMILY"], date(2024, 3, 31)) == Decimal("33.33")
+
+
+def test_total_balances_of_nested_accounts(session):
+    totals = session.get_total_balances([["EXP", "Food"], ["EXP"], ["EXP", "Car"]], date(2024, 3, 31))
+    assert totals == {("EXP",): Decimal("409.25"), ("EXP", "Food"): Decimal("8.00"), ("EXP", "Car"): Decimal("400.00")}
+
+
+def test_period_sums_split_the_debits_and_the_credits(session):
+    expenses = ["exp", "food", "car"]
+    assert session.get_period_sums(expenses, date(2024, 1, 1), date(2024, 3, 31)) == (Decimal("411.75"), Decimal("-2.50"))
+    assert session.get_period_sums(expenses, date(2024, 2, 2), date(2024, 3, 30)) == (0, 0)
+
+
+def test_monthly_sums(session):
+    sums = session.get_monthly_sums(["food", "car"], date(2024, 1, 10), date(2024, 3, 1))
+    assert sums == {"food": {(2024, 1): [Decimal("10.50"), Decimal("-2.50"), 1, 1]},
+                    "car": {(2024, 2): [Decimal("400.00"), 0, 1, 0]}}
+
+
+def test_fill_splits_adds_to_the_periods(session):
+    periods = [[date(2024, 1, 1), date(2024, 3, 31), Decimal(1), Decimal(0), Decimal(1)],
+               [date(2024, 4, 1), date(2024, 6, 30), Decimal(0), Decimal(0), Decimal(0)]]
+    assert session.fill_splits(["EXP", "Food"], [], periods) == "Food"
+    assert periods[0][2:] == [Decimal("11.50"), Decimal("-2.50"), Decimal("9.00")]
+    assert periods[1][2:] == [Decimal("7.00"), Decimal(0), Decimal("7.00")]
@@ -0,0 +1,57 @@
+from datetime import date
+from decimal import Decimal
+from gncXmlSession import SplitSeries
+
+
+def make_series(p_splits:list) -> SplitSeries:
+    series = SplitSeries()
+    for split_date, amount in p_splits:
+        series.add(split_date, Decimal(amount))
+    series.finish()
+    return series
+
+
+SPLITS = [
+    (date(2024, 3, 15), "100.00"),
+    (date(2024, 1, 10), "-30.00"),
+    (date(2024, 2, 1), "50.00"),
+    (date(2024, 2, 1), "-5.00"),
+    (date(2024, 4, 1), "20.00"),
+]
+
+
+def test_splits_are_sorted_by_date():
+    series = make_series(SPLITS)
+    assert series.dates == sorted(split_date for split_date, _ in SPLITS)
+
+
+def test_balance_includes_the_splits_on_the_date():
+    series = make_series(SPLITS)
+    assert series.balance(date(2024, 1, 9)) == Decimal(0)
+    assert series.balance(date(2024, 1, 10)) == Decimal("-30.00")
+    assert series.balance(date(2024, 2, 1)) == Decimal("15.00")
+    assert series.balance(date(2024, 3, 31)) == Decimal("115.00")
+    assert series.balance(date(2030, 1, 1)) == Decimal("135.00")
+
+
+def test_period_totals_match_the_splits_in_the_period():
+    series = make_series(SPLITS)
+    for start, end in ((date(2024, 1, 1), date(2024, 3, 31)), (date(2024, 2, 1), date(2024, 2, 29)),
+                       (date(2024, 1, 11), date(2024, 4, 1)), (date(2024, 4, 1), date(2024, 6, 30))):
+        amounts = [Decimal(amount) for split_date, amount in SPLITS if start <= split_date <= end]
+        debits = [amount for amount in amounts if amount >= 0]
+        credits = [amount for amount in amounts if amount < 0]
+        assert series.period_totals(start, end) == (sum(debits), sum(credits), len(debits), len(credits))
+
+
+def test_period_with_no_splits_is_zero():
+    series = make_series(SPLITS)
+    assert series.period_totals(date(2023, 1, 1), date(2023, 12, 31)) == (Decimal(0), Decimal(0), 0, 0)
+    assert series.period_totals(date(2024, 2, 2), date(2024, 3, 14)) == (Decimal(0), Decimal(0), 0, 0)
+    assert series.period_sums(date(2024, 4, 1), date(2024, 4, 30)) == (Decimal("20.00"), Decimal(0))
+
+
+def test_empty_series():
+    series = make_series([])
+    assert series.balance(date(2024, 1, 1)) == Decimal(0)
+    assert series.period_totals(date(2024, 1, 1), date(2024, 12, 31)) == (Decimal(0), Decimal(0), 0, 0)
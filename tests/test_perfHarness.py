@@ -0,0 +1,20 @@
+import json
+import os.path as osp
+import pytest
+from perfHarness import HARNESS_CASES, DEFAULT_FIXTURE_BOOK, DEFAULT_GOLDEN_FOLDER, BASELINES_FILE, RUNTIME, PEAK_MEM, \
+    case_name, run_case, check_case
+
+
+@pytest.mark.parametrize("upd_class, span", HARNESS_CASES, ids = [case_name(*case) for case in HARNESS_CASES])
+def test_output_matches_the_golden_file(upd_class, span):
+    name = case_name(upd_class, span)
+    output, _, _ = run_case(upd_class, span, DEFAULT_FIXTURE_BOOK, False)
+    # ONLY the output: the runtime and memory baselines belong to the machine that recorded them
+    baselines = {name: {RUNTIME: float("inf"), PEAK_MEM: float("inf")}}
+    assert check_case(name, output, {RUNTIME: 0.0, PEAK_MEM: 0}, DEFAULT_GOLDEN_FOLDER, baselines, 0.0) == []
+
+
+def test_every_case_has_a_baseline():
+    with open(osp.join(DEFAULT_GOLDEN_FOLDER, BASELINES_FILE)) as bfp:
+        baselines = json.load(bfp)
+    assert sorted(baselines) == sorted(case_name(*case) for case in HARNESS_CASES)
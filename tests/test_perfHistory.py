@@ -0,0 +1,63 @@
+import pytest
+import perfHistory
+from perfHistory import PerfHistory, RunTimer, flag_runs, history_main, RUN_OK, RUN_FAILED, OPEN_PHASE, SEND_PHASE
+
+
+def make_run(p_total:float, p_status:str = RUN_OK, p_updater:str = "UpdateRevExps", p_timespan:str = "2024") -> dict:
+    return {"filetime": "D2026-10-19T10-00-00", "updater": p_updater, "timespan": p_timespan, "target": "test",
+            "book": "/books/budget.gnucash", "book_size": 1000, "splits": 50, "quarters": 4, "ranges": 12, "cells": 12,
+            "total": p_total, "status": p_status}
+
+
+@pytest.fixture
+def history(tmp_path) -> PerfHistory:
+    return PerfHistory(str(tmp_path / "store" / "history.db"))
+
+
+def test_phase_entered_twice_adds_up(monkeypatch):
+    now = iter([0.0, 10.0, 12.0, 20.0, 23.0, 30.0])
+    monkeypatch.setattr(perfHistory.time, "perf_counter", lambda: next(now))
+    timer = RunTimer()
+    with timer.phase(OPEN_PHASE):
+        pass
+    with timer.phase(OPEN_PHASE):
+        pass
+    assert timer.phases == {OPEN_PHASE: 5.0}
+    assert timer.total() == 30.0
+
+
+def test_runs_are_read_back_with_their_phases(history):
+    first = history.add_run(make_run(5.0), {OPEN_PHASE: 1.5, SEND_PHASE: 2.5})
+    history.add_run(make_run(6.0, p_updater = "UpdateAssets"), {})
+    runs = history.runs({"updater": "UpdateRevExps"})
+    assert [run["id"] for run in runs] == [first]
+    assert runs[0]["phases"] == {OPEN_PHASE: 1.5, SEND_PHASE: 2.5}
+    assert runs[0]["total"] == 5.0
+    assert len(history.runs({})) == 2
+
+
+def test_baseline_is_the_median_of_the_earlier_successful_runs():
+    runs = [make_run(total) for total in (10.0, 12.0, 11.0)] + [make_run(30.0, RUN_FAILED), make_run(15.0), make_run(11.5)]
+    flagged = flag_runs(runs, p_window = 3)[("UpdateRevExps", "2024", "test", "/books/budget.gnucash")]
+    assert [run["baseline"] for run in flagged] == [None, 10.0, 11.0, 11.0, 11.0, 12.0]
+    # more than 25% AND more than a second slower
+    assert [run["slower"] for run in flagged] == [False, False, False, True, True, False]
+
+
+def test_short_runs_are_not_flagged():
+    flagged = flag_runs([make_run(0.5), make_run(1.2)])
+    assert [run["slower"] for runs in flagged.values() for run in runs] == [False, False]
+
+
+def test_each_updater_and_timespan_has_its_own_baseline():
+    groups = flag_runs([make_run(10.0), make_run(50.0, p_timespan = "2015"), make_run(10.5)])
+    assert [[run["total"] for run in runs] for runs in groups.values()] == [[10.0, 10.5], [50.0]]
+
+
+def test_history_main_counts_the_latest_runs_that_are_slower(history, capsys):
+    for total in (10.0, 10.0, 20.0):
+        history.add_run(make_run(total), {})
+    history.add_run(make_run(10.0, p_updater = "UpdateAssets"), {})
+    assert history_main(["-f", history.file]) == 1
+    assert "1 slower than the baseline" in capsys.readouterr().out
+    assert history_main(["-f", history.file + ".missing"]) == 0
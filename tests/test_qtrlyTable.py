@@ -0,0 +1,42 @@
+from decimal import Decimal
+from qtrlyTable import QuarterlyTable
+
+
+def make_table() -> QuarterlyTable:
+    table = QuarterlyTable()
+    for year, qtr in ((2024, 1), (2024, 2), (2023, 4)):
+        table.add_row(year, qtr)
+    return table
+
+
+def test_add_row_reuses_the_row_of_a_quarter():
+    table = make_table()
+    assert len(table) == 3
+    assert table.add_row(2024, 2) == 1
+    assert len(table) == 3
+
+
+def test_iterates_in_the_order_added():
+    assert list(make_table()) == [(2024, 1, 0), (2024, 2, 1), (2023, 4, 2)]
+
+
+def test_columns_are_filled_with_none():
+    table = make_table()
+    table.set(1, "INV", Decimal("12.50"))
+    assert table.column("INV") == [None, Decimal("12.50"), None]
+    # a row added later is also None in the existing columns
+    row = table.add_row(2023, 3)
+    assert table.get(row, "INV") is None
+    assert table.get(row, "UNKNOWN") is None
+    assert table.metrics() == ["INV"]
+
+
+def test_row_values_only_has_the_metrics_that_are_set():
+    table = make_table()
+    table.set(0, "INV", Decimal("1.10"))
+    table.set(0, "OTH", Decimal("2.20"))
+    table.set(1, "OTH", Decimal("3.30"))
+    assert table.row_values(0) == {"INV": Decimal("1.10"), "OTH": Decimal("2.20")}
+    assert table.row_values(1) == {"OTH": Decimal("3.30")}
+    # in the order of the metrics given
+    assert list(table.row_values(0, ["OTH", "INV", "SAL"])) == ["OTH", "INV"]
@@ -0,0 +1,51 @@
+import os
+from decimal import Decimal
+from runCheckpoint import RunCheckpoint, LATEST_RUN
+from qtrlyTable import QuarterlyTable
+
+PREFIX = "UpdateAssets-2024-Sheet1-budget"
+
+
+def make_run(p_folder, p_name:str, p_mtime:int):
+    run = p_folder / p_name
+    run.mkdir()
+    os.utime(run, (p_mtime, p_mtime))
+
+
+def test_latest_run_of_the_prefix(tmp_path):
+    make_run(tmp_path, f"{PREFIX}_D2024-05-01T10-00-00", 100)
+    make_run(tmp_path, f"{PREFIX}_D2024-05-02T10-00-00", 200)
+    found = RunCheckpoint.find(PREFIX, LATEST_RUN, str(tmp_path))
+    assert found.filetime == "D2024-05-02T10-00-00"
+    assert found.folder == str(tmp_path / f"{PREFIX}_D2024-05-02T10-00-00")
+
+
+def test_runs_of_another_book_with_the_same_start_are_skipped(tmp_path):
+    make_run(tmp_path, f"{PREFIX}_D2024-05-01T10-00-00", 100)
+    # the books 'budget_old' and 'budget' have the same start
+    make_run(tmp_path, f"{PREFIX}_old_D2024-05-02T10-00-00", 200)
+    make_run(tmp_path, f"{PREFIX}_D2024-05-03T10-00-00.bak", 300)
+    assert RunCheckpoint.find(PREFIX, LATEST_RUN, str(tmp_path)).filetime == "D2024-05-01T10-00-00"
+    assert RunCheckpoint.find(PREFIX + "_old", LATEST_RUN, str(tmp_path)).filetime == "D2024-05-02T10-00-00"
+
+
+def test_no_run_to_resume(tmp_path):
+    assert RunCheckpoint.find(PREFIX, LATEST_RUN, str(tmp_path / "missing")) is None
+    assert RunCheckpoint.find(PREFIX, LATEST_RUN, str(tmp_path)) is None
+    assert RunCheckpoint.find(PREFIX, "D2024-05-01T10-00-00", str(tmp_path)) is None
+
+
+def test_saved_year_is_loaded_with_the_same_values(tmp_path):
+    table = QuarterlyTable()
+    for qtr in (1, 2):
+        table.set(table.add_row(2024, qtr), "INV", Decimal(f"{qtr}.10"))
+    table.set(table.add_row(2023, 4), "INV", Decimal("9.99"))
+    checkpoint = RunCheckpoint(PREFIX, "D2024-05-01T10-00-00", str(tmp_path))
+    checkpoint.save_year(2024, table)
+    loaded = QuarterlyTable()
+    assert checkpoint.load_year(2024, loaded)
+    assert not checkpoint.load_year(2023, loaded)
+    assert list(loaded) == [(2024, 1, 0), (2024, 2, 1)]
+    assert loaded.column("INV") == [Decimal("1.10"), Decimal("2.10")]
+    checkpoint.finish()
+    assert RunCheckpoint.find(PREFIX, "D2024-05-01T10-00-00", str(tmp_path)) is None
@@ -0,0 +1,91 @@
+import logging as lg
+import pytest
+import sheetJournal
+
+LGR = lg.getLogger(__name__)
+
+
+def cell(p_range:str, p_value:str) -> dict:
+    return {"range": p_range, "values": [[p_value]]}
+
+
+@pytest.fixture
+def sent(monkeypatch) -> list:
+    """the data of each request sent, with NO network and NO quota waits"""
+    requests = []
+    def update_values(p_data:list, lgr:lg.Logger) -> dict:
+        requests.append(p_data)
+        return {"totalUpdatedCells": len(p_data)}
+    monkeypatch.setattr(sheetJournal, "update_sheets_values", update_values)
+    monkeypatch.setattr(sheetJournal.sheets_quota, "acquire", lambda *args: 0.0)
+    return requests
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return sheetJournal.SheetJournal(str(tmp_path / "journal" / "sheets-journal.db"))
+
+
+def test_pending_keeps_the_latest_write_to_each_range(journal):
+    journal.add_batch([cell("A1", "1"), cell("B1", "2")], "first", LGR)
+    journal.add_batch([cell("A1", "3"), cell("C1", "4"), cell("A1", "5")], "second", LGR)
+    assert [item for item, _ in journal.pending()] == [cell("B1", "2"), cell("C1", "4"), cell("A1", "5")]
+
+
+def test_drain_sends_everything_coalesced(journal, sent):
+    journal.add_batch([cell("A1", "1"), cell("B1", "2")], "first", LGR)
+    journal.add_batch([cell("A1", "3")], "second", LGR)
+    assert journal.drain(LGR) == {"totalUpdatedCells": 2}
+    assert sent == [[cell("B1", "2"), cell("A1", "3")]]
+    assert journal.pending() == []
+    assert journal.status() == []
+    assert journal.drain(LGR) == {}
+
+
+def test_drain_of_a_batch_leaves_the_earlier_backlog(journal, sent):
+    failed = journal.add_batch([cell("A1", "old"), cell("B1", "old")], "failed run", LGR)
+    current = journal.add_batch([cell("A1", "new")], "this run", LGR)
+    journal.drain(LGR, [current])
+    assert sent == [[cell("A1", "new")]]
+    # the old A1 is superseded, the old B1 waits for --replay
+    assert [item for item, _ in journal.pending()] == [cell("B1", "old")]
+    assert [(batch_id, num_pending) for batch_id, _, _, num_pending in journal.status()] == [(failed, 1)]
+
+
+def test_newer_write_of_another_batch_stays_pending(journal, sent):
+    current = journal.add_batch([cell("A1", "mine")], "this run", LGR)
+    journal.add_batch([cell("A1", "parallel")], "parallel run", LGR)
+    journal.drain(LGR, [current])
+    assert [item for item, _ in journal.pending()] == [cell("A1", "parallel")]
+
+
+def test_failed_send_stays_pending(journal, sent, monkeypatch):
+    journal.add_batch([cell("A1", "1"), cell("B1", "2")], "update", LGR)
+    def fail(p_data:list, lgr:lg.Logger) -> dict:
+        raise ConnectionError("network down")
+    monkeypatch.setattr(sheetJournal, "update_sheets_values", fail)
+    with pytest.raises(ConnectionError):
+        journal.drain(LGR)
+    assert [item for item, _ in journal.pending()] == [cell("A1", "1"), cell("B1", "2")]
+    assert [num_pending for _, _, _, num_pending in journal.status()] == [2]
+
+
+def test_failed_chunk_stays_pending(journal, sent, monkeypatch):
+    monkeypatch.setattr(sheetJournal, "CHUNK_SIZE", 2)
+    journal.add_batch([cell(f"A{row}", str(row)) for row in range(1, 6)], "update", LGR)
+    send = sheetJournal.update_sheets_values
+    calls = []
+    def fail_second(p_data:list, lgr:lg.Logger) -> dict:
+        calls.append(p_data)
+        if len(calls) == 2:
+            raise ConnectionError("network down")
+        return send(p_data, lgr)
+    monkeypatch.setattr(sheetJournal, "update_sheets_values", fail_second)
+    with pytest.raises(ConnectionError):
+        journal.drain(LGR)
+    assert [item["range"] for item, _ in journal.pending()] == ["A3", "A4", "A5"]
+    # the next drain resumes at the first unsent chunk
+    response = journal.drain(LGR)
+    assert response["chunks"] == 2
+    assert response["totalUpdatedCells"] == 3
+    assert [[item["range"] for item in data] for data in sent] == [["A1", "A2"], ["A3", "A4"], ["A5"]]
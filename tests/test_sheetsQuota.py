@@ -0,0 +1,87 @@
+import logging as lg
+import pytest
+import sheetsQuota
+from sheetsQuota import SheetsQuota, READ, WRITE
+
+LGR = lg.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, p_seconds:float):
+        self.sleeps.append(p_seconds)
+        self.now += p_seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(sheetsQuota.time, "time", fake.time)
+    monkeypatch.setattr(sheetsQuota.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_full_bucket_does_not_wait(clock):
+    quota = SheetsQuota({READ: 60, WRITE: 6})
+    for _ in range(6):
+        assert quota.acquire(WRITE, LGR) == 0.0
+    assert clock.sleeps == []
+    # the other kind has its own bucket
+    assert quota.acquire(READ, LGR) == 0.0
+
+
+def test_empty_bucket_waits_for_the_refill(clock):
+    quota = SheetsQuota({WRITE: 6})
+    for _ in range(6):
+        quota.acquire(WRITE, LGR)
+    # 6 per minute is one every 10 seconds
+    assert quota.acquire(WRITE, LGR) == pytest.approx(10.0)
+    assert quota.acquire(WRITE, LGR, 2) == pytest.approx(20.0)
+    usage = quota.usage()[WRITE]
+    assert usage["requests"] == 9
+    assert usage["waits"] == 2
+    assert usage["wait_seconds"] == pytest.approx(30.0)
+
+
+def test_refill_is_capped_at_the_limit(clock):
+    quota = SheetsQuota({WRITE: 6})
+    quota.acquire(WRITE, LGR)
+    clock.now += 3600
+    for _ in range(6):
+        quota.acquire(WRITE, LGR)
+    assert clock.sleeps == []
+    assert quota.acquire(WRITE, LGR) > 0.0
+
+
+def test_exhaust_empties_the_bucket(clock):
+    quota = SheetsQuota({WRITE: 60})
+    quota.exhaust(WRITE, LGR)
+    assert quota.acquire(WRITE, LGR) == pytest.approx(1.0)
+    assert quota.usage()[WRITE]["rejected"] == 1
+
+
+def test_used_last_minute_drops_the_old_requests(clock):
+    quota = SheetsQuota({READ: 60})
+    for _ in range(3):
+        quota.acquire(READ, LGR)
+    assert quota.usage()[READ]["used_last_minute"] == 3
+    clock.now += 61
+    assert quota.usage()[READ]["used_last_minute"] == 0
+    assert quota.usage()[READ]["requests"] == 3
+
+
+def test_lock_file_shares_the_buckets(clock, tmp_path):
+    lock_file = str(tmp_path / "quota.lock")
+    first, second = SheetsQuota({WRITE: 6}), SheetsQuota({WRITE: 6})
+    first.use_lock_file(lock_file)
+    second.use_lock_file(lock_file)
+    for _ in range(6):
+        first.acquire(WRITE, LGR)
+    # the other process sees the bucket used up
+    assert second.acquire(WRITE, LGR) == pytest.approx(10.0)
@@ -0,0 +1,88 @@
+import json
+import socket
+import logging as lg
+import httplib2
+import pytest
+import sheetsVcr
+from sheetsVcr import RecordingHttp, ReplayHttp, interaction_key, SPREADSHEET_PLACEHOLDER
+
+LGR = lg.getLogger(__name__)
+
+SHEET_ID = "1AbCdEfG"
+VALUES_URI = f"https://sheets.googleapis.com/v4/spreadsheets/{SHEET_ID}/values:batchUpdate?alt=json"
+READ_URI = f"https://sheets.googleapis.com/v4/spreadsheets/{SHEET_ID}/values/Record%21A1%3AD3?alt=json"
+
+
+class FakeHttp:
+    """answers each request with the next of the responses"""
+    def __init__(self, p_responses:list):
+        self.responses = list(p_responses)
+        self.timeout = 30
+
+    def request(self, uri:str, method:str = "GET", body = None, headers:dict = None, **kwargs):
+        status, content = self.responses.pop(0)
+        return httplib2.Response({"status": status, "content-type": "application/json"}), content.encode("utf-8")
+
+
+def test_interaction_key_ignores_the_host():
+    assert interaction_key("POST", VALUES_URI, b'{"a": 1}') == ("POST", f"/v4/spreadsheets/{SHEET_ID}/values:batchUpdate?alt=json", '{"a": 1}')
+    assert interaction_key("GET", "http://localhost/v4/x", None) == ("GET", "/v4/x", "")
+
+
+def test_recording_hides_the_spreadsheet_id(tmp_path):
+    vcr_file = tmp_path / "vcr" / "sheets-vcr.jsonl"
+    http = RecordingHttp(FakeHttp([(200, json.dumps({"spreadsheetId": SHEET_ID, "totalUpdatedCells": 2}))]), str(vcr_file), SHEET_ID, LGR)
+    resp, content = http.request(VALUES_URI, "POST", body = json.dumps({"id": SHEET_ID}))
+    assert resp.status == 200
+    assert json.loads(content)["spreadsheetId"] == SHEET_ID
+    # the other attributes are those of the real transport
+    assert http.timeout == 30
+
+    interaction = json.loads(vcr_file.read_text())
+    assert SHEET_ID not in json.dumps(interaction)
+    assert interaction["uri"] == f"/v4/spreadsheets/{SPREADSHEET_PLACEHOLDER}/values:batchUpdate?alt=json"
+    assert interaction["status"] == 200
+    assert interaction["headers"] == {"content-type": "application/json"}
+
+
+@pytest.fixture
+def recording(tmp_path) -> str:
+    vcr_file = str(tmp_path / "sheets-vcr.jsonl")
+    http = RecordingHttp(FakeHttp([(200, '{"updates": 1}'), (200, '{"updates": 2}'), (200, '{"values": [["A"]]}')]), vcr_file, SHEET_ID, LGR)
+    http.request(VALUES_URI, "POST", body = '{"v": 1}')
+    http.request(VALUES_URI, "POST", body = '{"v": 2}')
+    http.request(READ_URI)
+    return vcr_file
+
+
+def replay_uri(p_uri:str) -> str:
+    return p_uri.replace(SHEET_ID, SPREADSHEET_PLACEHOLDER)
+
+
+def test_replay_serves_the_recorded_responses_in_order(recording):
+    http = ReplayHttp(recording, LGR)
+    # the same request is answered by its own response
+    assert http.request(replay_uri(VALUES_URI), "POST", body = '{"v": 2}')[1] == b'{"updates": 2}'
+    # a request that was NOT recorded gets the next response to the same uri, then the last one again
+    assert http.request(replay_uri(VALUES_URI), "POST", body = '{"v": 3}')[1] == b'{"updates": 1}'
+    assert http.request(replay_uri(VALUES_URI), "POST", body = '{"v": 4}')[1] == b'{"updates": 2}'
+    assert http.request(replay_uri(VALUES_URI), "POST", body = '{"v": 5}')[1] == b'{"updates": 2}'
+    resp, content = http.request(replay_uri(READ_URI))
+    assert (resp.status, content) == (200, b'{"values": [["A"]]}')
+    assert http.served == 5
+    with pytest.raises(KeyError):
+        http.request(replay_uri(READ_URI), "POST")
+
+
+def test_replay_injects_the_errors(recording):
+    http = ReplayHttp(recording, LGR, p_error_rate = 1.0, p_seed = 7)
+    outcomes = set()
+    for _ in range(40):
+        try:
+            resp, content = http.request(replay_uri(READ_URI))
+            assert json.loads(content)["error"]["code"] == resp.status
+            outcomes.add(resp.status)
+        except socket.timeout:
+            outcomes.add(None)
+    assert outcomes == set(sheetsVcr.INJECTED_ERRORS)
+    assert http.injected == 40
@@ -0,0 +1,155 @@
+import gzip
+import logging as lg
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+import sheetsClient
+import updateBudget
+from bookCache import book_cache
+from sheetsQuota import sheets_quota
+from updateBudget import get_periods, open_gnucash_session, configure_process, set_args, UpdateBudget, RecordBatch, ALL_QUARTERS
+
+LGR = lg.getLogger(__name__)
+
+
+@pytest.fixture
+def today(monkeypatch):
+    monkeypatch.setattr(updateBudget, "now_dt", datetime(2026, 2, 10, 9, 30))
+
+
+@pytest.mark.parametrize("timespan, periods", [
+    ("2023", {"2023": ALL_QUARTERS}),
+    ("2024Q3", {"2024": [3]}),
+    ("2024q3", {"2024": [3]}),
+    ("2023Q2..2024Q1", {"2024": [1], "2023": [2, 3, 4]}),
+    ("2024Q1..2023Q2", {"2024": [1], "2023": [2, 3, 4]}),
+    ("2022Q4..2024Q1", {"2024": [1], "2023": ALL_QUARTERS, "2022": [4]}),
+])
+def test_get_periods(timespan:str, periods:dict):
+    result = get_periods(timespan, None, LGR)
+    assert result == periods
+    # the latest year first
+    assert list(result) == list(periods)
+
+
+def test_get_periods_of_the_latest_quarters(today):
+    assert get_periods("last-1-quarter", None, LGR) == {"2026": [1]}
+    assert get_periods("last-2-quarters", None, LGR) == {"2026": [1], "2025": [4]}
+    assert get_periods("last-6-quarters", None, LGR) == {"2026": [1], "2025": ALL_QUARTERS, "2024": [4]}
+
+
+def test_get_periods_with_a_quarter():
+    assert get_periods("2023Q2..2024Q1", "1", LGR) == {"2024": [1]}
+    assert get_periods("2023", "2", LGR) == {"2023": [2]}
+    with pytest.raises(Exception, match = "NOT in timespan"):
+        get_periods("2024Q3", "1", LGR)
+
+
+def test_get_periods_of_an_invalid_timespan():
+    for timespan in ("2024Q5", "1999Q1", "2023Q1..2023Q2..2023Q3", "last-quarters", "soon"):
+        assert get_periods(timespan, None, LGR) == {updateBudget.UPDATE_YEARS[0]: ALL_QUARTERS}
+
+
+COLS = {"REV": 'B', "INV": 'C', "NEC": 'D', "DEDNS": 'E'}
+CELLS = {"REV": ["SAL", "OTHER", "NEWS"], "INV": [], "NEC": ["NECESSARY", "NEW CAR"], "DEDNS": ["CPP", "EI"]}
+
+
+def select(p_only:list | None, p_updater:SimpleNamespace = None) -> list:
+    updater = p_updater or SimpleNamespace(only = p_only, _lgr = LGR, _log_listener = None)
+    return UpdateBudget.select_cells(updater, COLS, CELLS)
+
+
+@pytest.mark.parametrize("only, cells", [
+    (None, ["REV", "INV", "NEC", "DEDNS"]),
+    (["inv"], ["INV"]),
+    # an account summed in a cell selects the whole cell
+    (["ei"], ["DEDNS"]),
+    (["D"], ["NEC"]),
+    # the start of ONE key
+    (["NECES"], ["NEC"]),
+    (["OTH"], ["REV"]),
+    # in the order of the cells
+    (["DEDNS", "C", "SAL"], ["REV", "INV", "DEDNS"]),
+])
+def test_select_cells(only:list, cells:list):
+    assert select(only) == cells
+
+
+def test_select_cells_rejects_an_unknown_or_ambiguous_name():
+    with pytest.raises(Exception, match = "NOT an account"):
+        select(["XYZ"])
+    # too short to be the start of a key
+    with pytest.raises(Exception, match = "NOT an account"):
+        select(["OT"])
+    with pytest.raises(Exception, match = "could be ANY of"):
+        select(["NEW"])
+
+
+def test_select_cells_stops_the_log_listener_on_an_error():
+    lgr = lg.getLogger(f"{__name__}.listener")
+    handler = lg.NullHandler()
+    lgr.addHandler(handler)
+    updater = SimpleNamespace(only = ["XYZ"], _lgr = lgr, _log_listener = updateBudget.start_log_queue(lgr))
+    try:
+        with pytest.raises(Exception, match = "NOT an account"):
+            select(None, updater)
+        assert updater._log_listener is None
+        # the handlers are back on the logger
+        assert lgr.handlers == [handler]
+    finally:
+        lgr.removeHandler(handler)
+
+
+
+@pytest.fixture
+def sheet(monkeypatch) -> SimpleNamespace:
+    """the Record sheet: the next row the append finds, and the appended rows and moves sent"""
+    record = SimpleNamespace(next_row = 1, appended = [], moved = [])
+    monkeypatch.setattr(updateBudget.sheets_quota, "acquire", lambda p_kind, lgr: None)
+    def append(p_range:str, p_rows:list, lgr) -> dict:
+        record.appended.append(p_rows)
+        first, record.next_row = record.next_row, record.next_row + len(p_rows)
+        return {"updates": {"updatedRange": f"Record!A{first}:D{record.next_row - 1}"}}
+    monkeypatch.setattr(updateBudget, "append_sheets_rows", append)
+    monkeypatch.setattr(updateBudget, "update_sheets_values", lambda p_data, lgr: record.moved.append(p_data) or {})
+    return record
+
+
+def test_record_rows_skip_the_header_rows(sheet):
+    sheet.next_row = 47
+    batch = RecordBatch()
+    with batch.deferred(LGR):
+        for num in range(5):
+            batch.add([f"row{num}"] * 4, LGR)
+    assert sheet.appended == [[[f"row{num}"] * 4 for num in range(5)]]
+    assert sheet.moved == [[{"range": "'Record'!A50:D50", "values": [["", "", "", ""]]},
+                            {"range": "'Record'!A51:D51", "values": [["row3"] * 4]},
+                            {"range": "'Record'!A52:D52", "values": [["row4"] * 4]}]]
+    sheet.next_row = 99
+    batch.add(["row5"] * 4, LGR)
+    assert len(sheet.moved) == 1
+    batch.add(["row6"] * 4, LGR)
+    assert sheet.moved[1] == [{"range": "'Record'!A100:D100", "values": [[f"='Record'!{col}50" for col in "ABCD"]]},
+                              {"range": "'Record'!A101:D101", "values": [["row6"] * 4]}]
+
+
+def test_configure_process_sets_every_option(tmp_path):
+    args = ["-g", "book.gnucash", "-m", "test", "-t", "2024"]
+    configure_process(set_args().parse_args(args + ["--vcr", "replay", "--quota_file", str(tmp_path / "quota.lock"), "--no_book_cache"]))
+    assert sheetsClient._vcr["mode"] == "replay"
+    assert sheets_quota._lock_file and book_cache._folder is None
+    # a later run without the options leaves nothing over
+    configure_process(set_args().parse_args(args))
+    assert sheetsClient._vcr == {}
+    assert sheets_quota._lock_file is None and book_cache._folder
+
+
+def test_gzipped_xml_book_is_streamed_without_the_cache(tmp_path, monkeypatch):
+    book = tmp_path / "book.gnucash"
+    with gzip.open(book, "wb") as gfp:
+        gfp.write(b"<?xml version='1.0'?>\n<gnc-v2/>\n")
+    cached = []
+    monkeypatch.setattr(book_cache, "get_book", lambda p_book, lgr: cached.append(p_book) or p_book)
+    session = open_gnucash_session("test", str(book), "auto", None, LGR)
+    assert isinstance(session, updateBudget.GnucashXmlSession)
+    assert cached == []
@@ -9,7 +9,7 @@ __author__         = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
 __python_version__ = "3.10+"
 __created__ = "2019-04-06"
-__updated__ = "2025-08-01"
+__updated__ = "2026-10-19"
 
 from updateBudget import *
 
@@ -77,19 +77,41 @@ ASSET_COLS = {
     CAR   : 'R'
 }
 
+# Assets sheet in each copy of the document
+ASSETS_DESTS = {
+    '1' : QTR_ASTS_SHEET ,
+    '2' : QTR_ASTS_2_SHEET
+}
+
 
 class UpdateAssets(UpdateBudget):
     """Take data from a Gnucash file and update an Assets tab of my Google Budget-Quarterly document."""
-    def __init__(self, args:list, p_logname:str):
-        super().__init__(args, p_logname)
+    refresh_only = True
+
+    def __init__(self, args:list, p_logname:str, p_pool:SessionPool = None):
+        super().__init__(args, p_logname, p_pool)
+
+        # asset accounts to refresh: ALL of them unless --only
+        self.items = self.select_cells(ASSET_COLS, {item: [] for item in ASSET_ACCTS | ASSET_ACCTS_CURRENT})
+        self._lgr.debug(f"items = {self.items}")
+
+        # Google sheets to update or just testing
+        self.dests = [self.target]
+        if SHEET in self.target:
+            self.dests = [ASSETS_DESTS[num] for num in self.get_sheet_numbers()]
+        self._lgr.debug(f"dests = {self.dests}")
 
-        # Google sheet to update or just testing
-        self.dest = self.target
-        if '1' in self.target:
-            self.dest = QTR_ASTS_SHEET
-        elif '2' in self.target:
-            self.dest = QTR_ASTS_2_SHEET
-        self._lgr.debug(f"dest = {self.dest}")
+    def get_account_paths(self) -> list:
+        return [path for item, path in list(ASSET_ACCTS.items()) + list(ASSET_ACCTS_CURRENT.items()) if item in self.items]
+
+    @staticmethod
+    def get_asset_accounts(p_year:int) -> dict:
+        # had slightly different accounts before 2019
+        if p_year < 2019:
+            return ASSET_ACCTS
+        if p_year > 2023:
+            return ASSET_ACCTS_CURRENT
+        return ASSET_ACCTS_NEW
 
     def fill_gnucash_data(self, p_session:GnucashSession, p_qtr:int, p_year:str):
         """
@@ -98,24 +120,25 @@ class UpdateAssets(UpdateBudget):
         :param       p_qtr: 1..4 for quarter to update
         :param      p_year: year to update
         """
-        self._lgr.debug(f"find Assets in {p_session.get_file_name()} for {p_year}-Q{p_qtr}")
+        self._lgr.debug("find Assets in %s for %s-Q%d", p_session.get_file_name(), p_year, p_qtr)
         start_month = (p_qtr * 3) - 2
         int_year = get_int_year( p_year, ASSETS_DATA[BASE_YEAR] )
         end_date = current_quarter_end(int_year, start_month)
 
-        data_qtr = {}
-        asset_accounts = ASSET_ACCTS_NEW
-        # had slightly different accounts before 2019
-        if int_year < 2019:
-            asset_accounts = ASSET_ACCTS
-        elif int_year > 2023:
-            asset_accounts = ASSET_ACCTS_CURRENT
-        p_session.get_account_assets(asset_accounts, end_date, p_data=data_qtr)
-        data_qtr[YR] = p_year
-        data_qtr[QTR] = str(p_qtr)
+        accounts = {item: path for item, path in self.get_asset_accounts(int_year).items() if item in self.items}
+        row = self._gnucash_data.add_row(int_year, p_qtr)
+        # the Gnucash bindings session fills p_data and does NOT return it
+        assets = {}
+        p_session.get_account_assets(accounts, end_date, p_data = assets)
+        for item, value in assets.items():
+            self._gnucash_data.set(row, item, Decimal(value))
+
+        self.debug_json(self.format_quarter(row))
 
-        self._gnucash_data.append(data_qtr)
-        self._lgr.debug(json.dumps(data_qtr, indent = 4))
+    def format_quarter(self, p_row:int) -> dict:
+        """In the order of the asset accounts for the year of the row."""
+        accounts = self.get_asset_accounts(self._gnucash_data.years[p_row])
+        return {item: str(value) for item, value in self._gnucash_data.row_values(p_row, list(accounts)).items()}
 
     def fill_google_data(self, p_years:list):
         """
@@ -123,26 +146,24 @@ class UpdateAssets(UpdateBudget):
         :param p_years: timespan to update
         """
         self._lgr.info(f"timespan = {p_years}\n")
-        # get the row from Year and Quarter value in each item
-        for item in self._gnucash_data:
-            target_year = get_int_year( item[YR], ASSETS_DATA[BASE_YEAR] )
+        # get the row from Year and Quarter of each row
+        for target_year, target_qtr, row in self._gnucash_data:
             year_row = ASSETS_DATA[BASE_ROW] + year_span( target_year, ASSETS_DATA[BASE_YEAR], ASSETS_DATA[YEAR_SPAN], ASSETS_DATA[HDR_SPAN] )
-            int_qtr = int(item[QTR])
-            dest_row = year_row + ( (int_qtr - 1) * ASSETS_DATA[QTR_SPAN] )
-            self._lgr.info(f"{item[YR]}-Q{item[QTR]} dest row = {dest_row}\n")
-            for key in item:
-                if key not in (QTR,YR):
-                    # FOR YEAR 2015 OR EARLIER: GET RESP INSTEAD OF Rewards for COLUMN O
-                    if key == RESP and target_year > 2015:
-                        continue
-                    if key == REW and target_year < 2016:
-                        continue
-                    self._ggl_update.fill_cell(self.dest, ASSET_COLS[key], dest_row, item[key])
+            dest_row = year_row + ( (target_qtr - 1) * ASSETS_DATA[QTR_SPAN] )
+            self._lgr.info("%d-Q%d dest row = %d\n", target_year, target_qtr, dest_row)
+            for key, value in self.format_quarter(row).items():
+                # FOR YEAR 2015 OR EARLIER: GET RESP INSTEAD OF Rewards for COLUMN O
+                if key == RESP and target_year > 2015:
+                    continue
+                if key == REW and target_year < 2016:
+                    continue
+                for dest in self.dests:
+                    self._ggl_update.fill_cell(dest, ASSET_COLS[key], dest_row, value)
 # END class UpdateAssets
 
 
-def update_assets_main(args:list) -> dict:
-    assets = UpdateAssets(args, get_base_filename(__file__))
+def update_assets_main(args:list, p_pool:SessionPool = None) -> dict:
+    assets = UpdateAssets(args, get_base_filename(__file__), p_pool)
     return assets.go("Assets")
 
 
@@ -10,7 +10,7 @@ __author__         = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
 __python_version__ = "3.10+"
 __created__ = "2019-04-13"
-__updated__ = "2025-08-01"
+__updated__ = "2026-10-19"
 
 from updateAssets import ASSETS_DATA, ASSET_COLS
 from updateBudget import *
@@ -69,34 +69,55 @@ BAL_TODAY_RANGES = {
     FAM   : BASE_TOTAL_WORTH_ROW + 7
 }
 
+# Balance sheet in each copy of the document
+BALANCE_DESTS = {
+    '1' : BAL_1_SHEET ,
+    '2' : BAL_2_SHEET
+}
+
 
 class UpdateBalance(UpdateBudget):
     """Take data from a Gnucash file and update a Balance tab of my Google Budget-Quarterly document."""
-    def __init__(self, args:list, p_logname:str):
-        super().__init__(args, p_logname)
+    # NO Gnucash data to keep: the balances are read while filling the Google data
+    use_checkpoints = False
 
-        # Google sheet to update
-        self.dest = BAL_2_SHEET
-        if '1' in self.target:
-            self.dest = BAL_1_SHEET
-        self._lgr.debug(f"dest = {self.dest}")
+    def __init__(self, args:list, p_logname:str, p_pool:SessionPool = None):
+        super().__init__(args, p_logname, p_pool)
+
+        # Google sheets to update, with the number of the copy of the document
+        self.dests = [(num, BALANCE_DESTS[num]) for num in self.get_sheet_numbers()]
+        self._lgr.debug(f"dests = {self.dests}")
 
         self._gnc_session = None
+        # balances of the Balance accounts on the day before today, for the local store
+        self._today = {}
 
         # NO saved gnc data for Balance
         self.save_gnc = False
 
+    def get_account_paths(self) -> list:
+        return list(BALANCE_ACCTS.values())
+
     def get_balance(self, bal_path:list, p_date:date) -> Decimal:
         return self._gnc_session.get_total_balance(bal_path, p_date)
 
+    def get_balances(self, p_items:list, p_date:date) -> dict:
+        """Total balances of the Balance accounts, from a single rollup of their trees if the session can do it."""
+        if isinstance(self._gnc_session, GnucashLiteSession):
+            totals = self._gnc_session.get_total_balances([BALANCE_ACCTS[item] for item in p_items], p_date)
+            return {item: totals[tuple(BALANCE_ACCTS[item])] for item in p_items}
+        return {item: self.get_balance(BALANCE_ACCTS[item], p_date) for item in p_items}
+
     def fill_today(self):
         """Get Balance data for TODAY: LIAB, House, FAMILY, CHALET, TRUST."""
-        self._lgr.debug(get_current_time())
+        self.debug_time()
         # calls using 'today' ARE NOT off by one day??
         tdate = now_dt - ONE_DAY
+        balances = self.get_balances(list(BALANCE_ACCTS), tdate)
+        self._today = {"day": tdate, "balances": balances}
         asset_sums = {}
         for item in BALANCE_ACCTS:
-            acct_sum = self.get_balance(BALANCE_ACCTS[item], tdate)
+            acct_sum = balances[item]
             if item == TRUST:
                 self.fill_google_cell(BAL_MTHLY_COLS[TODAY], BAL_TODAY_RANGES[item], acct_sum)
             elif item == CHAL:
@@ -105,9 +126,8 @@ class UpdateBalance(UpdateBudget):
                 self.fill_google_cell(BAL_MTHLY_COLS[TODAY], BAL_TODAY_RANGES[item], acct_sum)
             elif item == LIAB:
                 # return a string with the individual amounts
-                liab_sum = f"= {str(self.get_balance(BALANCE_ACCTS[CC], tdate))} + {str(self.get_balance(BALANCE_ACCTS[KIA], tdate))}" \
-                           f" + {str(self.get_balance(BALANCE_ACCTS[SLINE], tdate))}"
-                self._lgr.info(f"liab sum = '{liab_sum}'")
+                liab_sum = f"= {str(balances[CC])} + {str(balances[KIA])} + {str(balances[SLINE])}"
+                self._lgr.info("liab sum = '%s'", liab_sum)
                 self.fill_google_cell(BAL_MTHLY_COLS[TODAY], BAL_TODAY_RANGES[item], liab_sum)
             else:
                 # need family assets EXCLUDING the previous items, which are reported separately
@@ -116,76 +136,88 @@ class UpdateBalance(UpdateBudget):
         # report as a string with the individual amounts
         family_sum = f"= {str(asset_sums[INVEST])} + {str(asset_sums[LIQ])} + {str(asset_sums[LOAN])} + {str(asset_sums[REW])}" \
                      f" + {str(asset_sums[PM])} + {str(asset_sums[CAR])}"
-        self._lgr.info(f"Adjusted assets on {now_dt} = '{family_sum}'")
+        self._lgr.info("Adjusted assets on %s = '%s'", now_dt, family_sum)
         self.fill_google_cell(BAL_MTHLY_COLS[TODAY], BAL_TODAY_RANGES[FAM], family_sum)
 
-    def fill_current_year(self):
+    def fill_current_year(self, p_quarters:list = ALL_QUARTERS):
         """
         CURRENT YEAR: fill_today() AND:
           LIABS for ALL completed month_ends
           FAMILY assets for ALL 'non-div-3' completed month_ends in year
           reference to Assets sheet for 'div-3' months (MAR,JUN,SEP,DEC)
+        :param p_quarters: ONLY the months in these quarters -- and today ONLY if in the current quarter
         """
-        self.fill_today()
-        self._lgr.debug(get_current_time())
+        if month_quarter(now_dt.month) in p_quarters:
+            self.fill_today()
+        self.debug_time()
 
         for i in range(now_dt.month - 1):
             month_end = date(now_dt.year, i + 2, 1) - ONE_DAY
-            self._lgr.debug(f"month_end = {month_end}")
+            if month_quarter(month_end.month) not in p_quarters:
+                continue
+            self._lgr.debug("month_end = %s", month_end)
 
             row = BASE_MTHLY_ROW + month_end.month
             # fill LIABS
-            liab_sum = self.get_balance(BALANCE_ACCTS[LIAB], month_end)
+            balances = self.get_balances([LIAB, FAM] if month_end.month % 3 != 0 else [LIAB], month_end)
+            liab_sum = balances[LIAB]
             self.fill_google_cell(BAL_MTHLY_COLS[LIAB][MTH], row, liab_sum)
 
             # fill ASSETS for months NOT covered by the Assets sheet
             if month_end.month % 3 != 0:
-                acct_sum = self.get_balance(BALANCE_ACCTS[FAM], month_end)
+                acct_sum = balances[FAM]
                 adjusted_assets = acct_sum - liab_sum
-                self._lgr.debug(f"Adjusted assets on {month_end} = {adjusted_assets.to_eng_string()}")
+                self._lgr.debug("Adjusted assets on %s = %s", month_end, adjusted_assets)
                 self.fill_google_cell(BAL_MTHLY_COLS[FAM], row, adjusted_assets)
             else:
                 self._lgr.debug("Update reference to Assets sheet for Mar, June, Sep or Dec")
                 # have to update the CELL REFERENCE to current year/qtr ASSETS
                 year_row = ASSETS_DATA[BASE_ROW] + year_span( now_dt.year, ASSETS_DATA[BASE_YEAR], ASSETS_DATA[YEAR_SPAN], ASSETS_DATA[HDR_SPAN], self._lgr )
                 int_qtr = (month_end.month // 3) - 1
-                self._lgr.debug(f"int_qtr = {int_qtr}")
+                self._lgr.debug("int_qtr = %d", int_qtr)
                 dest_row = year_row + (int_qtr * ASSETS_DATA.get(QTR_SPAN))
-                val_num = '1' if '1' in self.dest else '2'
-                value = "='Assets " + val_num + "'!" + ASSET_COLS[TOTAL] + str(dest_row)
-                self.fill_google_cell(BAL_MTHLY_COLS[FAM], row, value)
+                # refer to the Assets sheet in the SAME copy of the document
+                for val_num, dest in self.dests:
+                    value = "='Assets " + val_num + "'!" + ASSET_COLS[TOTAL] + str(dest_row)
+                    self._ggl_update.fill_cell(dest, BAL_MTHLY_COLS[FAM], row, value)
 
             # fill DATE for month column
             self.fill_google_cell(BAL_MTHLY_COLS[MTH], row, str(month_end))
 
-    def fill_previous_year(self):
+    def fill_previous_year(self, p_quarters:list = ALL_QUARTERS):
         """
         PREVIOUS YEAR:
           LIABS for ALL NON-completed months;
           FAMILY assets for ALL 'non-div-3' NON-completed months in year
+        :param p_quarters: ONLY the months in these quarters -- and the year end ONLY if Q4
         """
-        self._lgr.debug(get_current_time())
+        self.debug_time()
 
         year = now_dt.year - 1
         for mth in range(12 - now_dt.month):
             dte = date(year, mth + now_dt.month + 1, 1) - ONE_DAY
-            self._lgr.debug(f"date = {dte}")
+            if month_quarter(dte.month) not in p_quarters:
+                continue
+            self._lgr.debug("date = %s", dte)
 
             row = BASE_MTHLY_ROW + dte.month
             # fill LIABS
-            liab_sum = self.get_balance(BALANCE_ACCTS[LIAB], dte)
+            balances = self.get_balances([LIAB, FAM] if dte.month % 3 != 0 else [LIAB], dte)
+            liab_sum = balances[LIAB]
             self.fill_google_cell(BAL_MTHLY_COLS[LIAB][MTH], row, liab_sum)
 
             # fill ASSETS for months NOT covered by the Assets sheet
             if dte.month % 3 != 0:
-                acct_sum = self.get_balance(BALANCE_ACCTS[FAM], dte)
+                acct_sum = balances[FAM]
                 adjusted_assets = acct_sum - liab_sum
-                self._lgr.debug(f"Adjusted assets on {dte} = ${adjusted_assets.to_eng_string()}")
+                self._lgr.debug("Adjusted assets on %s = $%s", dte, adjusted_assets)
                 self.fill_google_cell(BAL_MTHLY_COLS[FAM], row, adjusted_assets)
 
             # fill the date in Month column
             self.fill_google_cell(BAL_MTHLY_COLS[MTH], row, str(dte))
 
+        if 4 not in p_quarters:
+            return
         year_end = date(year, 12, 31)
         row = BASE_MTHLY_ROW + 12
         # fill the year-end date in Month column
@@ -200,19 +232,28 @@ class UpdateBalance(UpdateBudget):
 
     def fill_year_end_liabs(self, year:int):
         year_end = date(year, 12, 31)
-        self._lgr.debug(f"year_end = {year_end}")
+        self._lgr.debug("year_end = %s", year_end)
 
         # fill LIABS
         liab_sum = self.get_balance(BALANCE_ACCTS[LIAB], year_end)
         yr_span = year_span( year, BALANCE_DATA[BASE_YEAR], BALANCE_DATA[YEAR_SPAN], BALANCE_DATA[HDR_SPAN] )
         self.fill_google_cell( BAL_MTHLY_COLS[LIAB][YR], BALANCE_DATA[BASE_ROW] + yr_span, str(liab_sum) )
 
+    def store_figures(self):
+        """Today's balances ONLY come with a run of the current quarter, but the time of the run is ALWAYS stored."""
+        if self._today:
+            self.figures_store.store_today(self._gnucash_file, self.__class__.__name__, self._today["day"], self._today["balances"])
+            self._lgr.info(f"stored {len(self._today['balances'])} balances in '{self.figures_store.file}'")
+        else:
+            self.figures_store.store_source(self._gnucash_file, self.__class__.__name__)
+
     def fill_gnucash_data(self, p_session:GnucashSession, p_qtr:int, p_year:str):
         """Not needed for updating Balance"""
         self._gnc_session = p_session
 
     def fill_google_cell(self, p_col:str, p_row:int, p_val:FILL_CELL_VAL):
-        self._ggl_update.fill_cell(self.dest, p_col, p_row, p_val)
+        for _, dest in self.dests:
+            self._ggl_update.fill_cell(dest, p_col, p_row, p_val)
 
     def fill_google_data(self, p_years:list):
         """
@@ -224,20 +265,23 @@ class UpdateBalance(UpdateBudget):
             IF PREVIOUS YEAR:
               LIABS for ALL NON-completed months
               FAMILY assets for ALL non-div-3 NON-completed months in year
+            IF EARLIER YEAR:
+              LIABS at year end, ONLY if Q4 is in the timespan
         """
         for yr in p_years:
             year = get_int_year( yr, BALANCE_DATA[BASE_YEAR] )
+            quarters = self.get_quarters(yr)
             if year == now_dt.year:
-                self.fill_current_year()
+                self.fill_current_year(quarters)
             elif now_dt.year - 1 == year:
-                self.fill_previous_year()
-            else:
+                self.fill_previous_year(quarters)
+            elif 4 in quarters:
                 self.fill_year_end_liabs(year)
 # END class UpdateBalance
 
 
-def update_balance_main(args:list) -> dict:
-    balance = UpdateBalance(args, get_base_filename(__file__))
+def update_balance_main(args:list, p_pool:SessionPool = None) -> dict:
+    balance = UpdateBalance(args, get_base_filename(__file__), p_pool)
     return balance.go("Balance")
 
 
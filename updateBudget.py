@@ -9,11 +9,16 @@ __author_name__    = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
 __python_version__ = "3.10+"
 __created__ = "2020-03-31"
-__updated__ = "2025-08-01"
+__updated__ = "2026-10-19"
 
+import re
 from sys import path, argv
 from abc import ABC, abstractmethod
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from decimal import Decimal
+from queue import SimpleQueue
+from logging.handlers import QueueHandler, QueueListener
 path.append("/home/marksa/git/Python/utils")
 from mhsUtils import *
 from mhsLogging import *
@@ -21,6 +26,21 @@ path.append("/home/marksa/git/Python/gnucash/common")
 from gncUtils import *
 path.append("/home/marksa/git/Python/google/sheets")
 from sheetAccess import *
+from sheetsClient import append_sheets_rows, update_sheets_values, read_sheets_values, use_vcr, vcr_usage
+from sheetsVcr import VCR_MODES, DEFAULT_VCR_FILE
+from sheetJournal import SheetJournal
+from sheetsQuota import sheets_quota, WRITE
+from runProfiler import RunProfiler
+from gncLiteSession import GnucashLiteSession
+from gncSqlSession import GnucashSqlSession, is_sqlite_book
+from gncXmlSession import GnucashXmlSession, is_xml_book
+from qtrlyTable import QuarterlyTable
+from runCheckpoint import RunCheckpoint, LATEST_RUN
+from figuresStore import FiguresStore, STORE_FILE
+from bookCache import book_cache, DEFAULT_CACHE_FOLDER
+from artefacts import artefact_writer, SAVE_FORMATS, JSON as JSON_FORMAT
+from perfHistory import PerfHistory, RunTimer, HISTORY_FILE, RUN_OK, RUN_FAILED, OPEN_PHASE, EXTRACT_PHASE, \
+                        GOOGLE_PHASE, STORE_PHASE, JOURNAL_PHASE, SEND_PHASE
 
 TARGET:str = "Target"
 UPDATE_YEARS:list = [str(y) for y in range(get_current_year(), 2007, -1)]
@@ -36,31 +56,308 @@ UPDATE_INTERVAL = {
     RECENT_YRS  : UPDATE_YEARS[:4],
     CURRENT_YRS : UPDATE_YEARS[:2]
 }
+# a quarter as '2024Q3', a range of quarters as '2023Q2..2025Q1', or the latest quarters up to the current one as 'last-2-quarters'
+QTR_SEP:str   = 'Q'
+RANGE_SEP:str = ".."
+LAST_QTRS_PATTERN = re.compile(r"last-(\d+)-quarters?")
+LAST_QTR:str    = "last-1-quarter"
+LAST_2_QTRS:str = "last-2-quarters"
+ALL_QUARTERS = [1, 2, 3, 4]
 
 SHEET_1:str   = f"{SHEET}1"
 SHEET_2:str   = f"{SHEET}2"
+# extract once and update BOTH copies of the document
+SHEET_BOTH:str = f"{SHEET}1+2"
 BASE_YEAR:str = BASE + YR
 YEAR_SPAN:str = BASE_YEAR + SPAN
 QTR_SPAN:str  = QTR + SPAN
 HDR_SPAN:str  = f"Header{SPAN}"
 
 RECORD_SHEET:str    = "Record"
-RECORD_RANGE:str    = f"'{RECORD_SHEET}'!A1"
 RECORD_DATE_COL:str = 'A'
 RECORD_TIME_COL:str = 'B'
 RECORD_GNC_COL:str  = 'C'
 RECORD_INFO_COL:str = 'D'
+# a header row every RECORD_HDR_SPAN rows of the Record sheet
 RECORD_HDR_SPAN:int = 50
+RECORD_COLS = [RECORD_DATE_COL, RECORD_TIME_COL, RECORD_GNC_COL, RECORD_INFO_COL]
+RECORD_ROW_PATTERN = re.compile(r"![A-Z]+(\d+)")
+# the header rows already in the Record sheet are part of the table, so appended rows land after them
+RECORD_APPEND_RANGE:str = f"'{RECORD_SHEET}'!{RECORD_DATE_COL}:{RECORD_INFO_COL}"
 
 DEFAULT_LOG_SUFFIX = "gncout"
 
+# how to read the Gnucash file
+AUTO_BACKEND:str     = "auto"
+BINDINGS_BACKEND:str = "bindings"
+SQL_BACKEND:str      = "sql"
+XML_BACKEND:str      = "xml"
+GNC_BACKENDS = [AUTO_BACKEND, BINDINGS_BACKEND, SQL_BACKEND, XML_BACKEND]
+PROFILE:str = "Profile"
+QUOTA:str   = "Quota"
+VCR:str     = "VCR"
+JOURNAL_BATCH:str = "journal_batch"
+# shortest start of a key accepted by --only
+MIN_KEY_START:int = 3
+# the options that set the state shared by ALL the updaters in a process
+PROCESS_OPTIONS = ["book_cache", "no_book_cache", "quota_file", "vcr", "vcr_file", "vcr_latency", "vcr_errors"]
+
+
 def get_timespan(timespan:str, lgr:lg.Logger) -> list:
-    if timespan in UPDATE_INTERVAL.keys():
-        return UPDATE_INTERVAL[timespan]
-    if timespan in UPDATE_YEARS:
-        return [timespan]
-    lgr.warning(f"INVALID YEAR: {timespan}")
-    return [UPDATE_YEARS[0]]
+    """:return: the years of the timespan, latest first -- the quarters of each year are given by get_periods()"""
+    return list(get_periods(timespan, None, lgr))
+
+
+def month_quarter(p_month:int) -> int:
+    return (p_month + 2) // 3
+
+
+def quarter_index(p_year:int, p_qtr:int) -> int:
+    """Consecutive quarters have consecutive indices."""
+    return p_year * 4 + p_qtr - 1
+
+
+def parse_quarter(p_text:str) -> int | None:
+    """:return: index of a quarter as '2024Q3' in the update years, or None"""
+    year, sep, qtr = p_text.strip().upper().partition(QTR_SEP)
+    if not sep or year not in UPDATE_YEARS or qtr not in ("1", "2", "3", "4"):
+        return None
+    return quarter_index(int(year), int(qtr))
+
+
+def get_periods(timespan:str, p_qtr:str | None, lgr:lg.Logger) -> dict:
+    """
+    :param timespan: a year or group of years, a quarter, a range of quarters, or the latest quarters
+    :param    p_qtr: ONLY this quarter of each year, if set
+    :return: year -> its quarters to update, the latest year first
+    """
+    if timespan in UPDATE_INTERVAL.keys() or timespan in UPDATE_YEARS:
+        periods = {year: ALL_QUARTERS for year in UPDATE_INTERVAL.get(timespan, [timespan])}
+    else:
+        indices = None
+        last = LAST_QTRS_PATTERN.fullmatch(timespan)
+        if last:
+            current = quarter_index(now_dt.year, month_quarter(now_dt.month))
+            first = max(current - int(last.group(1)) + 1, quarter_index(int(BASE_UPDATE_YEAR), 1))
+            indices = range(first, current + 1)
+        else:
+            ends = [parse_quarter(end) for end in timespan.split(RANGE_SEP)]
+            if len(ends) <= 2 and None not in ends:
+                indices = range(min(ends), max(ends) + 1)
+        if not indices:
+            lgr.warning(f"INVALID TIMESPAN: {timespan}")
+            periods = {UPDATE_YEARS[0]: ALL_QUARTERS}
+        else:
+            periods = {}
+            for indx in reversed(indices):
+                periods.setdefault(str(indx // 4), []).insert(0, indx % 4 + 1)
+
+    if p_qtr:
+        periods = {year: [int(p_qtr)] for year, qtrs in periods.items() if int(p_qtr) in qtrs}
+        if not periods:
+            raise Exception(f"Quarter {p_qtr} is NOT in timespan '{timespan}'! Exiting...")
+    return periods
+
+
+def open_gnucash_session(p_mode:str, p_gncfile:str, p_backend:str, p_paths:list, lgr:lg.Logger):
+    """
+    Get a session for the Gnucash file
+    :param    p_mode: target of the update
+    :param p_gncfile: path to the Gnucash file
+    :param p_backend: AUTO reads a SQLite book with SQL and an XML book with the streaming reader, instead of the Gnucash bindings
+    :param   p_paths: account paths needed by the updater, or None for ALL -- the streaming reader keeps ONLY their splits
+    :param       lgr: logger to use
+    """
+    if p_backend == SQL_BACKEND or (p_backend == AUTO_BACKEND and is_sqlite_book(p_gncfile)):
+        lgr.info("use the SQL session")
+        return GnucashSqlSession(p_mode, p_gncfile, BOTH, lgr)
+    if p_backend == XML_BACKEND or (p_backend == AUTO_BACKEND and is_xml_book(p_gncfile)):
+        # a gzipped book is inflated as it streams, so it is NOT copied to the cache
+        lgr.info("use the streaming XML session")
+        return GnucashXmlSession(p_mode, p_gncfile, BOTH, lgr, p_paths)
+    # the Gnucash engine opens a gzipped book from its inflated copy in the cache
+    return GnucashSession(p_mode, book_cache.get_book(p_gncfile, lgr), BOTH, lgr)
+
+
+def configure_process(p_args:Namespace):
+    """
+    Set the state shared by ALL the updaters in the process from the PROCESS_OPTIONS
+    -- an updater run on its own sets it, and a runner of several updaters in the same process sets it ONCE
+    -- EVERY option is set, so nothing is left over from an earlier run in the same process
+    """
+    book_cache.configure(None if p_args.no_book_cache else p_args.book_cache)
+    sheets_quota.use_lock_file(p_args.quota_file)
+    use_vcr(p_args.vcr, p_args.vcr_file, p_args.vcr_latency, p_args.vcr_errors)
+
+
+def uses_bindings(p_gncfile:str, p_backend:str) -> bool:
+    """:return: True if open_gnucash_session() reads the book with the Gnucash bindings -- whose engine is NOT thread-safe"""
+    if p_backend == AUTO_BACKEND:
+        return osp.isfile(p_gncfile) and not (is_sqlite_book(p_gncfile) or is_xml_book(p_gncfile))
+    return p_backend == BINDINGS_BACKEND
+
+
+def start_log_queue(lgr:lg.Logger) -> QueueListener | None:
+    """
+    Put the handlers of the logger behind a queue so the file and console output happen in a listener thread
+    :return: the started listener, or None if the logger has no handlers of its own
+    """
+    handlers = [hdlr for hdlr in lgr.handlers if not isinstance(hdlr, QueueHandler)]
+    if not handlers:
+        return None
+    log_queue = SimpleQueue()
+    for hdlr in handlers:
+        lgr.removeHandler(hdlr)
+    lgr.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level = True)
+    listener.start()
+    return listener
+
+
+def stop_log_queue(lgr:lg.Logger, p_listener:QueueListener):
+    """Write out ALL the queued records and give the handlers back to the logger."""
+    if p_listener is None:
+        return
+    p_listener.stop()
+    for hdlr in [hdlr for hdlr in lgr.handlers if isinstance(hdlr, QueueHandler)]:
+        lgr.removeHandler(hdlr)
+    for hdlr in p_listener.handlers:
+        lgr.addHandler(hdlr)
+
+
+class RecordBatch:
+    """
+    collect the Record sheet rows of ALL the updaters in a run and send them with ONE append request
+    -- the append finds the next free row itself, so NO row tally is kept in the sheet
+       and updaters running in parallel threads cannot collide on the same row
+    """
+    def __init__(self):
+        self._rows = []
+        self._holds = 0
+        self._lock = threading.Lock()
+
+    def add(self, p_row:list, lgr:lg.Logger) -> dict:
+        """Add a row and send immediately unless a deferred block is active."""
+        with self._lock:
+            self._rows.append(p_row)
+            held = self._holds > 0
+        if held:
+            lgr.debug(f"record row deferred: {p_row}")
+            return {}
+        return self.flush(lgr)
+
+    @contextmanager
+    def deferred(self, lgr:lg.Logger):
+        """Hold ALL the record rows added inside the block and send them together at the end."""
+        with self._lock:
+            self._holds += 1
+        try:
+            yield self
+        except BaseException:
+            # a failed append must NOT replace the exception that ended the block
+            if self._release():
+                try:
+                    self.flush(lgr)
+                except Exception as fe:
+                    lgr.error(f"could NOT send the deferred record rows: {repr(fe)}")
+            raise
+        if self._release():
+            self.flush(lgr)
+
+    def _release(self) -> bool:
+        """:return: True if the last deferred block has ended"""
+        with self._lock:
+            self._holds -= 1
+            return self._holds == 0
+
+    def take(self) -> list:
+        """Remove the rows NOT yet sent, e.g. to send them from another process."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        return rows
+
+    def flush(self, lgr:lg.Logger) -> dict:
+        """Wait for the write quota BEFORE taking the rows, so any rows added meanwhile go in the same request."""
+        with self._lock:
+            if not self._rows:
+                return {}
+        sheets_quota.acquire(WRITE, lgr)
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return {}
+        response = append_sheets_rows(RECORD_APPEND_RANGE, rows, lgr)
+        moved = self.skip_header_rows(response, rows)
+        if moved:
+            lgr.info("moving the record rows off the header row")
+            sheets_quota.acquire(WRITE, lgr)
+            response["moved"] = update_sheets_values(moved, lgr)
+        return response
+
+    @staticmethod
+    def skip_header_rows(p_response:dict, p_rows:list) -> list:
+        """
+        The append does NOT know the header rows, so rows appended on a header row move down, as the row tally did
+        -- the header row is filled from the first header row, so the table stays whole for the next append
+        :param p_response: server response to the append
+        :param     p_rows: the rows appended
+        :return: Google data to fill the header rows and write the moved rows, or empty if NO row landed on a header row
+        """
+        match = RECORD_ROW_PATTERN.search(p_response.get("updates", {}).get("updatedRange", ""))
+        if not match:
+            return []
+        first = int(match.group(1))
+        data = []
+        target = first
+        for indx, row in enumerate(p_rows):
+            if target % RECORD_HDR_SPAN == 0:
+                header = [f"='{RECORD_SHEET}'!{col}{RECORD_HDR_SPAN}" if target > RECORD_HDR_SPAN else "" for col in RECORD_COLS]
+                data.append({"range": f"'{RECORD_SHEET}'!{RECORD_DATE_COL}{target}:{RECORD_INFO_COL}{target}", "values": [header]})
+                target += 1
+            if target != first + indx:
+                data.append({"range": f"'{RECORD_SHEET}'!{RECORD_DATE_COL}{target}:{RECORD_INFO_COL}{target}", "values": [row]})
+            target += 1
+        return data
+# END class RecordBatch
+
+record_batch = RecordBatch()
+
+
+class SessionPool:
+    """
+    lite sessions loaded ONCE and shared by ALL the updaters reading the same book, e.g. the jobs of a batch
+    -- the sessions keep ALL the accounts, as the updaters need different paths
+    -- a bindings session is NOT shared, as the Gnucash engine locks the book and is NOT thread-safe
+    """
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, p_mode:str, p_gncfile:str, p_backend:str, lgr:lg.Logger) -> GnucashLiteSession | None:
+        """:return: the loaded session for the book, or None if it cannot be shared"""
+        key = (osp.realpath(p_gncfile), p_backend)
+        with self._lock:
+            if key not in self._sessions:
+                session = open_gnucash_session(p_mode, p_gncfile, p_backend, None, lgr)
+                self._sessions[key] = (session, threading.Lock()) if isinstance(session, GnucashLiteSession) else (None, None)
+            session, load_lock = self._sessions[key]
+        if session is None:
+            return None
+        # a job that needs the book while it is loading waits for it
+        with load_lock:
+            if session.get_root_acct() is None:
+                session.begin_session()
+        return session
+
+    def close(self):
+        with self._lock:
+            for session, _ in self._sessions.values():
+                if session:
+                    session.end_session()
+            self._sessions = {}
+# END class SessionPool
+
+sheet_journal = SheetJournal()
 
 
 class UpdateBudget(ABC):
@@ -68,28 +365,53 @@ class UpdateBudget(ABC):
     update my 'Budget Quarterly' Google spreadsheet with information from a Gnucash file
     -- contains common code for the three options of updating Rev&Exps, Assets, Balance
     """
-    def __init__(self, args:list, p_logname:str):
-        self.process_input_parameters(args)
+    # keep per-year checkpoints of the Gnucash data when sending
+    use_checkpoints:bool = True
+    # can refresh ONLY the cells named by --only
+    refresh_only:bool = False
+
+    def __init__(self, args:list, p_logname:str, p_pool:SessionPool = None):
+        """
+        :param p_pool: share the loaded books with the other updaters using the same pool
+                       -- the runner of the pool has set the state of the process with configure_process()
+        """
+        self.process_input_parameters(args, p_pool is None)
+        self._session_pool = p_pool
 
         # get info for log names
-        self.timeframe = f"-{self.timespan}"
+        self.timeframe = f"-{self.timespan}" + (f"-{QTR_SEP}{self.quarter}" if self.quarter else "") \
+                         + (f"-{'+'.join(self.only)}" if self.only and self.refresh_only else "")
         log_name = p_logname + '_' + get_base_filename(self._gnucash_file) + self.timeframe
         self.filetime = dt.now().strftime(FILE_DATETIME_FORMAT)
+        self._timer = RunTimer()
+        self._split_count = None
+        self._checkpoint = self.get_checkpoint()
 
         self._lg_ctrl = MhsLogger(log_name, con_level = self.level, file_time = self.filetime, suffix = DEFAULT_LOG_SUFFIX)
         self._lgr = self._lg_ctrl.get_logger()
+        # year -> quarters to update
+        self._periods = get_periods(self.timespan, self.quarter, self._lgr)
+        # disk and console output must not hold up the extraction
+        self._log_listener = start_log_queue(self._lgr)
         self._lgr.info(f"Started at {self.filetime}")
+        if self.only and not self.refresh_only:
+            self._lgr.warning(f"{self.__class__.__name__} refreshes ALL its cells: ignore --only {self.only}")
+            self.only = None
+        if self.resume:
+            self._lgr.info(f"resume the run of {self.filetime} from '{self._checkpoint.folder}'")
 
-        self._gnucash_data = []
+        self._gnucash_data = QuarterlyTable()
         self._ggl_update = MhsSheetAccess(self._lgr)
         self._ggl_thrd = None
-        self.response = {f"Started: {self.filetime}"}
+        self._journal_batch = None
+        self.response = {"Started": self.filetime}
 
         self._lgr.debug(f"UPDATE_YEARS = {UPDATE_YEARS} \t BASE_UPDATE_YEAR = {BASE_UPDATE_YEAR}")
         self._lgr.debug(f"Gnucash file = {self._gnucash_file}; Domain = {self.timespan} & {TARGET} = {self.target}")
 
     # noinspection PyAttributeOutsideInit
-    def process_input_parameters(self, argl:list):
+    def process_input_parameters(self, argl:list, p_configure:bool = True):
+        """:param p_configure: set the state of the process from the PROCESS_OPTIONS"""
         args = set_args().parse_args(argl)
 
         if not osp.isfile(args.gnucash_file):
@@ -97,42 +419,166 @@ class UpdateBudget(ABC):
         self._gnucash_file = args.gnucash_file
 
         self.timespan = args.timespan
+        self.quarter  = args.quarter
+        self.only     = args.only
         self.level    = args.level
         self.target   = args.mode
 
         self.save_gnc  = args.gnc_save
         self.save_ggl  = args.ggl_save
         self.save_resp = args.resp_save
+        self.save_fmt  = args.save_format
+        self.profile   = args.profile
+        self.backend   = args.backend
+        self.resume = args.resume
+        self.figures_store = FiguresStore(args.store) if args.store else None
+        self.history = None if args.no_history else PerfHistory(args.history)
+        if p_configure:
+            configure_process(args)
+
+    def get_sheet_numbers(self) -> list:
+        """The number of each copy of the document to update: BOTH, 1 or by default 2."""
+        if self.target == SHEET_BOTH:
+            return ['1', '2']
+        return ['1'] if '1' in self.target else ['2']
+
+    def get_checkpoint(self) -> RunCheckpoint | None:
+        """The checkpoint of the run to resume, taking its filetime, or else a new checkpoint if sending."""
+        if not (self.use_checkpoints and SHEET in self.target):
+            if self.resume:
+                raise Exception(f"{self.__class__.__name__} in mode '{self.target}' has NO checkpoints to resume!")
+            return None
+        prefix = f"{self.__class__.__name__}{self.timeframe}-{self.target}-{get_base_filename(self._gnucash_file)}"
+        if not self.resume:
+            return RunCheckpoint(prefix, self.filetime)
+        checkpoint = RunCheckpoint.find(prefix, self.resume)
+        if checkpoint is None:
+            raise Exception(f"NO incomplete run '{self.resume}' of {prefix} to resume!")
+        self.filetime = checkpoint.filetime
+        return checkpoint
+
+    def finish_checkpoint(self):
+        """The run is complete: nothing to resume."""
+        if self._checkpoint:
+            self._checkpoint.finish()
+
+    def select_cells(self, p_cols:dict, p_accounts:dict) -> list:
+        """
+        The cells to refresh, each named by --only as the key of the cell, the key of an account in the cell, or a sheet column
+        -- or by the start of ONE key, e.g. 'NEC'
+        :param     p_cols: sheet column of each cell
+        :param p_accounts: key of each cell -> the keys of the accounts summed in the cell
+        :return: keys of the cells, in the order of p_accounts -- ALL of them if NOT --only
+        """
+        if not self.only:
+            return list(p_accounts)
+        selected = set()
+        try:
+            for name in self.only:
+                name = name.upper()
+                matches = [cell for cell, accts in p_accounts.items()
+                           if name in [key.upper() for key in [cell] + accts] or name == p_cols.get(cell)]
+                if not matches and len(name) >= MIN_KEY_START:
+                    matches = [cell for cell, accts in p_accounts.items() if any(key.upper().startswith(name) for key in [cell] + accts)]
+                    if len(matches) > 1:
+                        raise Exception(f"'{name}' could be ANY of {matches}! Exiting...")
+                if not matches:
+                    raise Exception(f"'{name}' is NOT an account or a sheet column of {self.__class__.__name__}! Exiting...")
+                selected.update(matches)
+        except Exception as sce:
+            # called from __init__, so go() will NOT stop the log listener
+            self._lgr.error(str(sce))
+            stop_log_queue(self._lgr, self._log_listener)
+            self._log_listener = None
+            raise
+        return [cell for cell in p_accounts if cell in selected]
+
+    def get_quarters(self, p_year:str) -> list:
+        """The quarters of the year in the timespan."""
+        return self._periods.get(str(p_year), ALL_QUARTERS)
+
+    def debug_time(self):
+        """Log the current time ONLY if DEBUG is enabled."""
+        if self._lgr.isEnabledFor(lg.DEBUG):
+            self._lgr.debug(get_current_time(), stacklevel = 2)
+
+    def debug_json(self, p_data):
+        """Log the data as indented json ONLY if DEBUG is enabled."""
+        if self._lgr.isEnabledFor(lg.DEBUG):
+            self._lgr.debug(json.dumps(p_data, indent = 4), stacklevel = 2)
+
+    def flush_log(self):
+        """Make sure ALL the queued log records have reached the handlers."""
+        if self._log_listener:
+            self._log_listener.stop()
+            self._log_listener.start()
+
+    def save_output(self, p_name:str, p_data) -> str:
+        """Save to a JSON file, or as an artefact written in the background. :return: path of the file"""
+        if self.save_fmt == JSON_FORMAT:
+            return save_to_json(p_name, p_data, ts = self.filetime)
+        return artefact_writer.save(p_name, p_data, self.filetime, self.save_fmt)
+
+    def get_gnucash_data(self) -> list:
+        """The results table as a list of dicts of strings, one per quarter -- as saved to the JSON file."""
+        return [self.format_quarter(row) | {YR: str(year), QTR: str(qtr)} for year, qtr, row in self._gnucash_data]
+
+    def format_quarter(self, p_row:int) -> dict:
+        """The values in a row of the results table as the strings sent to the Google sheet."""
+        return {metric: str(value) for metric, value in self._gnucash_data.row_values(p_row).items()}
+
+    def get_google_data(self) -> list:
+        return self._ggl_update.get_data()
 
     def prepare_gnucash_data(self, p_years:list):
         """
         Get data for the specified year, or group of years
             NOT really necessary to create a collection of the Gnucash data, but useful to store all
             the Gnucash data in a separate dict instead of just directly preparing a Google data dict
-        :param p_years: year(s) to update
+        :param p_years: year(s) to update -- ONLY the quarters of each year in the timespan
         """
         self._lgr.info(f"prepare_gnucash_data({p_years}) at {get_current_time()}")
-        gnc_session = None
+        gnc_session = pooled = None
         try:
-            gnc_session = GnucashSession(self.target, self._gnucash_file, BOTH, self._lgr)
-            gnc_session.begin_session()
-
-            for year in p_years:
-                for i in range(4): # ALL quarters since updating an entire year
-                    self._lgr.debug(f"filling {year}-Q{i+1}")
-                    self.fill_gnucash_data(gnc_session, i+1, year)
+            # the years completed by the run being resumed are read from the checkpoint
+            remaining = [year for year in p_years if not self.load_checkpoint_year(year)]
+            if remaining:
+                with self._timer.phase(OPEN_PHASE):
+                    if self._session_pool:
+                        gnc_session = pooled = self._session_pool.get_session(self.target, self._gnucash_file, self.backend, self._lgr)
+                    if gnc_session is None:
+                        gnc_session = open_gnucash_session(self.target, self._gnucash_file, self.backend, self.get_account_paths(), self._lgr)
+                        gnc_session.begin_session()
+                self._split_count = getattr(gnc_session, "split_count", None)
+
+            with self._timer.phase(EXTRACT_PHASE):
+                if remaining:
+                    self.begin_extraction(gnc_session, remaining)
+                for year in remaining:
+                    for qtr in self.get_quarters(year):
+                        self._lgr.debug("filling %s-Q%d", year, qtr)
+                        self.fill_gnucash_data(gnc_session, qtr, year)
+                    if self._checkpoint:
+                        self._checkpoint.save_year(int(year), self._gnucash_data)
 
             if self.save_gnc:
                 fname = f"{self.__class__.__name__}_gnc-data-{self.timespan}"
-                self._lgr.info(f"gnucash data file = {save_to_json(fname, self._gnucash_data, ts = self.filetime)}")
+                self._lgr.info(f"gnucash data file = {self.save_output(fname, self.get_gnucash_data())}")
 
         except Exception as pgdex:
             raise pgdex
         finally:
-            if gnc_session:
+            # a pooled session stays open for the next updater
+            if gnc_session and gnc_session is not pooled:
                 # no save needed as just reading
                 gnc_session.end_session()
 
+    def load_checkpoint_year(self, p_year:str) -> bool:
+        if self.resume and self._checkpoint.load_year(int(p_year), self._gnucash_data):
+            self._lgr.info(f"{p_year} read from the checkpoint")
+            return True
+        return False
+
     def prepare_google_data(self, p_years:list):
         """Fill the Google data list."""
         self._lgr.info(f"prepare_google_data({p_years}) at {get_current_time()}")
@@ -141,35 +587,33 @@ class UpdateBudget(ABC):
 
         if self.save_ggl:
             fname = f"{self.__class__.__name__}_google-data-{str(self.timespan)}"
-            self._lgr.info(f"google data file = {save_to_json(fname, self._ggl_update.get_data(), ts = self.filetime)}")
+            self._lgr.info(f"google data file = {self.save_output(fname, self.get_google_data())}")
+
+    def get_update_info(self) -> str:
+        return self.__class__.__name__ + " - " + self.timespan + " - " + self.target
+
+    def journal_google_data(self):
+        """Commit the Google data to the journal so that NOTHING is lost if the send fails."""
+        if self.resume and self._checkpoint.get(JOURNAL_BATCH):
+            # the unsent chunks of the batch are still pending in the journal
+            self._journal_batch = self._checkpoint.get(JOURNAL_BATCH)
+            self._lgr.info(f"batch #{self._journal_batch} was journaled by the run being resumed")
+            return
+        self._journal_batch = sheet_journal.add_batch(self.get_google_data(), self.get_update_info(), self._lgr)
+        if self._checkpoint:
+            self._checkpoint.set(JOURNAL_BATCH, self._journal_batch)
 
     def record_update(self):
-        try:
-            ru_result = self._ggl_update.read_sheets_data(RECORD_RANGE)
-            self._lgr.info(f"ru_result = {ru_result}")
-            current_row = int(ru_result[0][0])
-        except ValueError as ve:
-            self._lgr.exception(ve)
-            current_row = 1001
-            self._lgr.warning(">> update record row at 1001")
-        except Exception as rue:
-            raise rue
-        # skip header rows
-        if current_row % RECORD_HDR_SPAN == 0:
-            current_row += 1
-        self._lgr.debug(f"current row = {current_row}\n")
-
-        update_info = self.__class__.__name__ + " - " + self.timespan + " - " + self.target
+        """Keep a record of this update in the Record sheet."""
+        update_info = self.get_update_info()
         self._lgr.info(f"update info = {update_info}\n")
 
-        # keep record of this update
-        self._ggl_update.fill_cell(RECORD_SHEET, RECORD_DATE_COL, current_row, now_dt.strftime(CELL_DATE_STR))
-        self._ggl_update.fill_cell(RECORD_SHEET, RECORD_TIME_COL, current_row, now_dt.strftime(CELL_TIME_STR))
-        self._ggl_update.fill_cell(RECORD_SHEET, RECORD_GNC_COL, current_row, self._gnucash_file)
-        self._ggl_update.fill_cell(RECORD_SHEET, RECORD_INFO_COL, current_row, update_info)
-
-        # update the row tally
-        self._ggl_update.fill_cell(RECORD_SHEET, 'A', 1, str(current_row + 1))
+        record_row = [now_dt.strftime(CELL_DATE_STR), now_dt.strftime(CELL_TIME_STR), self._gnucash_file, update_info]
+        try:
+            record_batch.add(record_row, self._lgr)
+        except Exception as rue:
+            # the update itself has already been sent
+            self._lgr.exception(rue)
 
     def start_google_thread(self):
         try:
@@ -185,35 +629,74 @@ class UpdateBudget(ABC):
                 self._ggl_thrd.join(timeout = 6.66)
 
     def send_google_data(self):
-        self._ggl_update.begin_session()
+        """Drain the batch of this update from the journal -- the updates still pending from earlier runs are sent with --replay."""
+        try:
+            with self._timer.phase(SEND_PHASE):
+                self.response = sheet_journal.drain(self._lgr, [self._journal_batch])
+        except Exception as sgde:
+            self._lgr.exception(sgde)
+            self._lgr.warning(f"batch #{self._journal_batch} is still in the journal: send it later with 'sheetJournal.py --replay'")
+            self.response = {"Journaled": self._journal_batch, "Error": repr(sgde)}
+            return
+        if not self.response:
+            # nothing pending in this batch: it was already sent, e.g. by 'sheetJournal.py --replay'
+            self.response = {"Journaled": self._journal_batch, "Sent": "already"}
+        self.finish_checkpoint()
 
         self.record_update()
-        self.response = self._ggl_update.send_sheets_data()
-
-        self._ggl_update.end_session()
+        self.response[QUOTA] = sheets_quota.usage()
+        if vcr_usage():
+            self.response[VCR] = vcr_usage()
 
         if self.save_resp:
             rf_name = f"{self.__class__.__name__}_response{self.timeframe}"
-            self._lgr.info(f"google response file = {save_to_json(rf_name, self.response, ts = self.filetime)}")
+            self._lgr.info(f"google response file = {self.save_output(rf_name, self.response)}")
 
     def go(self, label:str="Budget") -> dict:
         """ENTRY POINT for accessing UpdateBudget functions."""
-        years = get_timespan(self.timespan, self._lgr)
-        self._lgr.info(f">>> Updating {label.upper()}.  Mode = '{self.target}'.  timespan to find = {years}")
+        try:
+            if not self.profile:
+                return self.run_update(label)
+
+            with RunProfiler(self._lgr) as profiler:
+                self.run_update(label)
+            fname = f"{self.__class__.__name__}_profile{self.timeframe}"
+            hotspots_file = save_to_json(fname, profiler.hotspots(), ts = self.filetime)
+            self.response[PROFILE] = profiler.save(hotspots_file)
+            self._lgr.info(f"{PROFILE} = {json.dumps(self.response[PROFILE], indent = 4)}")
+            return self.response
+        finally:
+            artefact_writer.flush(self._lgr)
+            stop_log_queue(self._lgr, self._log_listener)
+            self._log_listener = None
+
+    def run_update(self, label:str) -> dict:
+        years = list(self._periods)
+        self._lgr.info(f">>> Updating {label.upper()}.  Mode = '{self.target}'.  timespan to find = {self._periods}")
         sending = SHEET in self.target
+        status = RUN_FAILED
         try:
             self.prepare_gnucash_data(years)
 
-            if sending or self.save_ggl:
+            if sending or self.save_ggl or self.figures_store:
                 # package the Gnucash data in the format required by Google sheets
-                self.prepare_google_data(years)
+                with self._timer.phase(GOOGLE_PHASE):
+                    self.prepare_google_data(years)
+
+            if self.figures_store:
+                with self._timer.phase(STORE_PHASE):
+                    self.store_figures()
 
             if sending:
+                with self._timer.phase(JOURNAL_PHASE):
+                    self.journal_google_data()
                 self.start_google_thread()
             else:
+                self.flush_log()
                 self.response = {"Response" : self._lg_ctrl.get_saved_info()}
 
             self._lgr.info(">>> PROGRAM ENDED.\n")
+            status = RUN_OK
             return self.response
 
         except Exception as goe:
@@ -224,6 +707,43 @@ class UpdateBudget(ABC):
             if self._ggl_thrd and self._ggl_thrd.is_alive():
                 self._lgr.info("wait for the thread to finish")
                 self._ggl_thrd.join()
+            self.record_history(RUN_FAILED if isinstance(self.response, dict) and "Error" in self.response else status)
+
+    def record_history(self, p_status:str):
+        """Add the timings and counts of this run to the performance history."""
+        if not self.history:
+            return
+        # called in a finally: NOTHING here may hide the exception of a failed run, e.g. a missing book
+        try:
+            google_data = self.get_google_data() or []
+            run = {"filetime": self.filetime, "updater": self.__class__.__name__, "timespan": self.timespan,
+                   "target": self.target, "book": osp.abspath(self._gnucash_file),
+                   "book_size": osp.getsize(self._gnucash_file) if osp.isfile(self._gnucash_file) else None,
+                   "splits": self._split_count, "quarters": len(self._gnucash_data), "ranges": len(google_data),
+                   "cells": sum(len(row) for item in google_data for row in item["values"]),
+                   "total": self._timer.total(), "status": p_status}
+            run_id = self.history.add_run(run, self._timer.phases)
+            self._lgr.info(f"run #{run_id} took {run['total']:.2f} seconds: "
+                           + ", ".join(f"{phase} = {seconds:.2f}" for phase, seconds in self._timer.phases.items()))
+        except Exception as rhe:
+            # the update itself is done
+            self._lgr.warning(f"run NOT added to the history '{self.history.file}': {repr(rhe)}")
+
+    def store_figures(self):
+        """Keep the computed figures in the local store for the read API."""
+        self.figures_store.store_table(self._gnucash_file, self.__class__.__name__, self._gnucash_data, p_whole = not self.only)
+        self._lgr.info(f"stored {len(self._gnucash_data)} quarters in '{self.figures_store.file}'")
+
+    def begin_extraction(self, p_session, p_years:list):
+        """
+        The session is open: anything to read from the book ONCE for ALL the years, before the quarters are filled
+        -- ONLY get_quarters() of each year will be filled
+        """
+        pass
+
+    def get_account_paths(self) -> list | None:
+        """The account paths used by this updater, or None if ALL the accounts may be needed."""
+        return None
 
     @abstractmethod
     def fill_gnucash_data(self, gnc_session, param, year):
@@ -241,25 +761,53 @@ def set_args() -> ArgumentParser:
     # required arguments
     required = arg_parser.add_argument_group("REQUIRED")
     required.add_argument('-g', '--gnucash_file', required = True, help = "path to the Gnucash file to use")
-    required.add_argument('-m', '--mode', required = True, choices = [TEST, SHEET_1, SHEET_2],
-                          help = "SEND to Google Sheet (1 or 2) OR just TEST")
+    required.add_argument('-m', '--mode', required = True, choices = [TEST, SHEET_1, SHEET_2, SHEET_BOTH],
+                          help = "SEND to Google Sheet (1 or 2 or BOTH) OR just TEST")
     required.add_argument('-t', '--timespan', required = True,
-                          help = f"update a year or years in the range {BASE_UPDATE_YEAR}..{now_dt.year}")
+                          help = f"update a year or years in the range {BASE_UPDATE_YEAR}..{now_dt.year}, a quarter as '{now_dt.year}Q1',"
+                                 f" a range of quarters as '{BASE_UPDATE_YEAR}Q3{RANGE_SEP}{now_dt.year}Q1',"
+                                 f" or the latest quarters as '{LAST_2_QTRS}'")
     # optional arguments
-    arg_parser.add_argument('-q', '--quarter', choices = ["1", "2", "3", "4"], help = "quarter to update: 1..4")
+    arg_parser.add_argument('-q', '--quarter', choices = ["1", "2", "3", "4"], help = "ONLY this quarter of each year in the timespan: 1..4")
+    arg_parser.add_argument('--only', nargs = '+', metavar = "KEY",
+                            help = "refresh ONLY the cells of these accounts or sheet columns, e.g. RRSP TFSA or M -- NOT for Balance")
     arg_parser.add_argument('-l', '--level', type = int, default = lg.INFO, help = "set LEVEL of logging output")
     arg_parser.add_argument('--gnc_save', action = "store_true", help = "Write the Gnucash data to a JSON file")
     arg_parser.add_argument('--ggl_save', action = "store_true", help = "Write the Google data to a JSON file")
     arg_parser.add_argument('--resp_save', action = "store_true", help = "Write the Google RESPONSE to a JSON file")
+    arg_parser.add_argument('--save_format', choices = SAVE_FORMATS, default = JSON_FORMAT,
+                            help = "format of the saved files: indented JSON, or compressed JSON Lines or msgpack written in the background")
+    arg_parser.add_argument('-b', '--backend', choices = GNC_BACKENDS, default = AUTO_BACKEND,
+                            help = f"how to read the Gnucash file: '{AUTO_BACKEND}' uses SQL or a streaming XML reader if possible")
+    arg_parser.add_argument('--quota_file',
+                            help = "share the Google Sheets request quota with other processes using this lock file")
+    arg_parser.add_argument('--resume', nargs = '?', const = LATEST_RUN, metavar = "FILETIME",
+                            help = "RESUME the latest interrupted run with the same arguments, or the run with this filetime")
+    arg_parser.add_argument('--book_cache', default = DEFAULT_CACHE_FOLDER,
+                            help = "folder of the cache of inflated copies of the gzipped Gnucash files opened with the bindings")
+    arg_parser.add_argument('--no_book_cache', action = "store_true",
+                            help = "ALWAYS inflate a gzipped Gnucash file when opened with the bindings")
+    arg_parser.add_argument('--store', nargs = '?', const = STORE_FILE, metavar = "STORE_FILE",
+                            help = "Keep the computed figures in the local store read by figuresServer.py")
+    arg_parser.add_argument('--history', default = HISTORY_FILE,
+                            help = "path to the history of the run timings reported by perfHistory.py")
+    arg_parser.add_argument('--no_history', action = "store_true", help = "do NOT add this run to the history of the run timings")
+    arg_parser.add_argument('--vcr', choices = VCR_MODES,
+                            help = "RECORD the Google requests and responses to the VCR file, or REPLAY them with NO network")
+    arg_parser.add_argument('--vcr_file', default = DEFAULT_VCR_FILE, help = "path to the VCR file")
+    arg_parser.add_argument('--vcr_latency', type = float, default = 0.0, help = "seconds to delay each replayed response")
+    arg_parser.add_argument('--vcr_errors', type = float, default = 0.0,
+                            help = "fraction of the replayed requests to fail with an injected error")
+    arg_parser.add_argument('--profile', action = "store_true",
+                            help = "PROFILE the run: save .prof and collapsed-stack files and add the hotspots to the response")
 
     return arg_parser
 
 
 def test_google_read():
-    ggl_updater = MhsSheetAccess()
-    result = ggl_updater.test_read(RECORD_RANGE)
-    print(result)
-    print(result[0][0])
+    result = read_sheets_values(RECORD_APPEND_RANGE, lg.getLogger())
+    print(f"{len(result)} record rows")
+    print(result[-1] if result else None)
 
 
 if __name__ == "__main__":
@@ -8,11 +8,12 @@
 #
 __author__         = "Mark Sattolo"
 __author_email__   = "epistemik@gmail.com"
-__python_version__ = "3.6+"
+__python_version__ = "3.10+"
 __created__ = "2019-03-30"
-__updated__ = "2025-08-01"
+__updated__ = "2026-10-19"
 
 from updateBudget import *
+from accountCube import AccountCube
 
 REVEXPS_DATA = {
     # first data row in the sheet
@@ -55,29 +56,71 @@ REV_EXP_COLS = {
     DEDNS : 'D'  # Nec Inc
 }
 
+# the accounts summed in each cell
+REV_EXP_CELLS = {
+    REV   : list(REV_ACCTS) ,
+    **{item: [] for item in EXP_ACCTS} ,
+    DEDNS : list(DEDN_ACCTS)
+}
+
+# All Inc and Nec Inc sheets in each copy of the document
+INC_DESTS = {
+    '1' : (ALL_INC_SHEET, NEC_INC_SHEET) ,
+    '2' : (ALL_INC_2_SHEET, NEC_INC_2_SHEET)
+}
+
 
 class UpdateRevExps(UpdateBudget):
     """Take data from a Gnucash file and update an Income tab of my Google Budget-Quarterly document."""
-    def __init__(self, args:list, p_logname:str):
-        super().__init__(args, p_logname)
-
-        # Google sheet to update
-        self.all_inc_dest = ALL_INC_2_SHEET
-        self.nec_inc_dest = NEC_INC_2_SHEET
-        if '1' in self.target:
-            self.all_inc_dest = ALL_INC_SHEET
-            self.nec_inc_dest = NEC_INC_SHEET
-        self._lgr.debug(f"all_inc_dest = {self.all_inc_dest}")
-        self._lgr.debug(f"nec_inc_dest = {self.nec_inc_dest}\n")
+    refresh_only = True
+
+    def __init__(self, args:list, p_logname:str, p_pool:SessionPool = None):
+        super().__init__(args, p_logname, p_pool)
+
+        # cells to refresh: ALL of them unless --only -- a REV or DEDNS cell needs ALL its accounts
+        self.cells = self.select_cells(REV_EXP_COLS, REV_EXP_CELLS)
+        self._lgr.debug(f"cells = {self.cells}")
+
+        # Google sheets to update
+        self.all_inc_dests = [INC_DESTS[num][0] for num in self.get_sheet_numbers()]
+        self.nec_inc_dests = [INC_DESTS[num][1] for num in self.get_sheet_numbers()]
+        self._lgr.debug(f"all_inc_dests = {self.all_inc_dests}")
+        self._lgr.debug(f"nec_inc_dests = {self.nec_inc_dests}\n")
+
+        self._gnc_session = None
+        self._cube = None
+
+    def get_account_paths(self) -> list:
+        return (list(REV_ACCTS.values()) if REV in self.cells else []) \
+               + [path for item, path in EXP_ACCTS.items() if item in self.cells] \
+               + (list(DEDN_ACCTS.values()) if DEDNS in self.cells else [])
+
+    def begin_extraction(self, p_session, p_years:list):
+        """
+        With a lite session, read the sums of ALL the accounts for ALL the months of the timespan in one pass
+        -- from the first quarter of the earliest year to the last quarter of the latest year
+        """
+        if isinstance(p_session, GnucashLiteSession):
+            int_years = {get_int_year(year, REVEXPS_DATA[BASE_YEAR]): year for year in p_years}
+            first, last = min(int_years), max(int_years)
+            start_month = (min(self.get_quarters(int_years[first])) * 3) - 2
+            end_qtr = max(self.get_quarters(int_years[last]))
+            self._cube = AccountCube(p_session, self.get_account_paths(), date(first, start_month, 1),
+                                     date(last + end_qtr // 4, (end_qtr * 3) % 12 + 1, 1) - ONE_DAY, self._lgr)
 
     def fill_splits(self, root_acct:Account, account_path:list, period_starts:list, periods:list) -> str:
-        self._lgr.debug(get_current_time())
+        self.debug_time()
+        if self._cube:
+            return self._cube.fill_splits(account_path, period_starts, periods)
+        if isinstance(self._gnc_session, GnucashLiteSession):
+            return self._gnc_session.fill_splits(account_path, period_starts, periods)
         if root_acct:
             return fill_splits(root_acct, account_path, period_starts, periods, self._lgr)
         self._lgr.error("NO root account!")
         return ""
 
-    def fill_gnucash_data(self, p_session:GnucashSession, p_qtr:int, p_year:str) -> dict:
+    def fill_gnucash_data(self, p_session:GnucashSession, p_qtr:int, p_year:str) -> int:
+        self._gnc_session = p_session
         root_acct = p_session.get_root_acct()
         start_month = (p_qtr * 3) - 2
         int_year = get_int_year( p_year, REVEXPS_DATA[BASE_YEAR] )
@@ -95,61 +138,58 @@ class UpdateRevExps(UpdateBudget):
         # a copy of the above list with just the period start dates
         period_starts = [e[0] for e in period_list]
 
-        data_qtr = {}
-        self.get_revenue(root_acct, period_starts, period_list, data_qtr)
-        data_qtr[YR] = p_year
-        data_qtr[QTR] = str(p_qtr)
-        self._lgr.debug(f"\n\t\tTOTAL Revenue for {p_year}-Q{p_qtr} = ${period_list[0][4] * -1}")
+        row = self._gnucash_data.add_row(int_year, p_qtr)
+        if REV in self.cells:
+            self.get_revenue(root_acct, period_starts, period_list, row)
+            self._lgr.debug("\n\t\tTOTAL Revenue for %s-Q%d = $%s", p_year, p_qtr, -period_list[0][4])
 
         period_list[0][4] = ZERO
-        self.get_expenses(root_acct, period_starts, period_list, int_year, data_qtr)
-        self._lgr.debug(f"\n\t\tTOTAL Expenses for {p_year}-Q{p_qtr} = {period_list[0][4]}\n")
-
-        self.get_deductions(root_acct, period_starts, period_list, int_year, data_qtr)
+        self.get_expenses(root_acct, period_starts, period_list, int_year, row)
+        self._lgr.debug("\n\t\tTOTAL Expenses for %s-Q%d = %s\n", p_year, p_qtr, period_list[0][4])
 
-        self._gnucash_data.append(data_qtr)
-        self._lgr.debug(json.dumps(data_qtr, indent = 4))
+        if DEDNS in self.cells:
+            self.get_deductions(root_acct, period_starts, period_list, int_year, row)
 
-        return data_qtr
+        self.debug_json(self.format_quarter(row))
+        return row
 
-    def get_revenue(self, root_acct:Account, period_starts:list, periods:list, data_qtr:dict) -> str:
+    def get_revenue(self, root_acct:Account, period_starts:list, periods:list, p_row:int) -> str:
         """
         Get REVENUE data for the specified periods
         :param     root_acct: in Gnucash file
         :param period_starts: start date for each period
         :param       periods: structs with the dates and amounts for each quarter
-        :param      data_qtr: dict for data for the specified quarter
+        :param         p_row: row of the results table for the specified quarter
         :return: revenue for period
         """
-        self._lgr.debug(get_current_time())
+        self.debug_time()
         str_rev = "= "
         for item in REV_ACCTS:
             # reset the debit and credit totals for each individual account
             periods[0][2] = ZERO
             periods[0][3] = ZERO
-            self._lgr.debug('set periods')
             acct_base = REV_ACCTS[item]
-            self._lgr.debug(f"acct_base = {acct_base}")
+            self._lgr.debug("acct_base = %s", acct_base)
             acct_name = self.fill_splits(root_acct, acct_base, period_starts, periods)
 
             sum_revenue = (periods[0][2] + periods[0][3]) * (-1)
+            self._gnucash_data.set(p_row, item, sum_revenue)
             str_rev += sum_revenue.to_eng_string() + (' + ' if item != EMPL else '')
-            self._lgr.debug(f"{acct_name} Revenue for period = ${sum_revenue}")
+            self._lgr.debug("%s Revenue for period = $%s", acct_name, sum_revenue)
 
-        data_qtr[REV] = str_rev
         return str_rev
 
-    def get_deductions(self, root_acct:Account, period_starts:list, periods:list, p_year:int, data_qtr:dict) -> str:
+    def get_deductions(self, root_acct:Account, period_starts:list, periods:list, p_year:int, p_row:int) -> str:
         """
         Get SALARY DEDUCTIONS data for the specified Quarter
         :param     root_acct: in Gnucash file
         :param period_starts: start date for each period
         :param       periods: structs with the dates and amounts for each quarter
         :param        p_year: year to read
-        :param      data_qtr: dict for data for the specified quarter
+        :param         p_row: row of the results table for the specified quarter
         :return: deductions for period
         """
-        self._lgr.debug(get_current_time())
+        self.debug_time()
         str_dedns = "= "
         for item in DEDN_ACCTS:
             # reset the debit and credit totals for each individual account
@@ -160,25 +200,25 @@ class UpdateRevExps(UpdateBudget):
             acct_name = self.fill_splits(root_acct, acct_path, period_starts, periods)
 
             sum_deductions = periods[0][2] + periods[0][3]
+            self._gnucash_data.set(p_row, item, sum_deductions)
             str_dedns += sum_deductions.to_eng_string() + (' + ' if item != "ML" else '')
-            self._lgr.debug(f"{acct_name} {EMPL} Deductions for {p_year}-Q{data_qtr[QTR]} = ${sum_deductions}")
+            self._lgr.debug("%s %s Deductions for %s-Q%d = $%s", acct_name, EMPL, p_year, self._gnucash_data.quarters[p_row], sum_deductions)
 
-        data_qtr[DEDNS] = str_dedns
         return str_dedns
 
-    def get_expenses(self, root_acct:Account, period_starts:list, periods:list, p_year:int, data_qtr:dict) -> str:
+    def get_expenses(self, root_acct:Account, period_starts:list, periods:list, p_year:int, p_row:int) -> str:
         """
-        Get EXPENSE data for the specified Quarter
+        Get EXPENSE data for the specified Quarter -- for the expense cells to refresh
         :param     root_acct: in Gnucash file
         :param period_starts: start date for each period
         :param       periods: structs with the dates and amounts for each quarter
         :param        p_year: year to read
-        :param      data_qtr: dict for data for the specified quarter
+        :param         p_row: row of the results table for the specified quarter
         :return: total expenses for period
         """
-        self._lgr.debug(get_current_time())
+        self.debug_time()
         str_total = ""
-        for item in EXP_ACCTS:
+        for item in [item for item in EXP_ACCTS if item in self.cells]:
             # reset the debit and credit totals for each individual account
             periods[0][2] = ZERO
             periods[0][3] = ZERO
@@ -187,46 +227,64 @@ class UpdateRevExps(UpdateBudget):
             acct_name = self.fill_splits(root_acct, acct_base, period_starts, periods)
 
             sum_expenses = periods[0][2] + periods[0][3]
+            self._gnucash_data.set(p_row, item, sum_expenses)
             str_expenses = sum_expenses.to_eng_string()
-            data_qtr[item] = str_expenses
-            self._lgr.debug(f"{acct_name.split('_')[-1]} Expenses for {p_year}-Q{data_qtr[QTR]} = ${str_expenses}")
+            self._lgr.debug("%s Expenses for %s-Q%d = $%s", acct_name.split("_")[-1], p_year, self._gnucash_data.quarters[p_row], str_expenses)
             str_total += str_expenses + ' + '
 
         return str_total
 
+    def get_gnucash_data(self) -> list:
+        """Keep the key order of the saved data: REV, then the year and quarter, then the rest."""
+        data = []
+        for year, qtr, row in self._gnucash_data:
+            values = self.format_quarter(row)
+            data.append(({REV: values.pop(REV)} if REV in values else {}) | {YR: str(year), QTR: str(qtr)} | values)
+        return data
+
+    def format_quarter(self, p_row:int) -> dict:
+        """
+        REV string is '= ${INV} + ${OTH} + ${SAL}'
+        DEDNS string is '= ${Mk-Dedns} + ${Lu-Dedns} + ${ML-Dedns}'
+        others are just the amount
+        ONLY the cells to refresh
+        """
+        table = self._gnucash_data
+        values = {}
+        for cell, accounts in REV_EXP_CELLS.items():
+            if cell in self.cells:
+                values[cell] = "= " + " + ".join(table.get(p_row, item).to_eng_string() for item in accounts) if accounts \
+                               else table.get(p_row, cell).to_eng_string()
+        return values
+
     def fill_google_data(self, p_years:list):
         """
         Fill the data list:
-        for each item in the gnucash data:
+        for each row in the gnucash data:
             create 5 cells, one each for REV, BAL, CONT, NEC, DEDNS:
             fill in the range based on the year and quarter
             range = SHEET_NAME + '!' + calculated cell
             fill in the values based on the sheet being updated and the type of cell data
-            REV string is '= ${INV} + ${OTH} + ${SAL}'
-            DEDNS string is '= ${Mk-Dedns} + ${Lu-Dedns} + ${ML-Dedns}'
-            others are just the string from the item
         :param p_years: timespan to update
         """
         self._lgr.info(f"timespan = {p_years}\n")
-        # get the row from Year and Quarter value in each item
-        for item in self._gnucash_data:
-            self._lgr.debug(f"item = {item}")
-            target_year = get_int_year( item[YR], REVEXPS_DATA[BASE_YEAR] )
+        # get the row from Year and Quarter of each row
+        for target_year, target_qtr, row in self._gnucash_data:
             year_row = REVEXPS_DATA[BASE_ROW]\
                        + year_span(target_year, REVEXPS_DATA[BASE_YEAR], REVEXPS_DATA[YEAR_SPAN], REVEXPS_DATA[HDR_SPAN], self._lgr)
-            dest_row = year_row + ( (get_int_quarter(item[QTR]) - 1) * REVEXPS_DATA[QTR_SPAN] )
-            self._lgr.debug(f"{item[YR]}-Q{item[QTR]} dest row = {dest_row}\n")
-            for key in item:
-                if key not in (YR,QTR):
-                    dest = self.nec_inc_dest
-                    if key in (REV, BAL, CONT):
-                        dest = self.all_inc_dest
-                    self._ggl_update.fill_cell(dest, REV_EXP_COLS[key], dest_row, item[key])
+            dest_row = year_row + ( (target_qtr - 1) * REVEXPS_DATA[QTR_SPAN] )
+            self._lgr.debug("%d-Q%d dest row = %d\n", target_year, target_qtr, dest_row)
+            for key, value in self.format_quarter(row).items():
+                dests = self.nec_inc_dests
+                if key in (REV, BAL, CONT):
+                    dests = self.all_inc_dests
+                for dest in dests:
+                    self._ggl_update.fill_cell(dest, REV_EXP_COLS[key], dest_row, value)
 # END class UpdateRevExps
 
 
-def update_rev_exps_main(args:list) -> dict:
-    rev_exp = UpdateRevExps(args, get_base_filename(__file__))
+def update_rev_exps_main(args:list, p_pool:SessionPool = None) -> dict:
+    rev_exp = UpdateRevExps(args, get_base_filename(__file__), p_pool)
     return rev_exp.go("Revs & Exps")
 
 
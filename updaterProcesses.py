@@ -0,0 +1,112 @@
+##############################################################################################################################
+# coding=utf-8
+#
+# updaterProcesses.py -- run each of the selected updaters in its own worker process, with the log records,
+#                        the response and the Record rows sent back to the parent over ONE queue
+#
+# Copyright (c) 2026 Mark Sattolo <epistemik@gmail.com>
+
+__author_name__    = "Mark Sattolo"
+__author_email__   = "epistemik@gmail.com"
+__python_version__ = "3.10+"
+__created__ = "2026-10-19"
+__updated__ = "2026-10-19"
+
+import queue
+import multiprocessing as mp
+from updateBudget import *
+
+# NOT fork: the parent may be running Qt and the Gnucash engine
+START_METHOD:str = "spawn"
+DONE:str   = "done"
+FAILED:str = "failed"
+# seconds to wait for the last messages of a process that has exited
+EXIT_WAIT:float = 0.5
+
+
+def run_updater(p_fxn, p_params:list, p_level:int, p_queue:mp.Queue):
+    """
+    Run in the worker process: ALL the log records go to the queue, and then the result
+    -- the Record rows are NOT sent here but returned, so the parent sends the rows of ALL the updaters together
+    """
+    name = p_fxn.__name__
+    handler = QueueHandler(p_queue)
+    handler.setLevel(p_level)
+    lg.getLogger().addHandler(handler)
+    lgr = lg.getLogger(name)
+    rows = []
+    try:
+        with record_batch.deferred(lgr):
+            try:
+                response = p_fxn(p_params)
+            finally:
+                rows = record_batch.take()
+        # ONLY plain data goes back to the parent
+        p_queue.put((DONE, name, json.loads(json.dumps(response, default = str)), rows))
+    except Exception as rue:
+        lgr.exception(rue)
+        p_queue.put((FAILED, name, repr(rue), rows))
+
+
+class UpdaterProcesses:
+    """
+    one worker process for each updater, so they run on separate cores and each has its own Gnucash engine
+    -- the parent polls the queue, so it can show the log records as they arrive and cancel at any time
+    """
+    def __init__(self, p_fxns:list, p_params:list, p_level:int, p_lgr:lg.Logger):
+        self._lgr = p_lgr
+        context = mp.get_context(START_METHOD)
+        self._queue = context.Queue()
+        self._procs = {fxn.__name__: context.Process(target = run_updater, args = (fxn, p_params, p_level, self._queue),
+                                                     name = fxn.__name__, daemon = True) for fxn in p_fxns}
+        self.results = {}
+        self.rows = []
+
+    def start(self):
+        for proc in self._procs.values():
+            proc.start()
+            self._lgr.info(f"started process {proc.pid} for {proc.name}")
+
+    def running(self) -> bool:
+        return len(self.results) < len(self._procs)
+
+    def poll(self, p_timeout:float) -> list:
+        """:return: the log records received within the timeout -- the results are kept in self.results"""
+        records = []
+        try:
+            message = self._queue.get(timeout = p_timeout)
+            while True:
+                if isinstance(message, lg.LogRecord):
+                    records.append(message)
+                else:
+                    status, name, response, rows = message
+                    self.results[name] = {"status": status, "response": response}
+                    self.rows.extend(rows)
+                message = self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.check_exits()
+        return records
+
+    def check_exits(self):
+        """A process that died WITHOUT sending its result -- e.g. a crash in the Gnucash engine -- has FAILED."""
+        for name, proc in self._procs.items():
+            if name not in self.results and proc.exitcode is not None:
+                proc.join(EXIT_WAIT)
+                if self._queue.empty():
+                    self.results[name] = {"status": FAILED, "response": f"process exited with code {proc.exitcode}"}
+
+    def cancel(self):
+        """Stop ALL the processes still running: their updates are NOT completed."""
+        for name, proc in self._procs.items():
+            if proc.is_alive():
+                self._lgr.warning(f"cancel {name}")
+                proc.terminate()
+                proc.join()
+                self.results.setdefault(name, {"status": FAILED, "response": "cancelled"})
+
+    def close(self):
+        for proc in self._procs.values():
+            proc.join()
+        self._queue.close()
+# END class UpdaterProcesses